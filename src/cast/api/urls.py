@@ -56,6 +56,8 @@ urlpatterns: list[Any] = [
         name="audio_player_transcript",
     ),
     path("audios/player_config/", views.PlayerConfig.as_view(), name="player_config"),
+    # transcript search
+    path("transcripts/search/", views.TranscriptSearchView.as_view(), name="transcript_search"),
     # facet counts
     path("facet_counts/", views.FacetCountListView.as_view(), name="facet-counts-list"),
     re_path(r"facet_counts/(?P<pk>\d+)/?$", views.FacetCountsDetailView.as_view(), name="facet-counts-detail"),
@@ -10,6 +10,7 @@ conflict handling. This freeze follows the 2026-06-25 media-detail plan.
 import hashlib
 import json
 import logging
+import math
 from collections import OrderedDict
 from typing import Any, cast
 
@@ -31,13 +32,14 @@ from wagtail.api.v2.router import WagtailAPIRouter
 from wagtail.api.v2.views import PagesAPIViewSet
 from wagtail.images.api.v2.views import ImagesAPIViewSet
 
-from ..audio_access import authorize_audio_access, page_grants_audio_access, page_is_unrestricted_public
+from ..audio_access import authorize_audio_access, page_grants_audio_access, patch_audio_cache_headers
 from ..filters import PostFilterset
 from ..forms import SelectThemeForm, VideoForm
 from ..http_types import HtmxHttpRequest
 from ..models import (
     Audio,
     Blog,
+    Episode,
     Post,
     SpamFilter,
     Video,
@@ -45,8 +47,11 @@ from ..models import (
     get_template_base_dir_choices,
 )
 from ..modal_facet_counts import get_modal_facet_counts
-from ..player import build_player_payload
+from ..player import CueIndex, build_cues
+from ..player_cache import get_or_build_payload, get_player_config_version, get_podlove_episode_version
 from ..podlove import build_podlove_player_config
+from ..transcripts import public
+from ..transcripts.search import search_transcripts
 from ..views.theme import set_template_base_dir
 from .serializers import (
     AudioPodloveSerializer,
@@ -59,6 +64,12 @@ from .viewmixins import AddRequestUserMixin, FileUploadResponseMixin
 
 logger = logging.getLogger(__name__)
 
+PLAYER_CUE_PAGE_SIZE = 200
+MAX_PLAYER_CUE_PAGE_SIZE = 1000
+
+# ETag of the cues of an audio without a transcript.
+EMPTY_CUES_ETAG = f'"{hashlib.sha256(json.dumps([]).encode("utf-8")).hexdigest()}"'
+
 
 @api_view(["GET"])
 def api_root(request: Request) -> Response:
@@ -148,10 +159,9 @@ class AudioPodloveDetailView(generics.RetrieveAPIView):
         # context consistent; a mismatched or non-public anchor is a 404.
         anchors = [anchor for anchor in (post_id, episode_id) if anchor is not None]
         if anchors:
-            for anchor in anchors:
-                authorize_audio_access(request, audio=instance, explicit_anchor_id=anchor)
+            pages = [authorize_audio_access(request, audio=instance, explicit_anchor_id=anchor) for anchor in anchors]
         else:
-            authorize_audio_access(request, audio=instance)
+            pages = [authorize_audio_access(request, audio=instance)]
         if episode_id is not None:
             instance.set_episode_id(int(episode_id))
 
@@ -161,13 +171,56 @@ class AudioPodloveDetailView(generics.RetrieveAPIView):
             self.request = request
             self.format_kwarg = None
         context = self.get_serializer_context()
-        post_id = kwargs.get("post_id")
+        post = None
         if post_id:
             post = get_object_or_404(Post, pk=post_id)
             context["post"] = post
 
-        serializer = self.get_serializer(instance, context=context)
-        return Response(serializer.data)
+        # The payload is keyed by everything it is built from, so a changed
+        # audio, transcript, mapping, chapter, page or image gets a new ETag.
+        version = get_podlove_episode_version(
+            instance, post=post, episode_id=int(episode_id) if episode_id is not None else None, request=request
+        )
+        if public.etag_matches(request, version.etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = get_or_build_payload(version, lambda: dict(self.get_serializer(instance, context=context).data))
+            response = Response(data)
+        response["ETag"] = version.etag
+        patch_audio_cache_headers(response, *pages)
+        return response
+
+
+class InvalidCueSelection(ValueError):
+    pass
+
+
+def parse_cue_selection(query_params: Any) -> tuple[str, float | int, float | int] | None:
+    """Parse the optional ``from``/``to`` window or ``page``/``page_size`` of a cue request.
+
+    Returns ``None`` for the full transcript, ``("window", start, end)`` or
+    ``("page", number, size)``. Raises ``InvalidCueSelection`` for malformed values.
+    """
+    has_window = "from" in query_params or "to" in query_params
+    has_page = "page" in query_params or "page_size" in query_params
+    if has_window and has_page:
+        raise InvalidCueSelection("Use either from/to or page/page_size")
+    try:
+        if has_window:
+            start = float(query_params.get("from", 0))
+            end = float(query_params.get("to", math.inf))
+            if math.isnan(start) or math.isnan(end) or start < 0:
+                raise InvalidCueSelection("Invalid time window")
+            return "window", start, end
+        if has_page:
+            number = int(query_params.get("page", 1))
+            size = int(query_params.get("page_size", PLAYER_CUE_PAGE_SIZE))
+            if number < 1 or not 1 <= size <= MAX_PLAYER_CUE_PAGE_SIZE:
+                raise InvalidCueSelection("Invalid page")
+            return "page", number, size
+    except ValueError as error:
+        raise InvalidCueSelection(str(error)) from error
+    return None
 
 
 class AudioPlayerTranscriptView(generics.RetrieveAPIView):
@@ -176,6 +229,12 @@ class AudioPlayerTranscriptView(generics.RetrieveAPIView):
     The custom player loads the transcript lazily, fetching this endpoint once the
     first time the reader opens the Transcript panel. Returns the normalized,
     sanitized ``{"cues": [...]}`` shape — never the raw Podlove file.
+
+    ``?from=<seconds>&to=<seconds>`` limits the cues to those playing in that
+    window and ``?page=<n>&page_size=<n>`` returns one page of cues. Both add the
+    total ``count`` of cues; pages also add the ``next`` page number or ``null``.
+    They are served from a :class:`~cast.player.CueIndex`, so long episodes only
+    decode the requested cues.
     """
 
     queryset = Audio.objects.all()
@@ -188,34 +247,51 @@ class AudioPlayerTranscriptView(generics.RetrieveAPIView):
         if post is None:
             # Do not leak unsanitized data for a missing/mismatched context.
             raise Http404("No transcript available for this audio in the given context.")
-        payload = build_player_payload(audio, post=post, request=request, inline_transcript=False)
-        cues = payload["transcript"]["cues"]
+        try:
+            selection = parse_cue_selection(request.query_params)
+        except InvalidCueSelection:
+            return Response({"error": "Invalid cue selection"}, status=status.HTTP_400_BAD_REQUEST)
+        episode = post.specific
+        duration = int(audio.duration.total_seconds()) if audio.duration is not None else None
 
         # Cache so re-opening the transcript after navigation doesn't refetch.
-        # A strong ETag over the *sanitized* cues stays correct across transcript
-        # edits and contributor/speaker-mapping changes; Cache-Control lets the
-        # browser serve from its HTTP cache within the window (no request), and a
-        # cheap 304 covers revalidation after it. The content is already public.
-        serialized = json.dumps(cues, ensure_ascii=False, sort_keys=True)
-        etag = f'"{hashlib.sha256(serialized.encode("utf-8")).hexdigest()}"'
-        if_none_match = request.headers.get("If-None-Match", "")
-        candidates = {token.strip() for token in if_none_match.split(",") if token.strip()}
-        if etag in candidates or "*" in candidates:
+        # The strong ETag is derived from the transcript artifact fingerprint and
+        # the speaker-mapping/contributor state, so it stays correct across
+        # transcript edits and mapping changes and a 304 is answered without
+        # reading the transcript from storage. Cache-Control lets the browser
+        # serve from its HTTP cache within the window (no request). The content
+        # is already public.
+        transcript = getattr(audio, "transcript", None)
+        version = None
+        etag = EMPTY_CUES_ETAG
+        if transcript is not None:
+            version = public.get_public_transcript_version(
+                transcript, output=public.OUTPUT_PLAYER_CUE_INDEX, episode=episode, extra=duration
+            )
+            etag = version.etag
+        if public.etag_matches(request, etag):
             response: Response = Response(status=status.HTTP_304_NOT_MODIFIED)
         else:
-            response = Response({"cues": cues})
+            index = CueIndex([])
+            if version is not None:
+                index = public.get_or_build_public_output(
+                    version, lambda: CueIndex(build_cues(audio, episode=episode, duration=duration))
+                )
+            response = Response(self._select_cues(index, selection))
         response["ETag"] = etag
-        self._set_cache_headers(response, post)
+        patch_audio_cache_headers(response, post)
         return response
 
     @staticmethod
-    def _set_cache_headers(response: Response, post: Post) -> None:
-        specific = getattr(post, "specific", post)
-        if page_is_unrestricted_public(specific):
-            response["Cache-Control"] = "public, max-age=3600, stale-while-revalidate=86400"
-            return
-        response["Cache-Control"] = "private, no-store"
-        patch_vary_headers(response, ("Cookie", "Authorization"))
+    def _select_cues(index: CueIndex, selection: tuple[str, float | int, float | int] | None) -> dict[str, Any]:
+        if selection is None:
+            return {"cues": index.all()}
+        kind, first, second = selection
+        if kind == "window":
+            return {"cues": index.window(first, second), "count": len(index)}
+        number, size = int(first), int(second)
+        has_next = number * size < len(index)
+        return {"cues": index.page(number, size), "count": len(index), "next": number + 1 if has_next else None}
 
     @staticmethod
     def _get_authorized_post(post_id: Any, audio: Audio, request: Request) -> Post | None:
@@ -242,8 +318,20 @@ class PlayerConfig(generics.RetrieveAPIView):
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         template_base_dir = get_template_base_dir(request, None)
         color_scheme = request.query_params.get("color_scheme")
-        config = build_podlove_player_config(template_base_dir=template_base_dir, color_scheme=color_scheme)
-        return Response(config)
+        version = get_player_config_version(template_base_dir=template_base_dir, color_scheme=color_scheme)
+        if public.etag_matches(request, version.etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            config = get_or_build_payload(
+                version,
+                lambda: build_podlove_player_config(template_base_dir=template_base_dir, color_scheme=color_scheme),
+            )
+            response = Response(config)
+        response["ETag"] = version.etag
+        # the theme may come from the session
+        response["Cache-Control"] = "public, max-age=3600"
+        patch_vary_headers(response, ("Cookie",))
+        return response
 
 
 class FacetCountListView(generics.ListAPIView):
@@ -282,6 +370,45 @@ class CommentTrainingDataView(APIView):
         return JsonResponse(train, safe=False)
 
 
+class TranscriptSearchView(APIView):
+    """Search the transcripts of live, public episodes.
+
+    ``?q=<words>`` returns the newest matching episodes with the start time (in
+    seconds) and text of their first matching segments, so clients can deep
+    link into the player. ``?podcast=<page id>`` limits the search to the
+    episodes below one podcast or blog. Queries are answered from the
+    transcript search index, never from the transcript files.
+    """
+
+    permission_classes = (AllowAny,)
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        episodes = Episode.objects.live().public()
+        podcast_id = request.query_params.get("podcast")
+        if podcast_id is not None:
+            try:
+                blog = Blog.objects.live().public().get(pk=int(podcast_id))
+            except (Blog.DoesNotExist, ValueError):
+                return Response({"error": "Invalid podcast"}, status=status.HTTP_400_BAD_REQUEST)
+            episodes = episodes.descendant_of(blog)
+        results = search_transcripts(request.query_params.get("q", ""), episodes=episodes)
+        return Response(
+            {
+                "results": [
+                    {
+                        "episode": {
+                            "id": result.episode.pk,
+                            "title": result.episode.title,
+                            "url": result.episode.get_full_url(request=request),
+                        },
+                        "hits": [{"start": hit.start_ms / 1000, "text": hit.text} for hit in result.hits],
+                    }
+                    for result in results
+                ]
+            }
+        )
+
+
 class ThemeListView(generics.ListAPIView):
     """
     Return a list of available themes. Mark the currently selected theme.
@@ -51,7 +51,11 @@ class CastConfig(AppConfig):
     def ready(self) -> None:
         from . import checks  # noqa: F401 — registers @register("cast") decorators
         from .appsettings import init_cast_settings
+        from .models.repository.cache import connect_repository_cache_receivers
         from .podcast_numbering import install_episode_numbering_publish_hook
+        from .static_feeds import connect_static_feed_receivers
 
         init_cast_settings()
         install_episode_numbering_publish_hook()
+        connect_repository_cache_receivers()
+        connect_static_feed_receivers()
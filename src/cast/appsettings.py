@@ -43,7 +43,17 @@ CAST_SETTING_REGISTRY: dict[str, CastSetting] = {
     "CAST_REGULAR_IMAGE_SLOT_DIMENSIONS": CastSetting([(1110, 740)], list),
     "CAST_GALLERY_IMAGE_SLOT_DIMENSIONS": CastSetting([(1110, 740), (120, 80)], list),
     "CAST_GALLERY_THUMBNAIL_RENDITIONS_SRGB": CastSetting(True, bool),
+    "CAST_RENDITION_TASK_BACKEND": CastSetting("default"),
     "CAST_REPOSITORY": CastSetting("default", str),
+    "CAST_REPOSITORY_CACHE_TIMEOUT": CastSetting(0),
+    "CAST_REPOSITORY_CACHE_ALIAS": CastSetting("default"),
+    "CAST_DESCRIPTION_CACHE_TIMEOUT": CastSetting(0),
+    "CAST_TRANSCRIPT_CACHE_TIMEOUT": CastSetting(0),
+    "CAST_PLAYER_CACHE_TIMEOUT": CastSetting(0),
+    "CAST_SRCSET_CACHE_TIMEOUT": CastSetting(0),
+    "CAST_STATIC_FEEDS_ROOT": CastSetting(""),
+    "CAST_PODCAST_FEED_PAGE_SIZE": CastSetting(0),
+    "CAST_STREAMING_FEEDS": CastSetting(False),
     "CAST_PODLOVE_PLAYER_THEMES": CastSetting({}, dict),
     "CAST_AUDIO_PLAYER": CastSetting("podlove", str),
     "CAST_EDITOR_SCOPES": CastSetting(
@@ -106,7 +116,17 @@ if TYPE_CHECKING:
     CAST_REGULAR_IMAGE_SLOT_DIMENSIONS: list[tuple[int, int]]
     CAST_GALLERY_IMAGE_SLOT_DIMENSIONS: list[tuple[int, int]]
     CAST_GALLERY_THUMBNAIL_RENDITIONS_SRGB: bool
+    CAST_RENDITION_TASK_BACKEND: str
     CAST_REPOSITORY: str
+    CAST_REPOSITORY_CACHE_TIMEOUT: int
+    CAST_REPOSITORY_CACHE_ALIAS: str
+    CAST_DESCRIPTION_CACHE_TIMEOUT: int
+    CAST_TRANSCRIPT_CACHE_TIMEOUT: int
+    CAST_PLAYER_CACHE_TIMEOUT: int
+    CAST_SRCSET_CACHE_TIMEOUT: int
+    CAST_STATIC_FEEDS_ROOT: str
+    CAST_PODCAST_FEED_PAGE_SIZE: int
+    CAST_STREAMING_FEEDS: bool
     CAST_PODLOVE_PLAYER_THEMES: dict[str, Any]
     CAST_AUDIO_PLAYER: str
     CAST_EDITOR_SCOPES: dict[str, set[str]]
@@ -16,7 +16,8 @@ from __future__ import annotations
 
 from typing import Any
 
-from django.http import Http404
+from django.http import Http404, HttpResponseBase
+from django.utils.cache import patch_vary_headers
 
 
 def page_is_publicly_viewable(page: Any, request: Any) -> bool:
@@ -42,6 +43,19 @@ def page_is_unrestricted_public(page: Any) -> bool:
     return not page.get_view_restrictions().exists()
 
 
+def patch_audio_cache_headers(response: HttpResponseBase, *pages: Any) -> None:
+    """Set ``Cache-Control`` for a response that ``pages`` granted access to.
+
+    Shared caches may only store the response when every page is live and
+    unrestricted. Anything else is request-specific.
+    """
+    if all(page_is_unrestricted_public(getattr(page, "specific", page)) for page in pages):
+        response["Cache-Control"] = "public, max-age=3600, stale-while-revalidate=86400"
+        return
+    response["Cache-Control"] = "private, no-store"
+    patch_vary_headers(response, ("Cookie", "Authorization"))
+
+
 def user_can_edit_page(page: Any, user: Any) -> bool:
     """Return ``True`` when ``user`` may edit ``page`` (covers preview/draft access)."""
     if page is None or user is None or not getattr(user, "is_authenticated", False):
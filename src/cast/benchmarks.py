@@ -0,0 +1,197 @@
+"""
+Query-count, latency and memory benchmarks for the pages and feeds built by
+the repository layer.
+
+``seed_benchmark_site`` creates a blog and a podcast with images, galleries,
+videos, audios and transcripts through ``cast.devdata``.
+``run_benchmarks`` then requests the blog index, a post detail page, every
+feed variant and the Wagtail pages API with the Django test client and
+reports the results as a JSON-serializable dict, so the output of two
+releases can be diffed.
+
+Every target is measured cold (caches cleared before the request) and warm
+(the same request repeated without clearing). Wall times are the median of
+``repeat`` runs. Query count and peak memory come from one extra run under
+``tracemalloc``, because tracing allocations slows the request down too much
+to be used for the timings.
+"""
+
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any, cast
+
+import django
+import wagtail
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.http import HttpResponseBase
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import __version__, appsettings
+from .devdata import generate_blog_with_media
+from .models import Audio, Blog, Episode, Podcast, Post
+
+BENCHMARK_SCHEMA_VERSION = 1
+
+DEFAULT_MEDIA_NUMBERS = {"images": 2, "galleries": 1, "images_in_galleries": 3, "videos": 1, "audios": 1}
+
+
+@dataclass(frozen=True)
+class Measurement:
+    queries: int
+    wall_time_ms: float
+    peak_memory_kib: float
+
+
+@dataclass(frozen=True)
+class TargetResult:
+    name: str
+    path: str
+    status_code: int
+    cold: Measurement
+    warm: Measurement
+
+
+@dataclass(frozen=True)
+class BenchmarkTarget:
+    name: str
+    path: str
+
+
+@dataclass(frozen=True)
+class BenchmarkSite:
+    blog: Blog
+    podcast: Podcast
+    media_numbers: dict[str, int]
+
+
+def seed_benchmark_site(*, number_of_posts: int, media_numbers: dict[str, int] | None = None) -> BenchmarkSite:
+    """Create a blog and a podcast with ``number_of_posts`` posts/episodes each."""
+    media_numbers = media_numbers or DEFAULT_MEDIA_NUMBERS
+    blog = generate_blog_with_media(number_of_posts=number_of_posts, media_numbers=media_numbers)
+    podcast = generate_blog_with_media(number_of_posts=number_of_posts, media_numbers=media_numbers, podcast=True)
+    return BenchmarkSite(blog=blog, podcast=cast(Podcast, podcast), media_numbers=media_numbers)
+
+
+def get_podcast_audio_formats(podcast: Podcast) -> list[str]:
+    """Return the audio formats ``podcast`` has feeds for: those its live episodes have files in."""
+    audios = Audio.objects.filter(episodes__in=Episode.objects.child_of(podcast).live())
+    return [audio_format for audio_format in Audio.audio_formats if audios.exclude(**{audio_format: ""}).exists()]
+
+
+def get_benchmark_targets(site: BenchmarkSite) -> list[BenchmarkTarget]:
+    """Return the pages, feeds and API endpoints to measure for ``site``."""
+    blog, podcast = site.blog, site.podcast
+    post = Post.objects.child_of(blog).live().latest("visible_date")
+    episode = Episode.objects.child_of(podcast).live().latest("visible_date")
+    targets = [
+        BenchmarkTarget("blog_index", blog.url),
+        BenchmarkTarget("podcast_index", podcast.url),
+        BenchmarkTarget("latest_entries_feed", reverse("cast:latest_entries_feed", kwargs={"slug": blog.slug})),
+        BenchmarkTarget(
+            "latest_entries_atom_feed", reverse("cast:latest_entries_atom_feed", kwargs={"slug": blog.slug})
+        ),
+        BenchmarkTarget("post_detail", post.url),
+        BenchmarkTarget("episode_detail", episode.url),
+    ]
+    page_size = appsettings.CAST_PODCAST_FEED_PAGE_SIZE
+    has_archive = 0 < page_size < Episode.objects.child_of(podcast).live().count()
+    for audio_format in get_podcast_audio_formats(podcast):
+        kwargs = {"slug": podcast.slug, "audio_format": audio_format}
+        for kind in ("rss", "atom"):
+            targets.append(
+                BenchmarkTarget(
+                    f"podcast_feed_{kind}_{audio_format}", reverse(f"cast:podcast_feed_{kind}", kwargs=kwargs)
+                )
+            )
+            if has_archive:
+                targets.append(
+                    BenchmarkTarget(
+                        f"podcast_feed_{kind}_archive_{audio_format}",
+                        reverse(f"cast:podcast_feed_{kind}_archive", kwargs=kwargs | {"archive_page": 1}),
+                    )
+                )
+    pages_api = reverse("cast:api:wagtail:pages:listing")
+    targets.append(BenchmarkTarget("wagtail_pages_api_listing", f"{pages_api}?child_of={blog.pk}"))
+    pages_api_detail = reverse("cast:api:wagtail:pages:detail", kwargs={"pk": post.pk})
+    targets.append(BenchmarkTarget("wagtail_pages_api_detail", pages_api_detail))
+    return targets
+
+
+def clear_caches() -> None:
+    for cache in caches.all():
+        cache.clear()
+
+
+def fetch(client: Client, path: str) -> HttpResponseBase:
+    """Request ``path`` and consume the body, so streaming responses are fully rendered."""
+    response = client.get(path)
+    if response.streaming:
+        b"".join(response.streaming_content)  # type: ignore[attr-defined]
+    return response
+
+
+def measure(request: Callable[[], HttpResponseBase], *, repeat: int, prepare: Callable[[], None]) -> Measurement:
+    wall_times = []
+    for _ in range(repeat):
+        prepare()
+        started = time.perf_counter()
+        request()
+        wall_times.append((time.perf_counter() - started) * 1000)
+
+    prepare()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            request()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measurement(
+        queries=len(queries),
+        wall_time_ms=round(statistics.median(wall_times), 3),
+        peak_memory_kib=round(peak / 1024, 1),
+    )
+
+
+def benchmark_target(client: Client, target: BenchmarkTarget, *, repeat: int) -> TargetResult:
+    def request() -> HttpResponseBase:
+        return fetch(client, target.path)
+
+    status_code = request().status_code
+    cold = measure(request, repeat=repeat, prepare=clear_caches)
+    # the last cold request filled the caches again
+    warm = measure(request, repeat=repeat, prepare=lambda: None)
+    return TargetResult(name=target.name, path=target.path, status_code=status_code, cold=cold, warm=warm)
+
+
+def run_benchmarks(site: BenchmarkSite, *, repeat: int = 3, client: Client | None = None) -> dict[str, Any]:
+    """Measure all targets of ``site`` and return the machine-readable report."""
+    client = client or Client()
+    number_of_posts = Post.objects.child_of(site.blog).count()
+    results = [benchmark_target(client, target, repeat=repeat) for target in get_benchmark_targets(site)]
+    return {
+        "schema_version": BENCHMARK_SCHEMA_VERSION,
+        "environment": {
+            "django_cast": __version__,
+            "django": django.get_version(),
+            "wagtail": wagtail.__version__,
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "debug": settings.DEBUG,
+            "repository": appsettings.CAST_REPOSITORY,
+        },
+        "parameters": {
+            "number_of_posts": number_of_posts,
+            "media_numbers": site.media_numbers,
+            "repeat": repeat,
+        },
+        "results": [asdict(result) for result in results],
+    }
@@ -26,6 +26,7 @@ from .renditions import (
     RenditionFilters,
     Width,
 )
+from .srcset_cache import SrcsetRequest, get_or_build_images_for_slots
 
 if TYPE_CHECKING:
     from .models import Audio, Video
@@ -41,7 +42,21 @@ def get_srcset_images_for_slots(
     renditions: dict[str, AbstractRendition],
 ) -> dict[Rectangle, ImageForSlot]:
     """
-    Get the srcset images for the given slots and image formats. This will return a list of ImageInSlot objects.
+    Get the srcset images for the given slots and image formats, from the srcset cache if it is enabled.
+    """
+    [images_for_slots] = get_or_build_images_for_slots(
+        [(image, image_type, renditions)], build_srcset_images_for_slots
+    )
+    return images_for_slots
+
+
+def build_srcset_images_for_slots(
+    image: AbstractImage,
+    image_type: ImageType,
+    renditions: dict[str, AbstractRendition],
+) -> dict[Rectangle, ImageForSlot]:
+    """
+    Build the srcset images for the given slots and image formats. This will return a list of ImageInSlot objects.
     """
     images_for_slots = {}
     rendition_filters = RenditionFilters.from_wagtail_image_with_type(image=image, image_type=image_type)
@@ -49,7 +64,12 @@ def get_srcset_images_for_slots(
     rendition_filters.set_filter_to_url_via_wagtail_renditions(renditions)
     for slot in slots:
         try:
-            images_for_slots[slot] = rendition_filters.get_image_for_slot(slot)
+            image_for_slot = rendition_filters.get_image_for_slot(slot)
+            if rendition_filters.original_format not in image_for_slot.src:
+                # renditions are still being created in the background -> use original image meanwhile
+                image_for_slot.src[rendition_filters.original_format] = image.file.url
+                image_for_slot.srcset[rendition_filters.original_format] = f"{image.file.url} {image.width}w"
+            images_for_slots[slot] = image_for_slot
         except ValueError:
             # no fitting image found for slot -> use original image
             src = {}
@@ -194,10 +214,13 @@ def add_image_thumbnails(images: Iterable[AbstractImage], context: dict) -> None
     )
     repository: HasRenditionsForPosts = context["repository"]
     renditions_for_posts = repository.renditions_for_posts
+    images = list(images)
+    requests: list[SrcsetRequest] = []
     for image in images:
         image_renditions = renditions_for_posts.get(image.pk, [])
-        fetched_renditions = {r.filter_spec: r for r in image_renditions}
-        images_for_slots = get_srcset_images_for_slots(image, "gallery", renditions=fetched_renditions)
+        requests.append((image, "gallery", {r.filter_spec: r for r in image_renditions}))
+    # one cache lookup for all images of the gallery
+    for image, images_for_slots in zip(images, get_or_build_images_for_slots(requests, build_srcset_images_for_slots)):
         image.modal = images_for_slots[modal_slot]
         image.thumbnail = images_for_slots[thumbnail_slot]
 
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from django_tasks import task
+
+from .models import Blog
+from .static_feeds import release_static_feed_job, render_static_feeds
+
+
+@task()
+def render_blog_static_feeds(blog_id: int) -> None:
+    # Released before rendering, so changes committed while the feeds render enqueue another run.
+    release_static_feed_job(blog_id)
+    blog = Blog.objects.filter(pk=blog_id).specific().first()
+    if blog is None:
+        return
+    render_static_feeds(blog)
@@ -1,11 +1,18 @@
+import hashlib
 import logging
+from abc import ABCMeta, abstractmethod
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime, time
 from typing import Any, Protocol, cast
 
 import django
 from django.contrib.syndication.views import Feed
-from django.db.models import Model, QuerySet
-from django.http import Http404, HttpRequest
+from django.db.models import Count, Max, Model, QuerySet
+from django.http import Http404, HttpRequest, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.http import http_date
 from django.utils.feedgenerator import (
     Atom1Feed,
     Rss201rev2Feed,
@@ -20,8 +27,9 @@ from cast import appsettings
 from cast.http_types import HtmxHttpRequest
 from cast.site_lookup import get_site_specific_page_or_404
 
-from .models import Audio, Blog, EpisodeContributor, Podcast, Post
-from .models.repository import FeedContext
+from .models import Audio, Blog, ChapterMark, Episode, EpisodeContributor, Podcast, Post, Transcript
+from .models.repository import FeedContext, paginate_feed_queryset
+from .models.repository.cache import get_media_generation, get_or_build_cachable_data
 
 if django.VERSION >= (5, 2):
     from django.utils.feedgenerator import Stylesheet
@@ -33,6 +41,10 @@ else:  # pragma: no cover
 logger = logging.getLogger(__name__)
 
 PSC_NAMESPACE = "http://podlove.org/simple-chapters"
+# Set while a streamed feed is built. Feed views are shared between requests,
+# so the mode must not be stored on the feed instance.
+_streaming_feed: ContextVar[bool] = ContextVar("cast_streaming_feed", default=False)
+FEED_HISTORY_NAMESPACE = "http://purl.org/syndication/history/1.0"
 
 
 class _RepositoryAwareFeed(Protocol):
@@ -73,8 +85,97 @@ def _psc_start(iso: str) -> str:
     return f"{formatted}.{start.microsecond // 1000:03d}"
 
 
+@dataclass(frozen=True)
+class FeedValidators:
+    etag: str
+    last_modified: datetime | None
+
+
+def get_feed_validators(request: HttpRequest, *, slug: str, is_podcast: bool) -> FeedValidators | None:
+    """Return the ETag and Last-Modified validators for a feed without building it.
+
+    A single aggregate over the posts the feed would contain covers publishing,
+    unpublishing and editing posts, and for podcasts editing their audio. Podcast
+    feeds also link transcripts and list chapters, so the artifact fingerprints of
+    the transcripts and the chapter marks of their audios are hashed as well. The
+    media generation, changed whenever audios, chapters, transcripts, videos,
+    images or renditions are saved or deleted, covers the media in post bodies.
+    The result is stored on the request because ``condition()`` asks for the
+    ETag and the Last-Modified date separately.
+    """
+    if (validators := getattr(request, "_cast_feed_validators", None)) is not None:
+        return validators
+    try:
+        blog = get_site_specific_page_or_404(Podcast if is_podcast else Blog, request, slug=slug)
+    except Http404:
+        return None  # let the feed view answer with its own 404
+    media_state: list[Any] = [get_media_generation()]
+    if is_podcast:
+        episodes = Episode.objects.live().public().descendant_of(blog).filter(podcast_audio__isnull=False)
+        aggregates = episodes.aggregate(
+            count=Count("pk"),
+            last_published_at=Max("last_published_at"),
+            audio_modified=Max("podcast_audio__modified"),
+        )
+        audio_ids = episodes.values("podcast_audio_id")
+        media_state += [
+            list(
+                Transcript.objects.filter(audio_id__in=audio_ids)
+                .order_by("pk")
+                .values_list("pk", "audio_id", "artifact_fingerprint")
+            ),
+            list(
+                ChapterMark.objects.filter(audio_id__in=audio_ids)
+                .order_by("pk")
+                .values_list("pk", "audio_id", "start", "title", "link", "image")
+            ),
+        ]
+    else:
+        aggregates = (
+            Post.objects.live()
+            .public()
+            .descendant_of(blog)
+            .aggregate(count=Count("pk"), last_published_at=Max("last_published_at"))
+        )
+    dates = [blog.last_published_at, aggregates["last_published_at"], aggregates.get("audio_modified")]
+    template_base_dir = blog.get_template_base_dir(cast(HtmxHttpRequest, request))
+    fingerprint = "\n".join(
+        str(part) for part in (request.path, blog.pk, template_base_dir, aggregates["count"], *dates, *media_state)
+    )
+    validators = FeedValidators(
+        etag=f'"{hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()}"',
+        last_modified=max((date for date in dates if date is not None), default=None),
+    )
+    setattr(request, "_cast_feed_validators", validators)
+    return validators
+
+
+def feed_etag(request: HttpRequest, *, is_podcast: bool, slug: str, **kwargs: Any) -> str | None:
+    validators = get_feed_validators(request, slug=slug, is_podcast=is_podcast)
+    return validators.etag if validators is not None else None
+
+
+def feed_last_modified(request: HttpRequest, *, is_podcast: bool, slug: str, **kwargs: Any) -> datetime | None:
+    validators = get_feed_validators(request, slug=slug, is_podcast=is_podcast)
+    return validators.last_modified if validators is not None else None
+
+
+@dataclass(frozen=True)
+class FeedPaging:
+    """Position of one document in an RFC 5005 paged podcast feed."""
+
+    page_size: int
+    archive_count: int
+    archive_page: int | None = None  # None is the subscription document
+
+    @property
+    def is_archive(self) -> bool:
+        return self.archive_page is not None
+
+
 class RepositoryMixin(Feed):
     is_podcast: bool = False
+    paging: FeedPaging | None = None
     request: HtmxHttpRequest
 
     def __init__(self, repository: FeedContext | None = None) -> None:
@@ -87,32 +188,52 @@ class RepositoryMixin(Feed):
                 # don't use the same repository twice
                 return self.repository  # use predefined repository
         # create new repository
+        variant = "podcast-feed" if self.is_podcast else "feed"
+        page_kwargs: dict[str, Any] = {}
+        if (paging := self.paging) is not None:
+            variant = f"{variant}:{paging.archive_page or 'current'}:{paging.page_size}"
+            page_kwargs = {"page_size": paging.page_size, "archive_page": paging.archive_page}
         if appsettings.CAST_REPOSITORY == "default":
             # default repository from cachable data
-            cachable_data = FeedContext.data_for_feed_cachable(request=request, blog=blog, is_podcast=self.is_podcast)
+            cachable_data = get_or_build_cachable_data(
+                request=request,
+                blog=blog,
+                variant=variant,
+                build=lambda: FeedContext.data_for_feed_cachable(
+                    request=request, blog=blog, is_podcast=self.is_podcast, **page_kwargs
+                ),
+            )
             return FeedContext.create_from_cachable_data(data=cachable_data)
         else:
             # create repository from django models
             blog.refresh_from_db()  # FIXME this is stale sometimes
-            if self.is_podcast:
-                from .models import Episode
-
-                post_queryset = (
-                    Episode.objects.live()
-                    .public()
-                    .descendant_of(blog)
-                    .select_related("podcast_audio__transcript", "season")
-                    .filter(podcast_audio__isnull=False)
-                    .order_by("-visible_date")
-                )
-            else:
-                post_queryset = Post.objects.live().public().descendant_of(blog).order_by("-visible_date")
+            post_queryset = FeedContext.get_post_queryset(blog, is_podcast=self.is_podcast)
+            if page_kwargs:
+                post_queryset = paginate_feed_queryset(post_queryset, **page_kwargs)
             return FeedContext.create_from_django_models(
                 request=request,
                 blog=blog,
                 post_queryset=post_queryset,
             )
 
+    def stream(self, request: HttpRequest, *args: Any, **kwargs: Any) -> StreamingHttpResponse:
+        """
+        Return the feed as a streaming response.
+
+        The root elements are sent before any item is rendered, and each item
+        description is rendered right before the item is written, so the
+        rendered descriptions are never held in memory all at once.
+        """
+        blog = cast(Blog, self.get_object(request, *args, **kwargs))
+        token = _streaming_feed.set(True)
+        try:
+            feedgen = cast(StreamingFeedMixin, self.get_feed(blog, request))
+        finally:
+            _streaming_feed.reset(token)
+        response = StreamingHttpResponse(feedgen.iter_chunks("utf-8"), content_type=feedgen.content_type)
+        response.headers["Last-Modified"] = http_date(feedgen.latest_post_date().timestamp())
+        return response
+
     def items(self) -> QuerySet[Post]:
         assert self.repository is not None
         queryset = self.repository.post_queryset
@@ -133,14 +254,37 @@ class RepositoryMixin(Feed):
         cast(_RepositoryAwareFeed, feed).repository = repository
         return feed
 
+    @property
+    def streaming(self) -> bool:
+        """Whether the feed is built for a streaming response in the current context."""
+        return _streaming_feed.get()
+
     def item_description(self, item: Post) -> SafeText:
+        if self.streaming:
+            # rendered by the feed generator via the render_description item kwarg
+            return SafeText("")
+        return self.get_description_renderer(item)()
+
+    def get_description_renderer(self, item: Post) -> Callable[[], SafeText]:
+        # Bind request and repository now, the renderer might be called after
+        # this feed instance has moved on to the next request.
+        request = self.request
         repository = None
         if self.repository is not None:
             repository = self.repository.get_post_detail_repository(item)
-        item.description = item.get_description(
-            request=self.request, render_detail=True, escape_html=False, repository=repository
-        )
-        return item.description
+
+        def render_description() -> SafeText:
+            item.description = item.get_description(
+                request=request, render_detail=True, escape_html=False, repository=repository
+            )
+            return item.description
+
+        return render_description
+
+    def item_extra_kwargs(self, item: Post) -> dict[str, Any]:
+        if self.streaming:
+            return {"render_description": self.get_description_renderer(item)}
+        return {}
 
     def item_link(self, item: Post) -> str:
         if self.repository is not None:
@@ -172,28 +316,112 @@ class RepositoryMixin(Feed):
         sites_models.SITE_CACHE[site_id] = DjangoSite(id=site_id, domain=domain, name=domain)
 
 
-class AtomStylesheetsMixin:
-    """Atom feed generator mixin that supports XSL stylesheets."""
+class _ChunkBuffer:
+    """File-like object collecting the encoded output of a SimplerXMLGenerator."""
 
-    feed: dict[str, Any]
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
+    def write(self, data: bytes) -> None:
+        self.chunks.append(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class StreamingFeedMixin(SyndicationFeed, metaclass=ABCMeta):
+    """
+    Feed generator mixin that can write the document one item at a time.
+
+    Subclasses split the document into ``write_document_start`` and
+    ``write_document_end``. Items with a ``render_description`` callable get
+    their description rendered right before they are written.
+    """
+
+    content_type: str
+    item_element = "item"
 
     def add_stylesheets(self, handler: SimplerXMLGenerator) -> None:
+        # SyndicationFeed only knows about stylesheets since Django 5.2.
         for stylesheet in self.feed.get("stylesheets") or []:
             handler.processingInstruction("xml-stylesheet", str(stylesheet))
 
+    @abstractmethod
+    def write_document_start(self, handler: SimplerXMLGenerator) -> None:
+        """Write everything before the first item."""
+
+    @abstractmethod
+    def write_document_end(self, handler: SimplerXMLGenerator) -> None:
+        """Write everything after the last item."""
+
+    def write_item(self, handler: SimplerXMLGenerator, item: dict[str, Any]) -> None:
+        if (render_description := item.get("render_description")) is not None:
+            # don't keep the rendered description around after the item is written
+            item = item | {"description": str(render_description())}
+        handler.startElement(self.item_element, cast(Any, self.item_attributes(item)))
+        self.add_item_elements(handler, item)
+        handler.endElement(self.item_element)
+
+    def write_items(self, handler: SimplerXMLGenerator) -> None:
+        for item in self.items:
+            self.write_item(handler, item)
+
     def write(self, outfile: Any, encoding: str) -> None:
+        handler = SimplerXMLGenerator(outfile, encoding, short_empty_elements=True)
+        self.write_document_start(handler)
+        self.write_items(handler)
+        self.write_document_end(handler)
+
+    def iter_chunks(self, encoding: str) -> Iterator[bytes]:
+        """Yield the encoded document: the root elements first, then one chunk per item."""
+        buffer = _ChunkBuffer()
+        handler = SimplerXMLGenerator(buffer, encoding, short_empty_elements=True)
+        self.write_document_start(handler)
+        yield buffer.drain()
+        for item in self.items:
+            self.write_item(handler, item)
+            yield buffer.drain()
+        self.write_document_end(handler)
+        yield buffer.drain()
+
+
+class StreamingRssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    """RSS 2.0 feed generator that supports streaming."""
+
+    def write_document_start(self, handler: SimplerXMLGenerator) -> None:
+        handler.startDocument()
+        # Any stylesheet must come after the start of the document but before any tag.
+        self.add_stylesheets(handler)
+        handler.startElement("rss", cast(Any, self.rss_attributes()))
+        handler.startElement("channel", cast(Any, self.root_attributes()))
+        self.add_root_elements(handler)
+
+    def write_document_end(self, handler: SimplerXMLGenerator) -> None:
+        self.endChannelElement(handler)
+        handler.endElement("rss")
+
+
+class AtomStylesheetsMixin(StreamingFeedMixin):
+    """Atom feed generator mixin that supports XSL stylesheets and streaming."""
+
+    feed: dict[str, Any]
+    item_element = "entry"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+
+    def write_document_start(self, handler: SimplerXMLGenerator) -> None:
         # Atom1Feed.write() does not call add_stylesheets() like Rss201rev2Feed does,
-        # so we override write() below to inject stylesheet processing instructions.
+        # so the document start injects the stylesheet processing instructions.
         atom_feed = cast(Atom1Feed, self)
-        handler = SimplerXMLGenerator(outfile, encoding, short_empty_elements=True)
         handler.startDocument()
         self.add_stylesheets(handler)
         handler.startElement("feed", cast(Any, atom_feed.root_attributes()))
         atom_feed.add_root_elements(handler)
-        atom_feed.write_items(handler)
+
+    def write_document_end(self, handler: SimplerXMLGenerator) -> None:
         handler.endElement("feed")
 
 
@@ -203,6 +431,7 @@ class AtomFeedWithStylesheets(AtomStylesheetsMixin, Atom1Feed):
 
 class LatestEntriesFeed(RepositoryMixin):
     stylesheets = _feed_stylesheets
+    feed_type: type[SyndicationFeed] = StreamingRssFeed
     item_guid_is_permalink = False
     object: Blog
     request: HtmxHttpRequest
@@ -255,6 +484,7 @@ class LatestEntriesAtomFeed(LatestEntriesFeed):
 
 class ITunesElements(SyndicationFeed):
     feed: dict[str, Any]
+    paging_link_element = "atom:link"
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         if args or kwargs:
@@ -311,6 +541,14 @@ class ITunesElements(SyndicationFeed):
         generator = "Django Web Framework / django-cast"
         haqe("generator", generator)
         haqe("docs", "https://blogs.law.harvard.edu/tech/rss")
+        self.add_paging_elements(handler)
+
+    def add_paging_elements(self, handler: SimplerXMLGenerator) -> None:
+        """Add the RFC 5005 links of a paged feed."""
+        for rel, href in self.feed.get("paging_links", []):
+            handler.addQuickElement(self.paging_link_element, attrs={"rel": rel, "href": href})
+        if self.feed.get("is_archive"):
+            handler.addQuickElement("fh:archive")
 
     def add_item_elements(self, handler: SimplerXMLGenerator, item: dict[str, Any]) -> None:
         """Add additional elements to the post object"""
@@ -341,6 +579,8 @@ class ITunesElements(SyndicationFeed):
     def namespace_attributes(self) -> dict[str, str]:
         namespace_attributes = {}
         namespace_attributes.update({"xmlns:itunes": "http://www.itunes.com/dtds/podcast-1.0.dtd"})
+        if "paging_links" in getattr(self, "feed", {}):
+            namespace_attributes["xmlns:fh"] = FEED_HISTORY_NAMESPACE
         return namespace_attributes
 
 
@@ -412,13 +652,15 @@ class PodcastIndexElements(ITunesElements):
 
 
 class AtomITunesFeedGenerator(PodcastIndexElements, AtomStylesheetsMixin, Atom1Feed):
+    paging_link_element = "link"
+
     def root_attributes(self) -> dict[str, str]:
         atom_attrs = super().root_attributes()
         atom_attrs.update(self.namespace_attributes())
         return atom_attrs
 
 
-class RssITunesFeedGenerator(PodcastIndexElements, Rss201rev2Feed):
+class RssITunesFeedGenerator(PodcastIndexElements, StreamingRssFeed):
     def rss_attributes(self) -> dict[str, str]:
         rss_attrs = super().rss_attributes()
         rss_attrs.update(self.namespace_attributes())
@@ -435,6 +677,8 @@ class PodcastFeed(RepositoryMixin):
     object: Podcast
     request: HtmxHttpRequest
     is_podcast: bool = True
+    url_name: str
+    archive_url_name: str
 
     def set_audio_format(self, audio_format: str) -> None:
         format_to_mime = Audio.mime_lookup
@@ -456,8 +700,50 @@ class PodcastFeed(RepositoryMixin):
             blog = get_site_specific_page_or_404(Podcast, request, slug=slug)
         self.object = blog
         self.request = cast(HtmxHttpRequest, request)  # need request for item.serve(request) later on
+        self.paging = self.get_paging(blog, kwargs.get("archive_page"))
         return self.object
 
+    @staticmethod
+    def get_paging(blog: Podcast, archive_page: int | None) -> FeedPaging | None:
+        """Return the position of the requested document if paged feeds are enabled.
+
+        Only complete archive pages exist, so an archive page never changes once it
+        is published. The newest episodes are in the subscription document.
+        """
+        page_size = appsettings.CAST_PODCAST_FEED_PAGE_SIZE
+        if page_size <= 0:
+            if archive_page is not None:
+                raise Http404("paged feeds are disabled")
+            return None
+        archive_count = FeedContext.get_post_queryset(blog, is_podcast=True).count() // page_size
+        if archive_page is not None and not 1 <= archive_page <= archive_count:
+            raise Http404("unknown archive page")
+        return FeedPaging(page_size=page_size, archive_count=archive_count, archive_page=archive_page)
+
+    def get_document_url(self, archive_page: int | None) -> str:
+        kwargs: dict[str, Any] = {"slug": self.object.slug, "audio_format": self.audio_format}
+        if archive_page is None:
+            url = reverse(self.url_name, kwargs=kwargs)
+        else:
+            url = reverse(self.archive_url_name, kwargs=kwargs | {"archive_page": archive_page})
+        return self.request.build_absolute_uri(url)
+
+    def get_paging_links(self, paging: FeedPaging) -> list[tuple[str, str]]:
+        """Return the ``(rel, href)`` links pointing to the other documents of the feed."""
+        links = []
+        if paging.archive_page is None:
+            if paging.archive_count > 0:
+                newest_archive = self.get_document_url(paging.archive_count)
+                links += [("next", newest_archive), ("prev-archive", newest_archive)]
+        else:
+            links.append(("current", self.get_document_url(None)))
+            if paging.archive_page > 1:
+                older_archive = self.get_document_url(paging.archive_page - 1)
+                links += [("next", older_archive), ("prev-archive", older_archive)]
+            if paging.archive_page < paging.archive_count:
+                links.append(("next-archive", self.get_document_url(paging.archive_page + 1)))
+        return links
+
     def link(self) -> str:
         if self.repository is not None:
             return self.repository.blog_url
@@ -496,11 +782,15 @@ class PodcastFeed(RepositoryMixin):
     def item_keywords(self, item: Post) -> str:
         return item.keywords
 
-    def feed_extra_kwargs(self, obj: Podcast) -> dict[str, Blog]:
-        return {"blog": self.object}
+    def feed_extra_kwargs(self, obj: Podcast) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {"blog": self.object}
+        if self.paging is not None:
+            kwargs["paging_links"] = self.get_paging_links(self.paging)
+            kwargs["is_archive"] = self.paging.is_archive
+        return kwargs
 
-    def item_extra_kwargs(self, item: Post) -> dict[str, Blog | Post]:
-        return {"blog": self.object, "post": item}
+    def item_extra_kwargs(self, item: Post) -> dict[str, Any]:
+        return super().item_extra_kwargs(item) | {"blog": self.object, "post": item}
 
     def get_feed(self, obj: Blog, request: HttpRequest) -> SyndicationFeed:
         feed = super().get_feed(obj, request)
@@ -511,6 +801,8 @@ class PodcastFeed(RepositoryMixin):
 class AtomPodcastFeed(PodcastFeed):
     stylesheets = _feed_stylesheets
     feed_type = AtomITunesFeedGenerator
+    url_name = "cast:podcast_feed_atom"
+    archive_url_name = "cast:podcast_feed_atom_archive"
 
     def author_name(self, blog: Blog) -> str:
         return blog.author_name
@@ -526,6 +818,8 @@ class AtomPodcastFeed(PodcastFeed):
 class RssPodcastFeed(PodcastFeed):
     stylesheets = _feed_stylesheets
     feed_type = RssITunesFeedGenerator
+    url_name = "cast:podcast_feed_rss"
+    archive_url_name = "cast:podcast_feed_rss_archive"
 
     def item_guid(self, _post: Post) -> None:
         """ITunesElements can't add isPermaLink attr unless None is returned here."""
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from dataclasses import dataclass
 from typing import Any
@@ -9,6 +11,7 @@ from uuid import uuid4
 from django.core.files.base import ContentFile
 from django.db import transaction
 
+MAX_CONCURRENT_STAGED_FILES = 4
 COMPOUND_SUFFIXES = (".podlove.json", ".dote.json", ".speakers.json")
 GENERATED_SUFFIX_RE = re.compile(r"(?:-[0-9a-f]{12})+$")
 
@@ -37,6 +40,26 @@ class StagedFileReplacementGroup:
         self.replacements.append(replacement)
         return replacement
 
+    def stage_concurrently(self, files: Sequence[tuple[Any, str, bytes]]) -> None:
+        """Stage ``(field, filename, content)`` replacements in parallel.
+
+        Every upload is waited for. If one of them fails, all replacements of
+        the group are rolled back and the first error is raised.
+        """
+        if not files:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(files), MAX_CONCURRENT_STAGED_FILES)) as executor:
+            futures = [executor.submit(stage_file_replacement, *file) for file in files]
+        error: BaseException | None = None
+        for future in futures:
+            if (future_error := future.exception()) is not None:
+                error = error or future_error
+            else:
+                self.replacements.append(future.result())
+        if error is not None:
+            self.rollback()
+            raise error
+
     def save_model(self, model: Any, *args: Any, **kwargs: Any) -> None:
         try:
             with transaction.atomic():
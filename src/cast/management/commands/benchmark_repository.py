@@ -0,0 +1,69 @@
+import json
+import tempfile
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from ... import appsettings
+from ...benchmarks import run_benchmarks, seed_benchmark_site
+
+
+class Command(BaseCommand):
+    help = (
+        "seed blogs of the given sizes into a throwaway test database and report query counts, wall times and "
+        "peak memory of the blog index, post detail, feeds and Wagtail pages API as JSON"
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--posts",
+            action="append",
+            type=int,
+            help="Number of posts and episodes to seed. Can be passed more than once (default: 10).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of timed requests per target and cache state (default: 3).",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=None,
+            help="Write the JSON report to this file instead of stdout.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        sizes = options["posts"] or [10]
+        caches = {
+            alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": f"cast-benchmark-{alias}"}
+            for alias in {"default", appsettings.CAST_REPOSITORY_CACHE_ALIAS}
+        }
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with (
+                tempfile.TemporaryDirectory() as media_root,
+                override_settings(MEDIA_ROOT=media_root, CACHES=caches, ALLOWED_HOSTS=["testserver"]),
+            ):
+                reports = [self.benchmark(number_of_posts, options["repeat"]) for number_of_posts in sizes]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = json.dumps(reports, indent=2)
+        if options["output"] is None:
+            self.stdout.write(report)
+        else:
+            options["output"].write_text(report + "\n")
+
+    def benchmark(self, number_of_posts: int, repeat: int) -> dict[str, Any]:
+        self.stderr.write(f"benchmarking {number_of_posts} posts")
+        with transaction.atomic():
+            site = seed_benchmark_site(number_of_posts=number_of_posts)
+            report = run_benchmarks(site, repeat=repeat)
+            transaction.set_rollback(True)
+        return report
@@ -9,7 +9,8 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.core.management.base import BaseCommand, CommandError
 
 from ...models import Audio, Episode, Transcript
-from ...voxhelm import VoxhelmError, VoxhelmTranscriptService, transcript_complete
+from ...voxhelm import TranscriptGenerationResult, VoxhelmError, VoxhelmTranscriptService, transcript_complete
+from ...voxhelm.batch import TranscriptBatch, TranscriptBatchItem, TranscriptBatchState
 
 
 @dataclass(frozen=True)
@@ -41,6 +42,17 @@ class Command(BaseCommand):
             action="store_true",
             help="Regenerate transcripts even when all transcript files already exist.",
         )
+        parser.add_argument(
+            "--concurrency",
+            default=1,
+            type=int,
+            help="Number of Voxhelm jobs to keep in flight at once.",
+        )
+        parser.add_argument(
+            "--state-file",
+            default="",
+            help="JSON file recording progress. Rerunning with the same file resumes the batch.",
+        )
 
     def handle(self, *args: Any, **options: Any) -> None:
         episode_ids = list(options["episode_id"])
@@ -48,15 +60,29 @@ class Command(BaseCommand):
         if not episode_ids and not audio_ids:
             raise CommandError("Provide at least one --episode-id or --audio-id.")
 
+        concurrency = options["concurrency"]
+        if concurrency < 1:
+            raise CommandError("--concurrency must be at least 1.")
+        state = None
+        if options["state_file"]:
+            try:
+                state = TranscriptBatchState.load(options["state_file"])
+            except VoxhelmError as exc:
+                raise CommandError(str(exc)) from exc
+
         targets = self._resolve_targets(episode_ids=episode_ids, audio_ids=audio_ids)
         service = VoxhelmTranscriptService()
-        created = 0
-        updated = 0
+        generated = {"created": 0, "updated": 0}
         skipped = 0
         errors = 0
 
+        items: list[TranscriptBatchItem] = []
         for target in targets:
             audio = target.audio
+            if state is not None and state.is_done(audio.pk):
+                skipped += 1
+                self.stdout.write(f"skipped audio={audio.pk} state=done")
+                continue
             existing = self._get_existing_transcript(audio=audio)
             if existing is not None and transcript_complete(existing) and not options["force"]:
                 skipped += 1
@@ -66,28 +92,38 @@ class Command(BaseCommand):
             task_ref = f"cast-audio-{audio.pk}"
             if options["force"]:
                 task_ref = f"{task_ref}-{uuid4().hex[:8]}"
-
-            try:
-                result = service.generate_for_audio(audio, task_ref=task_ref, episode=target.episode)
-            except VoxhelmError as exc:
-                errors += 1
-                self.stderr.write(f"error audio={audio.pk}: {exc}")
-                continue
-
-            if result.created:
-                created += 1
-                action = "created"
-            else:
-                updated += 1
-                action = "updated"
-            self.stdout.write(f"{action} audio={audio.pk} transcript={result.transcript.pk} job={result.job_id}")
-
+            items.append(TranscriptBatchItem(audio=audio, task_ref=task_ref, episode=target.episode))
+
+        if concurrency > 1 or state is not None:
+            batch = TranscriptBatch(service, concurrency=concurrency, state=state)
+            for outcome in batch.run(items):
+                if outcome.result is None:
+                    errors += 1
+                    self.stderr.write(f"error audio={outcome.item.audio.pk}: {outcome.error}")
+                    continue
+                generated[self._report(outcome.item.audio, outcome.result)] += 1
+        else:
+            for item in items:
+                try:
+                    result = service.generate_for_audio(item.audio, task_ref=item.task_ref, episode=item.episode)
+                except VoxhelmError as exc:
+                    errors += 1
+                    self.stderr.write(f"error audio={item.audio.pk}: {exc}")
+                    continue
+                generated[self._report(item.audio, result)] += 1
+
+        created, updated = generated["created"], generated["updated"]
         self.stdout.write(
             f"processed={len(targets)} created={created} updated={updated} skipped={skipped} errors={errors}"
         )
         if errors:
             raise CommandError(f"{errors} transcript generations failed.")
 
+    def _report(self, audio: Audio, result: TranscriptGenerationResult) -> str:
+        action = "created" if result.created else "updated"
+        self.stdout.write(f"{action} audio={audio.pk} transcript={result.transcript.pk} job={result.job_id}")
+        return action
+
     @staticmethod
     def _get_existing_transcript(*, audio: Audio) -> Transcript | None:
         try:
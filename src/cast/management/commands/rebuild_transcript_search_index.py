@@ -0,0 +1,26 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...models import Transcript
+
+
+class Command(BaseCommand):
+    help = "rebuild the time-coded transcript search index from the stored transcript files"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="only index transcripts that have no search segments yet",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        transcripts = Transcript.objects.order_by("pk")
+        if options["missing"]:
+            transcripts = transcripts.filter(search_segments__isnull=True)
+        indexed = segments = 0
+        for transcript in transcripts.iterator():
+            segments += transcript.rebuild_search_index()
+            indexed += 1
+        self.stdout.write(f"transcripts={indexed} segments={segments}")
@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import appsettings
+from ...static_feeds import is_static_feeds_enabled, render_all_static_feeds
+
+
+class Command(BaseCommand):
+    help = "render the feeds of all live blogs to CAST_STATIC_FEEDS_ROOT"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not is_static_feeds_enabled():
+            raise CommandError("CAST_STATIC_FEEDS_ROOT is not set.")
+        written = render_all_static_feeds()
+        self.stdout.write(f"rendered={len(written)} root={appsettings.CAST_STATIC_FEEDS_ROOT}")
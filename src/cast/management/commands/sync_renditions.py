@@ -1,12 +1,17 @@
 from argparse import ArgumentParser, RawTextHelpFormatter
+from time import monotonic
 from typing import Any
 
 from django.core.management.base import BaseCommand, CommandError, CommandParser
 from rich.progress import track
-from wagtail.images.models import Image, Rendition
+from wagtail.images.models import Rendition
 
 from ...models import Blog, Post
-from ...models.image_renditions import get_obsolete_and_missing_rendition_strings
+from ...models.image_renditions import (
+    get_obsolete_and_missing_rendition_strings,
+    invalidate_rendition_dependents,
+    iter_create_missing_renditions,
+)
 
 
 class Command(BaseCommand):
@@ -18,8 +23,10 @@ What does it mean to sync the renditions for all posts?
 Optional arguments:
     --post-slug: sync renditions for a specific post
     --blog-slug: sync renditions for posts in a specific blog
+    --workers: number of processes creating renditions in parallel (default 1)
 
-By default all posts are synced.
+By default all posts are synced. Each image's renditions are committed as soon
+as they are created, so rerunning an interrupted sync only creates the rest.
     """
 
     def create_parser(self, prog_name: str, subcommand: str, **kwargs: Any) -> CommandParser:
@@ -32,6 +39,9 @@ By default all posts are synced.
         parser.add_argument("--post-slug", type=str, help="Sync renditions for a specific post")
         # Optional argument for a blog slug
         parser.add_argument("--blog-slug", type=str, help="Sync renditions for posts in a specific blog")
+        parser.add_argument(
+            "--workers", type=int, default=1, help="Number of processes creating renditions in parallel"
+        )
 
     def handle(self, *args: Any, **options: Any) -> None:
         post_slug = options.get("post_slug")
@@ -56,8 +66,22 @@ By default all posts are synced.
         all_images = Post.get_all_images_from_queryset(posts_queryset)
         obsolete_renditions, missing_renditions = get_obsolete_and_missing_rendition_strings(all_images)
         Rendition.objects.filter(id__in=obsolete_renditions).delete()
-        missing_rendition_items = list(missing_renditions.items())
-        print("len missing renditions: ", len(missing_rendition_items))
-        for image_id, filter_specs in track(missing_rendition_items, description="create missing renditions"):
-            image = Image.objects.get(id=image_id)
-            image.get_renditions(*filter_specs)
+        self.stdout.write(
+            f"missing renditions={sum(map(len, missing_renditions.values()))} images={len(missing_renditions)}"
+        )
+        started = monotonic()
+        created = 0
+        for _image_id, created_for_image in track(
+            iter_create_missing_renditions(missing_renditions, workers=options["workers"]),
+            total=len(missing_renditions),
+            description="create missing renditions",
+        ):
+            created += created_for_image
+        if created:
+            # once for the whole run instead of once per image
+            invalidate_rendition_dependents()
+        elapsed = max(monotonic() - started, 1e-9)
+        self.stdout.write(
+            f"created renditions={created} images={len(missing_renditions)} seconds={elapsed:.1f} "
+            f"renditions_per_second={created / elapsed:.1f}"
+        )
@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import subprocess
 import time
-from collections.abc import Iterator, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from contextvars import ContextVar
-from typing import Any
+from contextvars import ContextVar, copy_context
+from typing import Any, TypeVar
+
+MEDIA_PROBE_MAX_WORKERS = 4
+
+_Target = TypeVar("_Target")
+_Result = TypeVar("_Result")
 
 
 _probe_deadline: ContextVar[float | None] = ContextVar("cast_probe_deadline", default=None)
@@ -39,3 +45,18 @@ def media_probe_budget_active() -> bool:
 def run_media_probe(command: Sequence[str], *, timeout: float = 30, **kwargs: Any) -> subprocess.CompletedProcess:
     """Run an ffprobe/ffmpeg command using the active cumulative budget."""
     return subprocess.run(command, timeout=remaining_probe_timeout(timeout), **kwargs)
+
+
+def probe_concurrently(
+    probe: Callable[[_Target], _Result], targets: Mapping[str, _Target], *, max_workers: int = MEDIA_PROBE_MAX_WORKERS
+) -> dict[str, _Result]:
+    """Run ``probe`` for all targets in parallel threads and return the results by key.
+
+    Every probe runs in a copy of the caller's context, so an active ``media_probe_budget``
+    limits all of them together. The first failure in target order is raised after all probes finished.
+    """
+    if len(targets) <= 1:
+        return {key: probe(target) for key, target in targets.items()}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(targets))) as executor:
+        futures = {key: executor.submit(copy_context().run, probe, target) for key, target in targets.items()}
+    return {key: future.result() for key, future in futures.items()}
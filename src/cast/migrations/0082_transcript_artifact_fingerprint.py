@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cast", "0081_remove_heading_block"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transcript",
+            name="artifact_fingerprint",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Hash of the public transcript artifacts, empty if there are none. Computed when they change.",
+                max_length=64,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cast", "0082_transcript_artifact_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranscriptSegment",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("position", models.PositiveIntegerField()),
+                ("start_ms", models.PositiveBigIntegerField()),
+                ("text", models.TextField()),
+                (
+                    "transcript",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_segments",
+                        to="cast.transcript",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("transcript_id", "position"),
+            },
+        ),
+        migrations.CreateModel(
+            name="TranscriptSearchTerm",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("term", models.CharField(max_length=64)),
+                (
+                    "segment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_terms",
+                        to="cast.transcriptsegment",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="transcriptsegment",
+            constraint=models.UniqueConstraint(
+                fields=("transcript", "position"), name="unique_transcript_segment_position"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transcriptsearchterm",
+            index=models.Index(fields=["term", "segment"], name="cast_transcript_term_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="transcriptsearchterm",
+            constraint=models.UniqueConstraint(fields=("segment", "term"), name="unique_transcript_segment_term"),
+        ),
+    ]
@@ -18,6 +18,8 @@ from .theme import (
 from .transcript_generation import TranscriptGeneration
 from .transcript import (
     Transcript,
+    TranscriptSearchTerm,
+    TranscriptSegment,
     TranscriptSpeakerMapping,
     TranscriptSpeakerSample,
     TranscriptVoiceReferenceCandidate,
@@ -51,6 +53,8 @@ __all__ = [
     "SpamFilter",
     "TranscriptGeneration",
     "Transcript",
+    "TranscriptSearchTerm",
+    "TranscriptSegment",
     "TranscriptSpeakerMapping",
     "TranscriptSpeakerSample",
     "TranscriptVoiceReferenceCandidate",
@@ -1,9 +1,8 @@
 import json
 import logging
-import re
 import subprocess
 from copy import deepcopy
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable
 from datetime import timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional, Protocol, cast
@@ -19,7 +18,7 @@ from wagtail.models import CollectionMember, PageManager
 from wagtail.search import index
 from wagtail.search.queryset import SearchableQuerySetMixin
 
-from ..media_probe import run_media_probe
+from ..media_probe import probe_concurrently, run_media_probe
 from ..media_validation import validate_audio_upload
 
 if TYPE_CHECKING:
@@ -158,52 +157,114 @@ class Audio(CollectionMember, index.Indexed, TimeStampedModel):  # type: ignore[
         return paths
 
     @staticmethod
-    def _get_audio_duration(audio_url: str | Path) -> timedelta:
-        # Taken from: http://trac.ffmpeg.org/wiki/FFprobeTips
+    def _probe_audio_file(audio_url: str | Path) -> dict[str, Any]:
+        """Run ffprobe once and return the format, streams and chapters of an audio file."""
         cmd = [
             "ffprobe",
             "-v",
-            "0",
+            "error",
             "-print_format",
             "json",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "default=noprint_wrappers=1:nokey=1",
+            "-show_format",
+            "-show_streams",
+            "-show_chapters",
             str(audio_url),
         ]
-        result = (
-            run_media_probe(
-                cmd,
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                timeout=30,
-            )
-            .stdout.decode()
-            .strip()
-        )
-        m = re.match(r"^(?P<seconds>\d+)\.(?P<microseconds>\d+)$", result)
-        if m is None:
-            raise ValueError(f"Could not parse duration: {result}")
-        return timedelta(seconds=int(m["seconds"]), microseconds=int(m["microseconds"]))
-
-    def create_duration(self) -> None:
+        result = run_media_probe(cmd, check=True, stdout=subprocess.PIPE, timeout=30)
+        probe_data = json.loads(result.stdout)
+        if not isinstance(probe_data, dict):
+            raise ValueError(f"Unexpected ffprobe output: {result.stdout!r}")
+        return probe_data
+
+    @classmethod
+    def metadata_from_probe(cls, probe_data: dict[str, Any]) -> dict[str, Any]:
+        """Extract duration, bitrate, codec, channels, sample rate, size and chapters from ffprobe output."""
+        file_format = probe_data.get("format")
+        file_format = file_format if isinstance(file_format, dict) else {}
+        streams = probe_data.get("streams")
+        audio_streams = [
+            stream
+            for stream in (streams if isinstance(streams, list) else [])
+            if isinstance(stream, dict) and stream.get("codec_type") == "audio"
+        ]
+        stream = audio_streams[0] if audio_streams else {}
+
+        def number(value: Any, convert: type[int] | type[float] = int) -> int | float | None:
+            # ffprobe reports numbers as strings and unknown values as "N/A"
+            try:
+                return convert(value)
+            except (TypeError, ValueError):
+                return None
+
+        duration = file_format.get("duration", stream.get("duration"))
+        if duration is not None and number(duration, float) is None:
+            raise ValueError(f"Could not parse duration: {duration}")
+        return {
+            "duration": number(duration, float),
+            "bit_rate": number(file_format.get("bit_rate", stream.get("bit_rate"))),
+            "codec": stream.get("codec_name"),
+            "channels": number(stream.get("channels")),
+            "sample_rate": number(stream.get("sample_rate")),
+            "size": number(file_format.get("size")),
+            "chapters": cls.clean_ffprobe_chaptermarks(probe_data),
+        }
+
+    @staticmethod
+    def _get_probe_url(field: Any) -> str | None:
+        """Return the URL of a remote file or the path of a local one, ``None`` if it has neither."""
+        if not (hasattr(field, "url") and hasattr(field, "path")):
+            return None
+        file_field = cast(FileField, field)
+        audio_url = file_field.url
+        if not audio_url.startswith("http"):
+            audio_url = file_field.path
+        return audio_url
+
+    def get_probe_metadata(self, audio_format: str) -> dict[str, Any] | None:
+        """Return the recorded probe metadata of a format, if it belongs to the current file."""
+        metadata = self.data.get("probe", {}).get(audio_format)
+        field = getattr(self, audio_format)
+        if metadata is None or metadata.get("file") != field.name:
+            return None
+        return metadata
+
+    def probe_audio_files(self, audio_formats: Collection[str] | None = None) -> None:
+        """
+        Probe every uploaded file without recorded metadata, each with a single ffprobe run and all
+        of them concurrently, and record the metadata in ``data["probe"]``. Only the files of
+        ``audio_formats`` are probed if given.
+        """
+        targets = {}
         for name, field in self.uploaded_audio_files:
+            if audio_formats is not None and name not in audio_formats:
+                continue
+            if self.get_probe_metadata(name) is not None:
+                continue
             try:
-                if hasattr(field, "url") and hasattr(field, "path"):
-                    file_field = cast(FileField, field)
-                    audio_url = file_field.url
-                    if not audio_url.startswith("http"):
-                        audio_url = file_field.path
-                    self.duration = self._get_audio_duration(audio_url)
-                    break
+                audio_url = self._get_probe_url(field)
             except NotImplementedError:  # pragma: no cover
-                pass
-            except subprocess.TimeoutExpired as exc:
-                raise AudioDurationProbeTimeout("Audio duration probing timed out.") from exc
-            except (subprocess.CalledProcessError, OSError, ValueError) as exc:
-                raise AudioDurationProbeError("Audio duration probing failed.") from exc
+                continue
+            if audio_url is not None:
+                targets[name] = audio_url
+        probe_results = probe_concurrently(self._probe_audio_file, targets)
+        probed = self.data.setdefault("probe", {})
+        for name, probe_data in probe_results.items():
+            probed[name] = {"file": getattr(self, name).name, **self.metadata_from_probe(probe_data)}
+
+    def create_duration(self, audio_formats: Collection[str] | None = None) -> None:
+        try:
+            self.probe_audio_files(audio_formats)
+        except subprocess.TimeoutExpired as exc:
+            raise AudioDurationProbeTimeout("Audio duration probing timed out.") from exc
+        except (subprocess.CalledProcessError, OSError, ValueError) as exc:
+            raise AudioDurationProbeError("Audio duration probing failed.") from exc
+        if self.duration is not None:
+            return
+        for name, _field in self.uploaded_audio_files:
+            metadata = self.get_probe_metadata(name)
+            if metadata is not None and metadata["duration"] is not None:
+                self.duration = timedelta(seconds=metadata["duration"])
+                break
 
     @property
     def audio(self) -> list[dict[str, str]]:
@@ -266,6 +327,10 @@ class Audio(CollectionMember, index.Indexed, TimeStampedModel):  # type: ignore[
         return cleaned
 
     def get_chaptermark_data_from_file(self, audio_format: str) -> list[dict[str, str]]:
+        metadata = self.get_probe_metadata(audio_format)
+        if metadata is not None:
+            # recorded by the probe when the file was saved
+            return metadata["chapters"]
         file_field = getattr(self, audio_format)
         try:
             url = file_field.url
@@ -274,18 +339,7 @@ class Audio(CollectionMember, index.Indexed, TimeStampedModel):  # type: ignore[
         if not url.startswith("http"):
             # use path from local filesystem
             url = file_field.path
-        command = [
-            "ffprobe",
-            "-i",
-            str(url),
-            "-print_format",
-            "json",
-            "-show_chapters",
-            "-loglevel",
-            "error",
-        ]
-        ffprobe_data = json.loads(run_media_probe(command, check=True, stdout=subprocess.PIPE).stdout)
-        return self.clean_ffprobe_chaptermarks(ffprobe_data)
+        return self.clean_ffprobe_chaptermarks(self._probe_audio_file(url))
 
     def set_episode_id(self, episode_id: int) -> None:
         """Set the episode id for this audio file to be able to return audio.episode_url in api."""
@@ -324,6 +378,11 @@ class Audio(CollectionMember, index.Indexed, TimeStampedModel):  # type: ignore[
     def size_to_metadata(self) -> None:
         self.data["size"] = self.data.get("size", {})
         for audio_format, field in self.uploaded_audio_files:
+            metadata = self.get_probe_metadata(audio_format)
+            if metadata is not None and metadata["size"] is not None:
+                # no storage request needed
+                self.data["size"][audio_format] = metadata["size"]
+                continue
             try:
                 assert hasattr(field, "size"), f"field {field} has no size attribute"
                 self.data["size"][audio_format] = field.size
@@ -348,10 +407,12 @@ class Audio(CollectionMember, index.Indexed, TimeStampedModel):  # type: ignore[
         generate_duration = kwargs.pop("duration", True)
         cache_file_sizes = kwargs.pop("cache_file_sizes", True)
         using = kwargs.get("using")
+        new_uploads: set[str] = set()
         if generate_duration:
             for audio_format, field in self.uploaded_audio_files:
                 if not getattr(field, "_committed", True):
                     validate_audio_upload(field.file, audio_format=audio_format)
+                    new_uploads.add(audio_format)
         # Keep metadata enrichment and persistence all-or-nothing to avoid
         # partially updated rows when duration/filesize caching fails.
         with transaction.atomic(using=using):
@@ -359,17 +420,24 @@ class Audio(CollectionMember, index.Indexed, TimeStampedModel):  # type: ignore[
             super().save(*args, **kwargs)
 
             update_fields = []
+            old_data = deepcopy(self.data)
+            probed = self.data.get("probe", {})
+            for audio_format in new_uploads:
+                # an overwriting storage may keep the name of the replaced file
+                probed.pop(audio_format, None)
             if generate_duration and self.duration is None:
                 logger.info("save audio duration")
                 self.create_duration()
                 if self.duration is not None:
                     update_fields.append("duration")
+            elif new_uploads:
+                # the duration is known, only record the metadata of new or replaced files
+                self.create_duration(new_uploads)
 
             if cache_file_sizes:
-                old_data = deepcopy(self.data)
                 self.size_to_metadata()
-                if old_data != self.data:
-                    update_fields.append("data")
+            if old_data != self.data:
+                update_fields.append("data")
 
             if update_fields:
                 save_kwargs: dict[str, object] = {"update_fields": update_fields}
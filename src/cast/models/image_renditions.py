@@ -1,15 +1,27 @@
 from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import TYPE_CHECKING, TypeAlias
 
-from wagtail.images.models import Image, Rendition
+import django
+from django.core.cache import caches
+from django.db import connections
+from wagtail.images import get_image_model
+from wagtail.images.models import Filter, Image, Rendition
 
+from .. import appsettings
+from ..rendition_pipeline import DecodedImageSource, create_renditions_from_decoded_source
 from ..renditions import ImageType, RenditionFilters, get_srgb_counterpart_filter_spec
+from .repository.cache import invalidate_media
 
 ImageIdSet = set[int]
 RenditionStringsByImageId = dict[int, set[str]]
 ObsoleteAndMissing = tuple[ImageIdSet, RenditionStringsByImageId]
 ImagesWithType: TypeAlias = Iterable[tuple[ImageType, Image]]
 
+RENDITION_JOB_KEY_PREFIX = "cast:renditions:job"
+# A lost job blocks new jobs for the same image at most this long.
+RENDITION_JOB_DEDUP_SECONDS = 600
+
 if TYPE_CHECKING:
     from cast.models import Post
 
@@ -82,18 +94,82 @@ def get_all_images_from_posts(posts: Iterator["Post"]) -> ImagesWithType:
         yield from post.get_all_images()
 
 
+def invalidate_rendition_dependents() -> None:
+    """
+    Invalidate the cached data and static feeds a saved rendition would, once for a batch of images. Bulk inserts
+    and ``Image.create_renditions`` send no ``post_save``, so the receivers of the rendition model never run.
+    """
+    # Imported here because static_feeds imports the models package.
+    from ..static_feeds import on_shared_content_changed
+
+    invalidate_media()
+    on_shared_content_changed(sender=get_image_model().get_rendition_model(), instance=None)
+
+
+def create_renditions_for_image(image: Image, filter_specs: Iterable[str]) -> int:
+    """
+    Create the renditions of one image. The original is read and decoded once for all filter specs
+    and the new renditions are inserted with a single bulk insert. Returns the number of filter specs.
+    Callers invalidate the dependents with ``invalidate_rendition_dependents`` once they are done.
+    """
+    # The specs are known to be missing from the database, so skip get_renditions' lookups.
+    # Those consult the rendition cache, which may still hold renditions that no longer exist.
+    filters = [image.clean_filter_for_svg(Filter(spec=filter_spec)) for filter_spec in sorted(filter_specs)]
+    source = DecodedImageSource.open(image) if len(filters) > 1 else None
+    if source is None:
+        image.create_renditions(*filters)
+    else:
+        create_renditions_from_decoded_source(image, source, [rendition_filter.spec for rendition_filter in filters])
+    return len(filters)
+
+
+def create_renditions_for_image_id(image_id: int, filter_specs: list[str]) -> tuple[int, int]:
+    """
+    Process pool entry point for ``create_renditions_for_image``. Images deleted in the meantime are skipped.
+    """
+    image = Image.objects.filter(pk=image_id).first()
+    if image is None:
+        return image_id, 0
+    return image_id, create_renditions_for_image(image, filter_specs)
+
+
+def iter_create_missing_renditions(
+    missing_renditions: RenditionStringsByImageId, *, workers: int = 1
+) -> Iterator[tuple[int, int]]:
+    """
+    Create the missing renditions image by image and yield ``(image_id, created)`` as each image is done.
+
+    With more than one worker, images are spread over a process pool. Renditions are committed per
+    image, so an interrupted run resumes where it stopped, because existing renditions are no longer missing.
+    """
+    items = sorted(missing_renditions.items())
+    if workers <= 1:
+        images = Image.objects.in_bulk([image_id for image_id, _filter_specs in items])
+        for image_id, filter_specs in items:
+            image = images.get(image_id)
+            yield image_id, create_renditions_for_image(image, filter_specs) if image is not None else 0
+        return
+
+    # forked workers must open their own database connections instead of sharing the parent's
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+        futures = [
+            executor.submit(create_renditions_for_image_id, image_id, sorted(filter_specs))
+            for image_id, filter_specs in items
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
 def create_missing_renditions_for_images(missing_renditions: RenditionStringsByImageId) -> None:
     """
     Create all required renditions for all images in the iterable posts.
     """
-    for image_id, filter_specs in missing_renditions.items():
-        image = Image.objects.get(id=image_id)
-        for filter_string in filter_specs:
-            image.get_rendition(filter_string).save()
-        # for filter_string, rendition in image.get_renditions(*filter_specs).items():
-        #     if rendition.pk is None:
-        #         # this causes a lot of weird errors, probably a bug in Wagtail :(
-        #         rendition.save()  # FIXME why do we need to save the rendition twice?
+    created = sum(
+        created_for_image for _image_id, created_for_image in iter_create_missing_renditions(missing_renditions)
+    )
+    if created:
+        invalidate_rendition_dependents()
 
 
 def create_missing_renditions_for_posts(posts: Iterator["Post"]) -> None:
@@ -103,3 +179,62 @@ def create_missing_renditions_for_posts(posts: Iterator["Post"]) -> None:
     images_with_type = get_all_images_from_posts(posts)
     _, missing_renditions = get_obsolete_and_missing_rendition_strings(images_with_type)
     create_missing_renditions_for_images(missing_renditions)
+
+
+def rendition_job_key(image_id: int) -> str:
+    return f"{RENDITION_JOB_KEY_PREFIX}:{image_id}"
+
+
+def release_rendition_job(image_id: int) -> None:
+    caches[appsettings.CAST_REPOSITORY_CACHE_ALIAS].delete(rendition_job_key(image_id))
+
+
+def enqueue_image_renditions(image_id: int, image_types: Iterable[ImageType]) -> bool:
+    """
+    Enqueue the rendition job of an image unless one is already pending. Returns whether it was enqueued.
+
+    Pending jobs are tracked per image, whatever their image types, so one image gets one job at a time.
+    The job creates the renditions of every image type the image is used with.
+    """
+    image_types = sorted(set(image_types))
+    key = rendition_job_key(image_id)
+    if not caches[appsettings.CAST_REPOSITORY_CACHE_ALIAS].add(key, True, timeout=RENDITION_JOB_DEDUP_SECONDS):
+        return False
+    # Imported here because importing the task module resolves the TASKS backend.
+    from ..rendition_tasks import create_image_renditions
+
+    try:
+        create_image_renditions.using(backend=appsettings.CAST_RENDITION_TASK_BACKEND).enqueue(image_id, image_types)
+    except Exception:
+        release_rendition_job(image_id)
+        raise
+    return True
+
+
+def enqueue_missing_renditions_for_posts(posts: Iterator["Post"]) -> RenditionStringsByImageId:
+    """
+    Enqueue one rendition job per image with missing renditions in the posts and return the missing renditions.
+    """
+    images_with_type = list(get_all_images_from_posts(posts))
+    _, missing_renditions = get_obsolete_and_missing_rendition_strings(images_with_type)
+    image_types_by_id: dict[int, set[ImageType]] = {}
+    for image_type, image in images_with_type:
+        if image.pk in missing_renditions:
+            image_types_by_id.setdefault(image.pk, set()).add(image_type)
+    for image_id, image_types in image_types_by_id.items():
+        enqueue_image_renditions(image_id, image_types)
+    return missing_renditions
+
+
+def count_images_missing_renditions(missing_renditions: RenditionStringsByImageId) -> int:
+    """
+    Count the images of ``missing_renditions`` that still lack at least one of their renditions.
+    """
+    if not missing_renditions:
+        return 0
+    existing = set(Rendition.objects.filter(image_id__in=missing_renditions).values_list("image_id", "filter_spec"))
+    return sum(
+        1
+        for image_id, filter_specs in missing_renditions.items()
+        if any((image_id, filter_spec) not in existing for filter_spec in filter_specs)
+    )
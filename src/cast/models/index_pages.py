@@ -29,6 +29,7 @@ from cast.models.itunes import ItunesArtWork
 
 from .pages import Post
 from .repository import BlogIndexContext
+from .repository.cache import get_or_build_cachable_data
 from .theme import get_template_base_dir, get_template_base_dir_choices
 
 logger = logging.getLogger(__name__)
@@ -359,7 +360,13 @@ class Blog(Page):
         if "repository" in kwargs:
             return kwargs["repository"]
         if appsettings.CAST_REPOSITORY == "default":
-            data = BlogIndexContext.data_for_blog_index_cachable(request=request, blog=self)
+            data = get_or_build_cachable_data(
+                request=request,
+                blog=self,
+                variant="blog-index",
+                build=lambda: BlogIndexContext.data_for_blog_index_cachable(request=request, blog=self),
+                get_params=request.GET,
+            )
             return BlogIndexContext.create_from_cachable_data(data=data)
         else:
             # fetch data using Django models as a fall back
@@ -1,9 +1,11 @@
 import json
+import math
 import random
 import re
 from collections import defaultdict
 from collections.abc import Callable, Iterator
-from typing import Any, Optional
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
 
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
@@ -35,6 +37,17 @@ def normalize(probabilities: Probabilities) -> Probabilities:
 Messages = list[tuple[str, str]]
 
 
+class CompiledNaiveBayes(NamedTuple):
+    """
+    Log probabilities of a ``NaiveBayes`` model, one entry per label in the order of ``labels``.
+    """
+
+    labels: list[str]
+    log_priors: list[float]
+    word_log_probabilities: dict[str, tuple[float, ...]]
+    unknown_word_log_probabilities: tuple[float, ...]
+
+
 class NaiveBayes:
     def __init__(
         self,
@@ -52,6 +65,7 @@ class NaiveBayes:
             self.word_label_counts = word_label_counts
         self.number_of_words = self.get_number_of_words(self.word_label_counts)
         self.number_of_all_words = sum(self.number_of_words.values())
+        self._compiled: CompiledNaiveBayes | None = None
 
     @staticmethod
     def get_label_counts(messages: Messages) -> Counts:
@@ -83,6 +97,7 @@ class NaiveBayes:
         self.set_word_label_counts(messages)
         self.number_of_words = self.get_number_of_words(self.word_label_counts)
         self.number_of_all_words = sum(self.number_of_words.values())
+        self._compiled = None
         return self
 
     @staticmethod
@@ -96,14 +111,47 @@ class NaiveBayes:
             updated_probabilities[label] = prior_probability * word_probability
         return updated_probabilities
 
-    def predict(self, message: str) -> Probabilities:
-        probabilities = dict(self.prior_probabilities)
-        for word in self.tokenize(message):
-            counts_per_label = self.word_label_counts.get(word, {})
-            probabilities = normalize(
-                self.update_probabilities(probabilities, counts_per_label, self.number_of_all_words)
+    def compile(self) -> CompiledNaiveBayes:
+        """
+        Precompute the log probabilities used by ``predict``. The result is kept
+        until the model is fitted again.
+        """
+        if self._compiled is None:
+            labels = list(self.prior_probabilities)
+            # there are no known words to divide by before anything was fitted
+            number_of_all_words = self.number_of_all_words or 1
+
+            def log_probabilities(counts_per_label: Counts) -> tuple[float, ...]:
+                return tuple(math.log(counts_per_label.get(label, 0.5) / number_of_all_words) for label in labels)
+
+            self._compiled = CompiledNaiveBayes(
+                labels=labels,
+                log_priors=[math.log(self.prior_probabilities[label]) for label in labels],
+                word_log_probabilities={
+                    word: log_probabilities(counts) for word, counts in self.word_label_counts.items()
+                },
+                unknown_word_log_probabilities=log_probabilities({}),
             )
-        return probabilities
+        return self._compiled
+
+    def predict(self, message: str) -> Probabilities:
+        """
+        Sum the log probabilities of all tokens per label and normalize once at
+        the end. This is equivalent to multiplying the word probabilities, but
+        cannot underflow for long messages.
+        """
+        model = self.compile()
+        if len(model.labels) == 0:
+            return {}
+        rows = [
+            model.word_log_probabilities.get(word, model.unknown_word_log_probabilities)
+            for word in self.tokenize(message)
+        ]
+        log_probabilities = [sum(column) for column in zip(model.log_priors, *rows)]
+        highest = max(log_probabilities)
+        probabilities = [math.exp(log_probability - highest) for log_probability in log_probabilities]
+        total = sum(probabilities)
+        return {label: probability / total for label, probability in zip(model.labels, probabilities)}
 
     def predict_label(self, message: str) -> str | None:
         probabilities = self.predict(message)
@@ -313,3 +361,23 @@ class SpamFilter(TimeStampedModel):
     @classmethod
     def get_default(cls) -> Optional["SpamFilter"]:
         return cls.objects.first()
+
+    @classmethod
+    def get_cached_default(cls) -> Optional["SpamFilter"]:
+        """
+        Return the default spam filter, keeping its decoded model for the life
+        of the process. Only the primary key and ``modified`` timestamp are
+        queried on each call, the model is loaded again after the row changed.
+        """
+        version = cls.objects.order_by("pk").values_list("pk", "modified").first()
+        if version is None:
+            return None
+        spamfilter = _default_spamfilter_cache.get(version)
+        if spamfilter is None:
+            spamfilter = cls.objects.get(pk=version[0])
+            _default_spamfilter_cache.clear()
+            _default_spamfilter_cache[version] = spamfilter
+        return spamfilter
+
+
+_default_spamfilter_cache: dict[tuple[int, datetime], SpamFilter] = {}
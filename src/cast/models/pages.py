@@ -47,7 +47,11 @@ from cast.models import get_or_create_gallery
 from cast.post_body_blocks import configured_content_blocks, default_content_blocks
 from cast.wagtail_panels import EpisodeTranscriptStatusPanel
 
-from .image_renditions import ImagesWithType, create_missing_renditions_for_posts
+from .image_renditions import (
+    ImagesWithType,
+    count_images_missing_renditions,
+    enqueue_missing_renditions_for_posts,
+)
 from .repository import (
     AudioById,
     EpisodeFeedContext,
@@ -56,6 +60,7 @@ from .repository import (
     PostDetailContext,
     VideoById,
 )
+from .repository.cache import get_or_render_description
 from .theme import TemplateBaseDirectory
 
 if TYPE_CHECKING:
@@ -642,13 +647,22 @@ class Post(Page):
         request = cast(HtmxHttpRequest, request)
         if repository is None:
             repository = self.get_repository(request, {})
-        description = self.serve(
-            request,
+        description = get_or_render_description(
+            post=self,
+            request=request,
+            template_base_dir=repository.template_base_dir,
             render_detail=render_detail,
-            repository=repository,
             render_for_feed=render_for_feed,
-            local_template_name="post_body.html",
-        ).rendered_content
+            render=lambda: (
+                self.serve(
+                    request,
+                    render_detail=render_detail,
+                    repository=repository,
+                    render_for_feed=render_for_feed,
+                    local_template_name="post_body.html",
+                ).rendered_content
+            ),
+        )
         if remove_newlines:
             description = description.replace("\n", "")
         if escape_html:
@@ -678,7 +692,10 @@ class Post(Page):
         return super().serve(request, *args, **kwargs)
 
     def get_preview_context(self, request: HttpRequest, mode_name: str) -> "ContextDict":
-        return self.get_context(request, render_detail=True, is_preview=True)
+        context = self.get_context(request, render_detail=True, is_preview=True)
+        # set by serve_preview, images without renditions fall back to their original file
+        context["pending_rendition_images"] = getattr(self, "_pending_rendition_images", 0)
+        return context
 
     def serve_preview(self, request: HttpRequest, mode_name: str, *args: Any, **kwargs: Any) -> HttpResponse:
         # sync media ids before preview, because otherwise the repository
@@ -686,7 +703,8 @@ class Post(Page):
         # renditions and fail with a w1110 not found rendition key error.
         try:
             self.sync_media_ids()  # raises ValueError
-            create_missing_renditions_for_posts(iter([self]))  # needed for images src / srcset in preview
+            missing_renditions = enqueue_missing_renditions_for_posts(iter([self]))  # images src / srcset in preview
+            self._pending_rendition_images = count_images_missing_renditions(missing_renditions)
         except ValueError:
             # will be raised on wagtail preview because page_ptr is not set
             pass
@@ -699,7 +717,8 @@ class Post(Page):
         if sync_media:
             self.sync_media_ids()
         if create_renditions:
-            create_missing_renditions_for_posts(iter([self]))  # needed for images src / srcset
+            # created by a background task, needed for images src / srcset
+            enqueue_missing_renditions_for_posts(iter([self]))
         return save_return
 
 
@@ -7,6 +7,7 @@ from .builders import (
     apply_cover_fallback,
     data_for_blog_cachable,
     get_facet_choices,
+    paginate_feed_queryset,
 )
 from .contexts import (
     BlogIndexContext,
@@ -106,6 +107,7 @@ __all__ = [
     "deserialize_transcript",
     "deserialize_video",
     "get_facet_choices",
+    "paginate_feed_queryset",
     "rendition_to_dict",
     "serialize_audio",
     "serialize_blog",
@@ -1,3 +1,4 @@
+from collections.abc import Iterable, Mapping
 from typing import TYPE_CHECKING, Any, cast
 from urllib.parse import urlparse
 
@@ -7,6 +8,7 @@ from django.http import HttpRequest
 from wagtail.images.models import Image
 from wagtail.models import Site
 
+from .lazy import LazyModelMap
 from .serialization import (
     serialize_audio,
     serialize_blog,
@@ -73,17 +75,25 @@ def build_media_lookup(
     blog-index repositories (live models and cachable-data paths). Returns a fresh
     mapping keyed by ``"image"`` / ``"video"`` / ``"audio"``; keys are present only
     when the post has media of that kind, preserving the previous behavior.
+    Media from a ``LazyModelMap`` stay lazy until the post's blocks read them.
     """
     media_lookup: MediaLookup = {}
-    for image_pk in images_by_post_id.get(post_pk, ()):
-        media_lookup.setdefault("image", {})[image_pk] = images[image_pk]
-    for video_pk in videos_by_post_id.get(post_pk, ()):
-        media_lookup.setdefault("video", {})[video_pk] = videos[video_pk]
-    for audio_pk in audios_by_post_id.get(post_pk, ()):
-        media_lookup.setdefault("audio", {})[audio_pk] = audios[audio_pk]
+    if image_pks := images_by_post_id.get(post_pk):
+        media_lookup["image"] = _media_for_post(images, image_pks)
+    if video_pks := videos_by_post_id.get(post_pk):
+        media_lookup["video"] = _media_for_post(videos, video_pks)
+    if audio_pks := audios_by_post_id.get(post_pk):
+        media_lookup["audio"] = _media_for_post(audios, audio_pks)
     return media_lookup
 
 
+def _media_for_post(media: Mapping[int, Any], pks: Iterable[int]) -> dict[int, Any]:
+    if isinstance(media, LazyModelMap):
+        # Read-only, but used like the dict of the live model path.
+        return cast(dict[int, Any], media.subset(pks))
+    return {pk: media[pk] for pk in pks}
+
+
 def apply_cover_fallback(
     cover_image_url: str, cover_alt_text: str, blog_cover_image_url: str, blog_cover_alt_text: str
 ) -> tuple[str, str]:
@@ -204,6 +214,25 @@ def add_queryset_data(data: dict[str, Any], queryset_data: PostQuerySnapshot) ->
     return data
 
 
+def paginate_feed_queryset(
+    post_queryset: QuerySet["Post"], *, page_size: int, archive_page: int | None = None
+) -> QuerySet["Post"]:
+    """Restrict a feed queryset to one document of an RFC 5005 paged feed.
+
+    The subscription document (``archive_page=None``) holds the newest ``page_size``
+    posts. Archive pages are counted from the oldest post, so their content does not
+    change when new posts are published.
+    """
+    if archive_page is None:
+        ordered = post_queryset.order_by("-visible_date", "-pk")
+        start = 0
+    else:
+        ordered = post_queryset.order_by("visible_date", "pk")
+        start = (archive_page - 1) * page_size
+    page_pks = list(ordered.values_list("pk", flat=True)[start : start + page_size])
+    return post_queryset.filter(pk__in=page_pks)
+
+
 def data_for_blog_cachable(
     *,
     request: HttpRequest,
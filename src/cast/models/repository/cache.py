@@ -0,0 +1,289 @@
+"""Persistent cache for the cachable feed and blog index repository data.
+
+``FeedContext.data_for_feed_cachable`` and ``BlogIndexContext.data_for_blog_index_cachable``
+return plain ``CachableBlogData`` dicts. This module stores those dicts in a Django cache
+so most feed and index requests only read the cache and call ``create_from_cachable_data``.
+
+Cache keys contain the blog, the request site, the active theme, the normalized query
+parameters and two generation counters. A per-blog counter changes when a post below the
+blog is published or unpublished. A global counter changes on everything that can affect
+all blogs: other page publishes, page moves and media saves. Changing a counter orphans
+every key built from its old value, so stale entries expire on their own and nothing has
+to enumerate keys.
+
+A third counter, the media generation, changes on every media save, including chapter
+marks, even when caching is disabled. Feed validators hash it, see ``get_feed_validators``.
+
+Entries are stored in the compact encoding from ``codec.py``. Its schema version is part of
+the keys, so entries written with an older layout are never decoded.
+
+Caching is disabled unless ``CAST_REPOSITORY_CACHE_TIMEOUT`` is a positive number of seconds.
+
+The module also caches rendered post descriptions (the ``post_body.html`` fragment feeds
+use for every item) when ``CAST_DESCRIPTION_CACHE_TIMEOUT`` is positive. Those keys use the
+post's live revision instead of the blog counter, so publishing one post only re-renders
+that post.
+"""
+
+import hashlib
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, cast
+from urllib.parse import urlencode
+
+from django.core.cache import BaseCache, caches
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpRequest, QueryDict
+from django.utils.translation import get_language
+from wagtail.images import get_image_model
+from wagtail.models import Page, Site
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from ... import appsettings
+from .codec import CACHABLE_DATA_SCHEMA_VERSION, decode_cachable_data, encode_cachable_data
+
+if TYPE_CHECKING:
+    from cast.http_types import HtmxHttpRequest
+    from cast.models import Blog, Post
+
+    from .types import CachableBlogData
+
+CACHE_KEY_PREFIX = "cast:repository"
+GLOBAL_GENERATION_KEY = f"{CACHE_KEY_PREFIX}:generation"
+# Changed on every media save, even with caching disabled, because feed validators depend on it.
+MEDIA_GENERATION_KEY = f"{CACHE_KEY_PREFIX}:generation:media"
+
+
+def is_repository_cache_enabled() -> bool:
+    return appsettings.CAST_REPOSITORY_CACHE_TIMEOUT > 0
+
+
+def get_repository_cache() -> BaseCache:
+    return caches[appsettings.CAST_REPOSITORY_CACHE_ALIAS]
+
+
+def blog_generation_key(blog_id: int) -> str:
+    return f"{CACHE_KEY_PREFIX}:generation:blog:{blog_id}"
+
+
+def _new_generation() -> int:
+    # Seed counters from the clock so a counter lost to eviction or a cache flush
+    # never hands out a value that older, still-stored entries were keyed with.
+    return time.time_ns()
+
+
+def _get_generation_values(keys: list[str]) -> list[int]:
+    cache = get_repository_cache()
+    current = cache.get_many(keys)
+    generations = []
+    for key in keys:
+        generation = current.get(key)
+        if generation is None:
+            generation = _new_generation()
+            if not cache.add(key, generation, timeout=None):
+                # Another process created the counter first, use its value.
+                generation = cache.get(key, generation)
+        generations.append(generation)
+    return generations
+
+
+def get_generations(blog_id: int) -> tuple[int, int]:
+    """Return the ``(global, blog)`` generation counters, creating missing ones."""
+    global_generation, blog_generation = _get_generation_values([GLOBAL_GENERATION_KEY, blog_generation_key(blog_id)])
+    return global_generation, blog_generation
+
+
+def get_global_generation() -> int:
+    """Return the global generation counter, creating it if missing."""
+    return _get_generation_values([GLOBAL_GENERATION_KEY])[0]
+
+
+def get_media_generation() -> int:
+    """Return the media generation counter, creating it if missing."""
+    return _get_generation_values([MEDIA_GENERATION_KEY])[0]
+
+
+def _bump(key: str) -> None:
+    cache = get_repository_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_generation(), timeout=None)
+
+
+def invalidate_blog(blog_id: int) -> None:
+    """Orphan all cached repository data of one blog."""
+    if is_repository_cache_enabled():
+        _bump(blog_generation_key(blog_id))
+
+
+def invalidate_all_blogs() -> None:
+    """Orphan all cached repository data and rendered descriptions."""
+    if is_repository_cache_enabled() or is_description_cache_enabled():
+        _bump(GLOBAL_GENERATION_KEY)
+
+
+def invalidate_media() -> None:
+    """Change the media generation and orphan all cached repository data built from media."""
+    _bump(MEDIA_GENERATION_KEY)
+    invalidate_all_blogs()
+
+
+def normalize_parameters(get_params: QueryDict) -> str:
+    """Return a canonical query string: sorted, without empty values."""
+    items = sorted((key, value) for key, values in get_params.lists() for value in values if value != "")
+    return urlencode(items)
+
+
+def build_cache_key(
+    *,
+    variant: str,
+    blog_id: int,
+    site_id: int | None,
+    template_base_dir: str,
+    parameters: str = "",
+) -> str:
+    """Build the cache key for one variant of a blog's cachable data.
+
+    The theme and the query parameters are user-controlled and unbounded, so they are
+    hashed to keep the key short and safe for memcached.
+    """
+    global_generation, blog_generation = get_generations(blog_id)
+    digest = hashlib.sha256(f"{template_base_dir}\n{parameters}".encode()).hexdigest()[:32]
+    return (
+        f"{CACHE_KEY_PREFIX}:v{CACHABLE_DATA_SCHEMA_VERSION}:{variant}:{blog_id}:{site_id}"
+        f":{global_generation}:{blog_generation}:{digest}"
+    )
+
+
+def get_or_build_cachable_data(
+    *,
+    request: HttpRequest,
+    blog: "Blog",
+    variant: str,
+    build: Callable[[], "CachableBlogData"],
+    get_params: QueryDict | None = None,
+) -> "CachableBlogData":
+    """Return cachable data for ``blog`` from the cache, building and storing it on a miss."""
+    if not is_repository_cache_enabled():
+        return build()
+    site = Site.find_for_request(request)
+    key = build_cache_key(
+        variant=variant,
+        blog_id=blog.pk,
+        site_id=site.pk if site is not None else None,
+        template_base_dir=blog.get_template_base_dir(cast("HtmxHttpRequest", request)),
+        parameters=normalize_parameters(get_params) if get_params is not None else "",
+    )
+    cache = get_repository_cache()
+    payload = cache.get(key)
+    if payload is not None:
+        return decode_cachable_data(payload)
+    data = build()
+    cache.set(key, encode_cachable_data(data), timeout=appsettings.CAST_REPOSITORY_CACHE_TIMEOUT)
+    return data
+
+
+def is_description_cache_enabled() -> bool:
+    return appsettings.CAST_DESCRIPTION_CACHE_TIMEOUT > 0
+
+
+def build_description_cache_key(
+    *,
+    post_id: int,
+    revision_id: int,
+    template_base_dir: str,
+    render_detail: bool,
+    render_for_feed: bool,
+    base_url: str,
+) -> str:
+    """Build the cache key for one rendered description of a post revision.
+
+    The global generation is part of the key because media, renditions and page URLs
+    appear in the rendered body but change without a new revision of the post.
+    """
+    mode = f"{'detail' if render_detail else 'overview'}-{'feed' if render_for_feed else 'page'}"
+    digest = hashlib.sha256(f"{template_base_dir}\n{base_url}\n{get_language()}".encode()).hexdigest()[:32]
+    return f"{CACHE_KEY_PREFIX}:description:{post_id}:{revision_id}:{get_global_generation()}:{mode}:{digest}"
+
+
+def get_or_render_description(
+    *,
+    post: "Post",
+    request: HttpRequest,
+    template_base_dir: str,
+    render_detail: bool,
+    render_for_feed: bool,
+    render: Callable[[], str],
+) -> str:
+    """Return a post's rendered description from the cache, rendering and storing it on a miss.
+
+    Only live posts with a live revision are cached. Drafts and unsaved posts are always
+    rendered because their content is not described by a revision id.
+    """
+    revision_id = post.live_revision_id
+    if not is_description_cache_enabled() or revision_id is None or post.pk is None:
+        return render()
+    key = build_description_cache_key(
+        post_id=post.pk,
+        revision_id=revision_id,
+        template_base_dir=template_base_dir,
+        render_detail=render_detail,
+        render_for_feed=render_for_feed,
+        base_url=f"{request.scheme}://{request.get_host()}",
+    )
+    cache = get_repository_cache()
+    description = cache.get(key)
+    if description is None:
+        description = render()
+        cache.set(key, description, timeout=appsettings.CAST_DESCRIPTION_CACHE_TIMEOUT)
+    return description
+
+
+def _blog_ids_for_page(page: Page) -> list[int]:
+    from ..index_pages import Blog
+
+    return list(Blog.objects.ancestor_of(page).values_list("pk", flat=True))
+
+
+def invalidate_for_page(page: Page) -> None:
+    """Invalidate the blogs containing ``page``, or everything for non-post pages."""
+    if not (is_repository_cache_enabled() or is_description_cache_enabled()):
+        return
+    from ..pages import Post
+
+    if isinstance(page, Post):
+        for blog_id in _blog_ids_for_page(page):
+            invalidate_blog(blog_id)
+    else:
+        # Blogs, the home page and other pages show up in navigation links and blog metadata.
+        invalidate_all_blogs()
+
+
+def on_page_publish_state_changed(sender: Any, instance: Page, **kwargs: Any) -> None:
+    invalidate_for_page(instance)
+
+
+def on_page_moved(sender: Any, instance: Page, **kwargs: Any) -> None:
+    # A move changes URLs of the page and all its descendants, possibly across blogs.
+    invalidate_all_blogs()
+
+
+def on_media_changed(sender: Any, instance: Any, **kwargs: Any) -> None:
+    # Media are shared between posts of different blogs, so finding the affected blogs
+    # would cost more than rebuilding them.
+    invalidate_media()
+
+
+def connect_repository_cache_receivers() -> None:
+    """Connect the signal receivers that invalidate cached repository data."""
+    from .. import Audio, ChapterMark, Transcript, Video
+
+    page_published.connect(on_page_publish_state_changed, dispatch_uid="cast_repository_cache_page_published")
+    page_unpublished.connect(on_page_publish_state_changed, dispatch_uid="cast_repository_cache_page_unpublished")
+    post_page_move.connect(on_page_moved, dispatch_uid="cast_repository_cache_page_moved")
+    image_model = get_image_model()
+    for model in (Audio, ChapterMark, Transcript, Video, image_model, image_model.get_rendition_model()):
+        label = model._meta.label_lower
+        post_save.connect(on_media_changed, sender=model, dispatch_uid=f"cast_repository_cache_saved:{label}")
+        post_delete.connect(on_media_changed, sender=model, dispatch_uid=f"cast_repository_cache_deleted:{label}")
@@ -0,0 +1,37 @@
+"""Compact encoding of ``CachableBlogData`` for the repository cache.
+
+The serialized data is dominated by maps of records keyed by pk (posts, audios,
+images, renditions, ...) that repeat the same keys and mostly similar values.
+For storage the data is pickled with the highest protocol and compressed with
+zlib, which makes the payload of a large blog several times smaller.
+
+Storing the record maps as struct-of-arrays instead (key sets stored once,
+records as value tuples) was measured as well: pickle already memoizes the
+repeated keys, so it saved only about one percent after compression while
+making decoding slower.
+
+The layout is versioned by ``CACHABLE_DATA_SCHEMA_VERSION``, which is part of
+the cache keys. Bump it whenever the serialized shape or this encoding
+changes, so old entries are never decoded with the new layout.
+"""
+
+import pickle
+import zlib
+from typing import cast
+
+from .types import CachableBlogData
+
+CACHABLE_DATA_SCHEMA_VERSION = 1
+
+# Level 1 already gets most of the size reduction at a fraction of the cost of higher levels.
+COMPRESSION_LEVEL = 1
+
+
+def encode_cachable_data(data: CachableBlogData) -> bytes:
+    """Encode ``data`` for storage in the repository cache."""
+    return zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), COMPRESSION_LEVEL)
+
+
+def decode_cachable_data(payload: bytes) -> CachableBlogData:
+    """Decode a payload written by ``encode_cachable_data``."""
+    return cast(CachableBlogData, pickle.loads(zlib.decompress(payload)))
@@ -4,10 +4,16 @@ from typing import TYPE_CHECKING, Any, Optional, TypeVar, cast
 from django.contrib.auth import get_user_model
 from django.db.models import QuerySet
 from django.http import HttpRequest
-from wagtail.images.models import Image
+from wagtail.images.models import Image, Rendition
 from wagtail.models import Site
 
-from .builders import _blog_url_from_referer, apply_cover_fallback, build_media_lookup, data_for_blog_cachable
+from .builders import (
+    _blog_url_from_referer,
+    apply_cover_fallback,
+    build_media_lookup,
+    data_for_blog_cachable,
+    paginate_feed_queryset,
+)
 from .serialization import (
     deserialize_audio,
     deserialize_blog,
@@ -18,8 +24,19 @@ from .serialization import (
     deserialize_transcript,
     deserialize_video,
 )
+from .lazy import LazyModelMap, LazySequence
 from .snapshot import PostQuerySnapshot, cache_page_url, clear_cached_page_urls
-from .types import AudioById, CachableBlogData, ChaptersByAudioId, ImageById, LinkTuples, RenditionsForPosts, VideoById
+from .types import (
+    AudioById,
+    CachableBlogData,
+    ChaptersByAudioId,
+    ImageById,
+    LinkTuples,
+    PostByID,
+    RenditionsForPosts,
+    TranscriptByAudioId,
+    VideoById,
+)
 
 if TYPE_CHECKING:
     from cast.http_types import HtmxHttpRequest
@@ -236,17 +253,12 @@ class FeedContext:
         )
 
     @staticmethod
-    def data_for_feed_cachable(
-        *,
-        request: HttpRequest,
-        blog: "Blog",
-        is_podcast: bool = False,
-    ) -> "CachableBlogData":
-        blog.refresh_from_db()  # sometimes the blog object is stale / maybe because of serialization? FIXME
+    def get_post_queryset(blog: "Blog", *, is_podcast: bool = False) -> QuerySet["Post"]:
+        """Return the posts of a feed, newest first."""
         if is_podcast:
             from ..pages import Episode
 
-            post_queryset = (
+            return (
                 Episode.objects.live()
                 .public()
                 .descendant_of(blog)
@@ -257,7 +269,21 @@ class FeedContext:
         else:
             from ..pages import Post
 
-            post_queryset = Post.objects.live().public().descendant_of(blog).order_by("-visible_date")
+            return Post.objects.live().public().descendant_of(blog).order_by("-visible_date")
+
+    @staticmethod
+    def data_for_feed_cachable(
+        *,
+        request: HttpRequest,
+        blog: "Blog",
+        is_podcast: bool = False,
+        page_size: int = 0,  # 0 means all posts, otherwise one document of a paged feed
+        archive_page: int | None = None,
+    ) -> "CachableBlogData":
+        blog.refresh_from_db()  # sometimes the blog object is stale / maybe because of serialization? FIXME
+        post_queryset = FeedContext.get_post_queryset(blog, is_podcast=is_podcast)
+        if page_size > 0:
+            post_queryset = paginate_feed_queryset(post_queryset, page_size=page_size, archive_page=archive_page)
         data = data_for_blog_cachable(request=request, blog=blog, post_queryset=post_queryset, is_paginated=False)
         data["blog_url"] = blog.get_url(request=request)
         return data
@@ -278,41 +304,18 @@ class FeedContext:
         if (last_build_date := data.get("last_build_date")) is not None:
             blog._last_build_date = last_build_date
         template_base_dir = data["template_base_dir"]
-        post_by_id = {}
-        podcast_fields = ["podcast_audio", "block", "keywords", "explicit", "episode_number", "episode_type", "season"]
-        for raw_post_pk, post_data in data["post_by_id"].items():
-            post_pk = int(raw_post_pk)
-            if "type" in post_data:
-                is_podcast = post_data["type"] == "episode"
-            else:
-                # Legacy cache entries without the explicit discriminator fall back to key-sniffing.
-                # This fallback can be removed after one release.
-                is_podcast = any(field in post_data for field in podcast_fields)
-            if is_podcast:
-                post_by_id[post_pk] = deserialize_episode(post_data)
-            else:
-                post_by_id[post_pk] = deserialize_post(post_data)
-        post_queryset = [post_by_id[int(post_pk)] for post_pk in data["posts"]]
-        audios = {
-            audio_pk: deserialize_audio(audio_data) for audio_pk, audio_data in _int_keyed(data["audios"]).items()
-        }
-        images = {
-            image_pk: deserialize_image(image_data) for image_pk, image_data in _int_keyed(data["images"]).items()
-        }
-        videos = {
-            video_pk: deserialize_video(video_data) for video_pk, video_data in _int_keyed(data["videos"]).items()
-        }
-        podcast_audios = {
-            episode_pk: deserialize_audio(audio_data)
-            for episode_pk, audio_data in _int_keyed(data.get("podcast_audio_by_episode_id", {})).items()
-        }
-        transcripts = {
-            audio_pk: deserialize_transcript(transcript_data)
-            for audio_pk, transcript_data in _int_keyed(data.get("transcripts", {})).items()
-        }
+        # Models are only built when rendering reads them, see lazy.py.
+        audios = LazyModelMap(_int_keyed(data["audios"]), deserialize_audio)
+        images = LazyModelMap(_int_keyed(data["images"]), deserialize_image)
+        videos = LazyModelMap(_int_keyed(data["videos"]), deserialize_video)
+        podcast_audios = LazyModelMap(_int_keyed(data.get("podcast_audio_by_episode_id", {})), deserialize_audio)
+        transcripts = LazyModelMap(_int_keyed(data.get("transcripts", {})), deserialize_transcript)
         chapters: ChaptersByAudioId = {int(audio_pk): marks for audio_pk, marks in data.get("chapters", {}).items()}
 
-        renditions_for_posts = deserialize_renditions(_int_keyed(data["renditions_for_posts"]))
+        renditions_for_posts = LazyModelMap(
+            _int_keyed(data["renditions_for_posts"]),
+            lambda renditions: [Rendition(**rendition) for rendition in renditions],
+        )
         audios_by_post_id = _int_keyed(data["audios_by_post_id"])
         videos_by_post_id = _int_keyed(data["videos_by_post_id"])
         images_by_post_id = _int_keyed(data["images_by_post_id"])
@@ -324,34 +327,48 @@ class FeedContext:
         cover_alt_by_post_id = _int_keyed(data["cover_alt_by_post_id"])
 
         user_model = get_user_model()
-        for post in post_queryset:
+        podcast_fields = ["podcast_audio", "block", "keywords", "explicit", "episode_number", "episode_type", "season"]
+
+        def deserialize_feed_post(post_data: dict[str, Any]) -> "Post":
+            if "type" in post_data:
+                is_podcast = post_data["type"] == "episode"
+            else:
+                # Legacy cache entries without the explicit discriminator fall back to key-sniffing.
+                # This fallback can be removed after one release.
+                is_podcast = any(field in post_data for field in podcast_fields)
+            post = deserialize_episode(post_data) if is_podcast else deserialize_post(post_data)
             post._media_lookup = build_media_lookup(
                 post.pk,
                 images_by_post_id=images_by_post_id,
                 videos_by_post_id=videos_by_post_id,
                 audios_by_post_id=audios_by_post_id,
-                images=images,
-                videos=videos,
-                audios=audios,
+                images=cast(ImageById, images),
+                videos=cast(VideoById, videos),
+                audios=cast(AudioById, audios),
             )
             post.owner = user_model(username=owner_username_by_id[post.pk])
             post.page_url = page_url_by_id[post.pk]
+            return post
 
+        post_by_id = LazyModelMap(_int_keyed(data["post_by_id"]), deserialize_feed_post)
+        post_queryset = LazySequence(post_by_id, [int(post_pk) for post_pk in data["posts"]])
+
+        # The lazy mappings are read-only, but typed like the dicts of the live model path.
         queryset_data = PostQuerySnapshot(
             post_queryset=post_queryset,
-            post_by_id=post_by_id,
-            audios=audios,
-            images=images,
-            videos=videos,
+            post_by_id=cast(PostByID, post_by_id),
+            audios=cast(AudioById, audios),
+            images=cast(ImageById, images),
+            videos=cast(VideoById, videos),
             audios_by_post_id=audios_by_post_id,
-            podcast_audio_by_episode_id=podcast_audios,
-            transcript_by_audio_id=transcripts,
+            podcast_audio_by_episode_id=cast(AudioById, podcast_audios),
+            transcript_by_audio_id=cast(TranscriptByAudioId, transcripts),
             chapters_by_audio_id=chapters,
             videos_by_post_id=videos_by_post_id,
             images_by_post_id=images_by_post_id,
             owner_username_by_id=owner_username_by_id,
             has_audio_by_id=has_audio_by_id,
-            renditions_for_posts=renditions_for_posts,
+            renditions_for_posts=cast(RenditionsForPosts, renditions_for_posts),
             page_url_by_id=page_url_by_id,
             absolute_page_url_by_id=absolute_page_url_by_id,
             cover_by_post_id=cover_by_post_id,
@@ -0,0 +1,62 @@
+"""Lazy rehydration of cached repository data.
+
+``FeedContext.create_from_cachable_data`` used to turn every serialized post,
+audio, image and rendition into a model instance up front. The mappings here
+keep the serialized data and build an instance the first time it is read, so
+the rehydration cost follows what rendering actually touches.
+"""
+
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
+from typing import Any, TypeVar
+
+_Model = TypeVar("_Model")
+
+
+class LazyModelMap(Mapping[int, _Model]):
+    """Read-only mapping that deserializes a value on first access and keeps it."""
+
+    def __init__(self, serialized: Mapping[int, Any], deserialize: Callable[[Any], _Model]) -> None:
+        self._serialized = serialized
+        self._deserialize = deserialize
+        self._keys: Collection[int] = serialized.keys()
+        self._models: dict[int, _Model] = {}
+
+    def __getitem__(self, key: int) -> _Model:
+        if key not in self._keys:
+            raise KeyError(key)
+        if (model := self._models.get(key)) is None:
+            model = self._models[key] = self._deserialize(self._serialized[key])
+        return model
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def subset(self, keys: Iterable[int]) -> "LazyModelMap[_Model]":
+        """Return a view restricted to ``keys`` that shares deserialized values with this mapping."""
+        view: LazyModelMap[_Model] = LazyModelMap(self._serialized, self._deserialize)
+        view._keys = list(keys)
+        view._models = self._models
+        return view
+
+
+class LazySequence(Sequence[_Model]):
+    """Sequence of the values of a ``LazyModelMap`` for ``keys``, in order."""
+
+    def __init__(self, models: Mapping[int, _Model], keys: list[int]) -> None:
+        self._models = models
+        self._keys = keys
+
+    def __getitem__(self, index: Any) -> Any:
+        # an int or a slice, like a list
+        if isinstance(index, slice):
+            return [self._models[key] for key in self._keys[index]]
+        return self._models[self._keys[index]]
+
+    def __len__(self) -> int:
+        return len(self._keys)
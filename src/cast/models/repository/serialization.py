@@ -266,6 +266,7 @@ def serialize_post(post: "Post") -> dict[str, Any]:
         "title": post.title,
         "visible_date": post.visible_date,
         "last_published_at": post.last_published_at,
+        "live_revision_id": post.live_revision_id,
         "comments_enabled": post.comments_enabled,
         "body": json.dumps(list(post.body.raw_data)),
     }
@@ -290,6 +291,7 @@ def serialize_episode(post: "Episode") -> dict[str, Any]:
         "slug": post.slug,
         "title": post.title,
         "visible_date": post.visible_date,
+        "live_revision_id": post.live_revision_id,
         "comments_enabled": post.comments_enabled,
         "body": json.dumps(list(post.body.raw_data)),
         "podcast_audio": serialize_audio(post.podcast_audio),
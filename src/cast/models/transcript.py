@@ -1,18 +1,26 @@
 import hashlib
 import json
-from collections.abc import Mapping
+from collections.abc import Collection, Mapping
 from decimal import Decimal
-from typing import Any
+from functools import partial
+from typing import Any, cast
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from wagtail.models import CollectionMember
 from wagtail.search import index
 
 from cast.file_replacement import StagedFileReplacementGroup
 
 from ..private_storage import get_transcript_storage
-from ..transcripts import dote, known_speakers, parsing, podlove, services, speaker_samples, voice_references, webvtt
+from ..transcripts import (
+    known_speakers,
+    parsing,
+    search,
+    services,
+    speaker_samples,
+    voice_references,
+)
 from ..transcripts.dote import (
     convert_dote_to_podcastindex_transcript,
     convert_segments as convert_segments,
@@ -77,17 +85,72 @@ class Transcript(CollectionMember, index.Indexed, models.Model):
         ),
     )
 
+    artifact_fingerprint = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Hash of the public transcript artifacts, empty if there are none. Computed when they change.",
+    )
+
     admin_form_fields: tuple[str, ...] = ("audio", "podlove", "vtt", "dote")
 
+    # artifact file names as stored in the database row
+    _stored_artifact_names: tuple[str, ...] | None = None
+    # artifact fields assigned since the row was loaded or saved
+    _assigned_artifact_fields: frozenset[str] = frozenset()
+
     class Meta:
         ordering = ("-id",)
         permissions = (("choose_transcript", "Can choose transcript"),)
 
+    @classmethod
+    def from_db(
+        cls, db: str | None, field_names: Collection[str], values: Collection[Any], **kwargs: Any
+    ) -> "Transcript":
+        instance = super().from_db(db, field_names, values, **kwargs)
+        loaded = dict(zip(field_names, values))
+        if all(field_name in loaded for field_name in TRANSCRIPT_SPEAKER_MAPPING_ARTIFACT_FIELDS):
+            instance._stored_artifact_names = tuple(
+                loaded[field_name] or "" for field_name in TRANSCRIPT_SPEAKER_MAPPING_ARTIFACT_FIELDS
+            )
+        # Model.__init__ assigns the loaded values
+        instance._assigned_artifact_fields = frozenset()
+        return instance
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in TRANSCRIPT_SPEAKER_MAPPING_ARTIFACT_FIELDS:
+            # Storages that overwrite files keep the name of a replaced artifact, so
+            # every assignment counts as a change, even with an unchanged name.
+            self.__dict__["_assigned_artifact_fields"] = self._assigned_artifact_fields | {name}
+        super().__setattr__(name, value)
+
+    def refresh_from_db(self, *args: Any, **kwargs: Any) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        fields = kwargs.get("fields")
+        if fields is None or set(TRANSCRIPT_SPEAKER_MAPPING_ARTIFACT_FIELDS) <= set(fields):
+            self._stored_artifact_names = self._artifact_names()
+            self.__dict__["_assigned_artifact_fields"] = frozenset()
+
     def save(self, *args: Any, **kwargs: Any) -> None:
         update_fields = kwargs.get("update_fields")
+        artifacts_may_change = self._should_sync_speaker_mappings(update_fields)
+        artifacts_changed = False
+        if artifacts_may_change and not self._has_current_artifact_fingerprint():
+            fingerprint = self.compute_transcript_artifact_fingerprint()
+            # re-assigning unchanged artifacts, like admin forms do, changes nothing
+            artifacts_changed = fingerprint != self.artifact_fingerprint
+            self.artifact_fingerprint = fingerprint
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "artifact_fingerprint"}
         super().save(*args, **kwargs)
-        if self._should_sync_speaker_mappings(update_fields):
+        self._stored_artifact_names = self._artifact_names()
+        self.__dict__["_assigned_artifact_fields"] = frozenset()
+        if artifacts_may_change:
             self.sync_speaker_mappings()
+        if artifacts_changed:
+            # tokenizing all segments is too slow for the request, and the task must see the saved row
+            transaction.on_commit(partial(search.enqueue_search_index_rebuild, self.pk))
 
     @staticmethod
     def _should_sync_speaker_mappings(update_fields: Any) -> bool:
@@ -141,8 +204,52 @@ class Transcript(CollectionMember, index.Indexed, models.Model):
                 data = {}
         return data if isinstance(data, dict) else {}
 
+    def _artifact_names(self) -> tuple[str, ...]:
+        return tuple(getattr(self, field_name).name or "" for field_name in TRANSCRIPT_SPEAKER_MAPPING_ARTIFACT_FIELDS)
+
+    def _has_unsaved_artifacts(self) -> bool:
+        """Return whether an artifact was assigned or uploaded since the row was loaded or saved."""
+        if self._assigned_artifact_fields:
+            return True
+        return any(
+            getattr(getattr(self, field_name), "_committed", True) is False
+            for field_name in TRANSCRIPT_SPEAKER_MAPPING_ARTIFACT_FIELDS
+        )
+
+    def _has_current_artifact_fingerprint(self) -> bool:
+        # Artifacts only change by assigning or uploading them, so unchanged names
+        # without those mean the stored fingerprint still matches their content.
+        return (
+            self.artifact_fingerprint is not None
+            and self._stored_artifact_names == self._artifact_names()
+            and not self._has_unsaved_artifacts()
+        )
+
     def transcript_artifact_fingerprint(self) -> str:
-        """Return a stable hash for the current raw public transcript artifacts."""
+        """Return a stable hash for the current raw public transcript artifacts.
+
+        The hash is stored on the row when the artifacts change, so this only
+        reads the artifact files for rows saved before it was stored or for
+        artifacts that were replaced but not saved yet.
+        """
+        if self._has_current_artifact_fingerprint():
+            return cast(str, self.artifact_fingerprint)
+        fingerprint = self.compute_transcript_artifact_fingerprint()
+        if (
+            self.artifact_fingerprint is None
+            and self.pk is not None
+            and self._stored_artifact_names == self._artifact_names()
+            and not self._has_unsaved_artifacts()
+        ):
+            # backfill rows saved before the fingerprint was stored
+            Transcript.objects.filter(pk=self.pk, artifact_fingerprint__isnull=True).update(
+                artifact_fingerprint=fingerprint
+            )
+            self.artifact_fingerprint = fingerprint
+        return fingerprint
+
+    def compute_transcript_artifact_fingerprint(self) -> str:
+        """Hash the current raw public transcript artifacts by reading them from storage."""
         digest = hashlib.sha256()
         saw_content = False
         for field_name in TRANSCRIPT_SPEAKER_MAPPING_ARTIFACT_FIELDS:
@@ -160,6 +267,12 @@ class Transcript(CollectionMember, index.Indexed, models.Model):
         file_field = getattr(self, field_name)
         if not file_field or not file_field.name:
             return None
+        if not file_field._committed:
+            # an upload that is written to storage when the row is saved
+            file_field.file.seek(0)
+            content = file_field.file.read()
+            file_field.file.seek(0)
+            return content
         try:
             with file_field.storage.open(file_field.name, "rb") as file:
                 return file.read()
@@ -170,6 +283,10 @@ class Transcript(CollectionMember, index.Indexed, models.Model):
         """Synchronize durable anonymous-speaker mapping rows with raw artifacts."""
         services.sync_speaker_mappings(self)
 
+    def rebuild_search_index(self) -> int:
+        """Replace the time-coded search segments with the current artifact text."""
+        return search.rebuild_transcript_search_index(self)
+
     def get_speaker_suggestions(self) -> list[dict]:
         """Per-segment known-speaker suggestions for editor review."""
         segments = self.speakers_data.get("segments", [])
@@ -244,6 +361,10 @@ class Transcript(CollectionMember, index.Indexed, models.Model):
         """
         return services.save_known_speaker_editor_decisions(self, decisions_by_position)
 
+    def edit_artifacts(self) -> services.TranscriptArtifactEdit:
+        """Start a batch of speaker edits that is written to all formats with one ``commit``."""
+        return services.TranscriptArtifactEdit(self)
+
     def get_known_speaker_editor_decisions(self) -> dict[int, dict[str, str]]:
         """Return valid per-segment editor decisions keyed by sidecar position."""
         decisions: dict[int, dict[str, str]] = {}
@@ -253,76 +374,6 @@ class Transcript(CollectionMember, index.Indexed, models.Model):
                 decisions[position] = decision
         return decisions
 
-    def _write_speakers_data(
-        self, data: dict[str, Any], *, replacements: StagedFileReplacementGroup | None = None
-    ) -> None:
-        content = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
-        self._save_file_content("speakers", content, replacements=replacements)
-
-    def _apply_suggestions_to_podlove(
-        self, names_by_start_ms: dict[int, str], *, replacements: StagedFileReplacementGroup | None = None
-    ) -> int:
-        data = self._load_transcript_json("podlove")
-        applied = podlove.apply_suggestions(data, names_by_start_ms)
-        if applied:
-            self._write_transcript_json("podlove", data, replacements=replacements)
-        return applied
-
-    def _apply_suggestions_to_dote(
-        self, names_by_start_ms: dict[int, str], *, replacements: StagedFileReplacementGroup | None = None
-    ) -> int:
-        data = self._load_transcript_json("dote")
-        applied = dote.apply_suggestions(data, names_by_start_ms)
-        if applied:
-            self._write_transcript_json("dote", data, replacements=replacements)
-        return applied
-
-    def _clear_suggestions_from_podlove(
-        self, start_milliseconds: set[int], *, replacements: StagedFileReplacementGroup | None = None
-    ) -> int:
-        data = self._load_transcript_json("podlove")
-        applied, changed = podlove.clear_suggestions(data, start_milliseconds)
-        if changed:
-            self._write_transcript_json("podlove", data, replacements=replacements)
-        return applied
-
-    def _clear_suggestions_from_dote(
-        self, start_milliseconds: set[int], *, replacements: StagedFileReplacementGroup | None = None
-    ) -> int:
-        data = self._load_transcript_json("dote")
-        applied, changed = dote.clear_suggestions(data, start_milliseconds)
-        if changed:
-            self._write_transcript_json("dote", data, replacements=replacements)
-        return applied
-
-    def _clear_suggestions_from_webvtt(
-        self, start_milliseconds: set[int], *, replacements: StagedFileReplacementGroup | None = None
-    ) -> int:
-        content = self._load_text_file("vtt")
-        rewritten_content, applied, changed = webvtt.clear_suggestions_from_content(content, start_milliseconds)
-        if changed:
-            self._save_text_file("vtt", rewritten_content, replacements=replacements)
-        return applied
-
-    def _apply_suggestions_to_webvtt(
-        self, names_by_start_ms: dict[int, str], *, replacements: StagedFileReplacementGroup | None = None
-    ) -> int:
-        content = self._load_text_file("vtt")
-        rewritten_content, applied, changed = webvtt.apply_suggestions_to_content(content, names_by_start_ms)
-        if changed:
-            self._save_text_file("vtt", rewritten_content, replacements=replacements)
-        return applied
-
-    def _write_transcript_json(
-        self, field_name: str, data: dict, *, replacements: StagedFileReplacementGroup | None = None
-    ) -> None:
-        # Only called after _load_transcript_json read this field's file, so the
-        # field always has a stored name here.
-        field = getattr(self, field_name)
-        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
-        filename = field.name.rsplit("/", 1)[-1]
-        self._save_file_content(field_name, payload, filename=filename, replacements=replacements)
-
     @property
     def podcastindex_data(self) -> dict:
         data = self.dote_data
@@ -414,11 +465,6 @@ class Transcript(CollectionMember, index.Indexed, models.Model):
         except (FileNotFoundError, OSError, UnicodeDecodeError, ValueError):
             return ""
 
-    def _save_text_file(
-        self, field_name: str, content: str, *, replacements: StagedFileReplacementGroup | None = None
-    ) -> None:
-        self._save_file_content(field_name, content.encode("utf-8"), replacements=replacements)
-
     def _save_file_content(
         self,
         field_name: str,
@@ -501,3 +547,37 @@ class TranscriptSpeakerMapping(models.Model):
             and self.review_state == self.ReviewState.APPROVED
             and self.source_artifact_fingerprint == fingerprint
         )
+
+
+class TranscriptSegment(models.Model):
+    """One time-coded segment of a transcript's public text, for transcript search."""
+
+    transcript = models.ForeignKey(Transcript, related_name="search_segments", on_delete=models.CASCADE)
+    position = models.PositiveIntegerField()
+    start_ms = models.PositiveBigIntegerField()
+    text = models.TextField()
+
+    class Meta:
+        ordering = ("transcript_id", "position")
+        constraints = [
+            models.UniqueConstraint(fields=["transcript", "position"], name="unique_transcript_segment_position"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.transcript_id}: {self.start_ms}"
+
+
+class TranscriptSearchTerm(models.Model):
+    """Inverted index entry: ``segment`` contains the normalized word ``term``."""
+
+    term = models.CharField(max_length=64)
+    segment = models.ForeignKey(TranscriptSegment, related_name="search_terms", on_delete=models.CASCADE)
+
+    class Meta:
+        indexes = [models.Index(fields=["term", "segment"], name="cast_transcript_term_idx")]
+        constraints = [
+            models.UniqueConstraint(fields=["segment", "term"], name="unique_transcript_segment_term"),
+        ]
+
+    def __str__(self) -> str:
+        return self.term
@@ -9,11 +9,13 @@ class Moderator:
     def __init__(self, model: type[Any] | None, spamfilter: SpamFilter | None = None) -> None:
         self.model = model
         # Allow spamfilter to be set for tests
-        self.spamfilter: SpamFilter | None
-        if spamfilter is not None:
-            self.spamfilter = spamfilter
-        else:
-            self.spamfilter = SpamFilter.get_default()
+        self._spamfilter = spamfilter
+
+    @property
+    def spamfilter(self) -> SpamFilter | None:
+        if self._spamfilter is not None:
+            return self._spamfilter
+        return SpamFilter.get_cached_default()
 
     def allow(self, comment: Any, content_object: Any, request: HttpRequest) -> bool:
         """
@@ -25,8 +27,8 @@ class Moderator:
 
     def moderate(self, comment: Any, content_object: Any, request: HttpRequest) -> bool:
         message = SpamFilter.comment_to_message(comment)
-        if self.spamfilter is not None:
-            predicted_label = self.spamfilter.model.predict_label(message)
+        if (spamfilter := self.spamfilter) is not None:
+            predicted_label = spamfilter.model.predict_label(message)
         else:
             predicted_label = "unknown"
         if predicted_label == "spam":
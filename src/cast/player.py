@@ -32,6 +32,8 @@ from __future__ import annotations
 import json
 import logging
 import math
+from array import array
+from bisect import bisect_left, bisect_right
 from typing import Any
 
 from django.urls import reverse
@@ -263,6 +265,60 @@ def build_cues(audio: Any, *, episode: Any, duration: int | None) -> list[dict[s
     return cues
 
 
+class CueIndex:
+    """Compact, sorted index over the cues returned by :func:`build_cues`.
+
+    Each cue is stored once as compact JSON followed by a comma in ``blob``;
+    ``offsets`` holds the byte offset of every cue plus the end of the blob.
+    ``starts`` and ``max_ends`` (the running maximum of the cue ends) are both
+    sorted, so a time window or a page is found by bisection and decoded with a
+    single ``json.loads`` over the matching slice of the blob.
+    """
+
+    def __init__(self, cues: list[dict[str, Any]]) -> None:
+        self.starts = array("d")
+        self.max_ends = array("d")
+        self.offsets = array("Q", [0])
+        chunks = []
+        max_end = -math.inf
+        for cue in cues:
+            chunk = json.dumps(cue, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b","
+            chunks.append(chunk)
+            max_end = max(max_end, cue["end"])
+            self.starts.append(cue["start"])
+            self.max_ends.append(max_end)
+            self.offsets.append(self.offsets[-1] + len(chunk))
+        self.blob = b"".join(chunks)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _decode(self, first: int, last: int) -> list[dict[str, Any]]:
+        if first >= last:
+            return []
+        # drop the trailing comma of the last cue in the slice
+        return json.loads(b"[" + self.blob[self.offsets[first] : self.offsets[last] - 1] + b"]")
+
+    def all(self) -> list[dict[str, Any]]:
+        return self._decode(0, len(self))
+
+    def window(self, start: float, end: float) -> list[dict[str, Any]]:
+        """Return the cues playing at some point in ``[start, end)``.
+
+        The slice starts at the first cue after which nothing is still playing
+        at ``start``. It may include a few short cues that already ended before
+        ``start`` when they overlap with a longer, earlier cue.
+        """
+        if end <= start:
+            return []
+        return self._decode(bisect_right(self.max_ends, start), bisect_left(self.starts, end))
+
+    def page(self, number: int, size: int) -> list[dict[str, Any]]:
+        """Return the ``number``-th (1-based) page of ``size`` cues."""
+        first = (number - 1) * size
+        return self._decode(first, min(first + size, len(self)))
+
+
 def _synthesize_end(collected: list[dict[str, Any]], index: int, start: float, finite_duration: float | None) -> float:
     """Return a finite end ``> start`` borrowed from the next strictly-later cue."""
     for later in collected[index + 1 :]:
@@ -0,0 +1,147 @@
+"""Versioned, cached payloads of the chapters and Podlove player config endpoints.
+
+Every page with a player requests the Podcasting 2.0 chapters of its audio and
+the Podlove Web Player config. Both are small, but were rebuilt on each request.
+
+The chapters of an audio only change with its ``ChapterMark`` rows. The
+chapters ETag hashes the fields of those rows, read with one query, so
+conditional requests are answered without building the JSON. The validator
+comes from the database and not from a counter in a cache, so it is correct
+with per-process caches like ``LocMemCache`` as well.
+
+The player config only depends on the theme, the color scheme, and the
+``CAST_PODLOVE_PLAYER_THEMES`` setting. Its ETag hashes those inputs, so a
+changed setting never serves an old config.
+
+The Podlove episode payload of an audio and episode combines the audio fields,
+its chapters, the public transcript, and page and image data like the podcast
+title, the episode URL, and the cover. Its ETag hashes the audio fields and
+modification time, the chapter rows, the public transcript version (artifact
+fingerprint and speaker mapping state), the publishing state and URL path of
+the post, its ancestors and the episodes of the audio, and the files and focal
+points of the cover images. Publishing, unpublishing or moving a page, or
+replacing a cover image, changes one of those rows.
+
+When ``CAST_PLAYER_CACHE_TIMEOUT`` is positive, the payloads are also cached
+under keys containing the ETag.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from django.core.cache import caches
+from django.http import HttpRequest
+from wagtail.images import get_image_model
+from wagtail.models import Page
+
+from . import __version__, appsettings
+from .podlove import normalize_color_scheme
+from .transcripts import public
+
+PLAYER_CACHE_KEY_PREFIX = "cast:player"
+# Bump when the shape of a cached payload changes.
+PLAYER_CACHE_SCHEMA_VERSION = 1
+
+_Payload = TypeVar("_Payload")
+
+
+@dataclass(frozen=True)
+class PlayerPayloadVersion:
+    cache_key: str
+    etag: str
+
+
+def _version(name: str, state: list[Any]) -> PlayerPayloadVersion:
+    digest = hashlib.sha256(
+        json.dumps([PLAYER_CACHE_SCHEMA_VERSION, __version__, *state], sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return PlayerPayloadVersion(cache_key=f"{PLAYER_CACHE_KEY_PREFIX}:{name}:{digest}", etag=f'"{digest}"')
+
+
+def get_chapters_state(audio_id: int) -> list[Any]:
+    """Return the fields of the chapter marks of an audio that its chapters are built from."""
+    from .models import ChapterMark
+
+    return list(
+        ChapterMark.objects.filter(audio_id=audio_id)
+        .order_by("pk")
+        .values_list("pk", "start", "title", "link", "image")
+    )
+
+
+def get_chapters_version(audio_id: int) -> PlayerPayloadVersion:
+    """Return the cache key and ETag of the chapters JSON of an audio."""
+    return _version(f"chapters:{audio_id}", [audio_id, get_chapters_state(audio_id)])
+
+
+def get_player_config_version(*, template_base_dir: str | None, color_scheme: str | None) -> PlayerPayloadVersion:
+    """Return the cache key and ETag of the Podlove player config of a theme and color scheme."""
+    state = [template_base_dir, normalize_color_scheme(color_scheme), appsettings.CAST_PODLOVE_PLAYER_THEMES]
+    return _version("podlove-config", state)
+
+
+def get_pages_and_images_state(audio: Any, *, post: Any | None) -> list[Any]:
+    """Return the page and cover image rows the show and link of a Podlove episode are built from."""
+    from .models import Blog, Episode
+
+    pages = Page.objects.filter(pk__in=Episode.objects.filter(podcast_audio=audio).values("pk"))
+    image_ids = []
+    if post is not None:
+        pages = pages | Page.objects.ancestor_of(post, inclusive=True)
+        image_ids = [post.cover_image_id, *Blog.objects.ancestor_of(post).values_list("cover_image_id", flat=True)]
+    images = get_image_model().objects.filter(pk__in=[pk for pk in image_ids if pk is not None])
+    return [
+        list(pages.order_by("pk").values_list("pk", "live", "url_path", "last_published_at")),
+        list(
+            images.order_by("pk").values_list(
+                "pk", "file", "focal_point_x", "focal_point_y", "focal_point_width", "focal_point_height"
+            )
+        ),
+    ]
+
+
+def get_podlove_episode_version(
+    audio: Any, *, post: Any | None, episode_id: int | None, request: HttpRequest
+) -> PlayerPayloadVersion:
+    """Return the cache key and ETag of the Podlove episode payload of ``audio``."""
+    episode = getattr(post, "specific", post)
+    transcript = getattr(audio, "transcript", None)
+    transcript_version = None
+    if transcript is not None:
+        transcript_version = public.get_public_transcript_version(
+            transcript, output=public.OUTPUT_PODLOVE, episode=episode
+        ).etag
+    state = [
+        audio.pk,
+        getattr(post, "pk", None),
+        episode_id,
+        # poster URLs are absolute
+        request.build_absolute_uri("/"),
+        [audio.title, audio.subtitle, audio.duration, audio.data, audio.modified],
+        [field.name for _name, field in audio.uploaded_audio_files],
+        transcript_version,
+        get_chapters_state(audio.pk),
+        get_pages_and_images_state(audio, post=post),
+    ]
+    return _version(f"podlove-episode:{audio.pk}", state)
+
+
+def is_player_cache_enabled() -> bool:
+    return appsettings.CAST_PLAYER_CACHE_TIMEOUT > 0
+
+
+def get_or_build_payload(version: PlayerPayloadVersion, build: Callable[[], _Payload]) -> _Payload:
+    """Return the cached payload for ``version`` or build and cache it."""
+    if not is_player_cache_enabled():
+        return build()
+    cache = caches[appsettings.CAST_REPOSITORY_CACHE_ALIAS]
+    payload = cache.get(version.cache_key)
+    if payload is None:
+        payload = build()
+        cache.set(version.cache_key, payload, timeout=appsettings.CAST_PLAYER_CACHE_TIMEOUT)
+    return payload
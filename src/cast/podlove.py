@@ -172,14 +172,14 @@ def build_podlove_player_config(*, template_base_dir: str | None, color_scheme:
     channels, and player version metadata. It is serialized to JSON and
     passed to the ``<podlove-web-player>`` element in templates.
     """
-    scheme = _normalize_color_scheme(color_scheme)
+    scheme = normalize_color_scheme(color_scheme)
     theme = _resolve_theme_config(template_base_dir=template_base_dir, color_scheme=scheme)
     config = deepcopy(BASE_PLAYER_CONFIG)
     config["theme"] = theme
     return config
 
 
-def _normalize_color_scheme(color_scheme: str | None) -> str:
+def normalize_color_scheme(color_scheme: str | None) -> str:
     if not color_scheme:
         return "light"
     scheme = color_scheme.strip().lower()
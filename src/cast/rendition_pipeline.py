@@ -0,0 +1,193 @@
+"""Create all renditions of an image from one decoded original.
+
+``Image.create_renditions`` reads the original once, but every filter decodes
+those bytes again, orients, crops and resizes the full-size image, and the
+``srgb`` operation transforms each rendition's colorspace on its own. A
+gallery image has a dozen filter specs, so the original is decoded a dozen
+times.
+
+``DecodedImageSource`` decodes and orients the original once. Filters created
+by it read that image instead of the file, and the crop, resize and sRGB
+results are shared between filters with the same geometry, so the AVIF and
+JPEG renditions of a width are resized and color transformed once and only
+encoded separately. The encoding is left to ``Filter.run``, so the files are
+the same as Wagtail would create.
+
+Only still raster images that Pillow decodes are handled. SVGs, GIFs and
+animated images like animated WebPs or PNGs keep Wagtail's own rendition creation,
+since only their first frame would be decoded here.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any
+
+import willow
+from django.db.models import Q
+from wagtail.images.models import AbstractImage, AbstractRendition, Filter
+from willow.plugins.pillow import PillowImage
+
+DECODED_SOURCE_FORMATS = {"jpeg", "png", "webp", "avif", "heic", "bmp", "tiff"}
+# Same as Image.create_renditions, encoders release the GIL.
+RENDITION_THREADS = 3
+
+
+class _Derivation:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.image: Any = None
+
+
+def _encode_copy(name: str) -> Callable[..., Any]:
+    encode = getattr(PillowImage, name)
+
+    def encode_copy(self: PillowImage, *args: Any, **kwargs: Any) -> Any:
+        # Pillow stores the encoder options on the image, filters sharing it must not encode it at once.
+        return encode(PillowImage(self.image.copy()), *args, **kwargs)
+
+    return encode_copy
+
+
+class SharedPillowImage(PillowImage):
+    """
+    A Pillow image whose crop, resize and sRGB transform results are computed once per
+    ``DecodedImageSource`` and reused by all filters asking for the same operations.
+    """
+
+    save_as_jpeg = _encode_copy("save_as_jpeg")
+    save_as_png = _encode_copy("save_as_png")
+    save_as_gif = _encode_copy("save_as_gif")
+    save_as_webp = _encode_copy("save_as_webp")
+    save_as_heic = _encode_copy("save_as_heic")
+    save_as_avif = _encode_copy("save_as_avif")
+    save_as_ico = _encode_copy("save_as_ico")
+
+    def __init__(self, image: Any, source: DecodedImageSource | None = None, key: tuple = ()) -> None:
+        super().__init__(image)
+        self.source = source
+        self.key = key
+
+    @property
+    def format_name(self) -> str | None:
+        # Filter.run reads the format of the original to choose the output format
+        return self.source.format_name if self.source is not None else None
+
+    def _derive(self, operation: tuple, compute: Callable[[], Any]) -> SharedPillowImage:
+        if self.source is None:
+            return SharedPillowImage(compute())
+        return self.source.derive((*self.key, operation), compute)
+
+    def auto_orient(self) -> SharedPillowImage:
+        # oriented when decoded
+        return self
+
+    def crop(self, rect: Any) -> SharedPillowImage:
+        return self._derive(("crop", tuple(rect)), lambda: PillowImage.crop(self, rect).image)
+
+    def resize(self, size: Any) -> SharedPillowImage:
+        return self._derive(("resize", tuple(size)), lambda: PillowImage.resize(self, size).image)
+
+    def transform_colorspace_to_srgb(self, rendering_intent: int = 0) -> SharedPillowImage:
+        return self._derive(
+            ("srgb", rendering_intent),
+            lambda: PillowImage.transform_colorspace_to_srgb(self, rendering_intent=rendering_intent).image,
+        )
+
+
+class DecodedImageFilter(Filter):
+    """A filter that renders from the decoded original of a ``DecodedImageSource``."""
+
+    def __init__(self, spec: str, source: DecodedImageSource) -> None:
+        super().__init__(spec=spec)
+        self.source = source
+
+    @contextmanager
+    def get_willow_image(self, image: AbstractImage, source: Any = None) -> Iterator[SharedPillowImage]:
+        yield self.source.image
+
+
+class DecodedImageSource:
+    """The original of an image, read from storage and decoded once for all of its renditions."""
+
+    def __init__(self, pillow_image: Any, format_name: str) -> None:
+        self.format_name = format_name
+        self.image = SharedPillowImage(pillow_image, self)
+        self._lock = threading.Lock()
+        self._derivations: dict[tuple, _Derivation] = {}
+
+    @classmethod
+    def open(cls, image: AbstractImage) -> DecodedImageSource | None:
+        """Decode the original of ``image`` or return ``None`` if its format is left to Wagtail."""
+        if image.is_svg():
+            return None
+        with image.open_file() as image_file:
+            opened = willow.Image.open(image_file)
+            format_name = opened.format_name
+            if format_name not in DECODED_SOURCE_FORMATS:
+                return None
+            pillow_image = PillowImage.open(opened)
+            # Willow's has_animation is always false for Pillow images, ask Pillow itself.
+            if getattr(pillow_image.image, "is_animated", False):
+                return None
+            decoded = pillow_image.auto_orient()
+        return cls(decoded.image, format_name)
+
+    def derive(self, key: tuple, compute: Callable[[], Any]) -> SharedPillowImage:
+        """Return the image for the operations in ``key``, computing it only on first use."""
+        with self._lock:
+            derivation = self._derivations.setdefault(key, _Derivation())
+        with derivation.lock:
+            if derivation.image is None:
+                derivation.image = compute()
+        return SharedPillowImage(derivation.image, self, key)
+
+    def get_filter(self, filter_spec: str) -> DecodedImageFilter:
+        return DecodedImageFilter(filter_spec, self)
+
+
+def create_renditions_from_decoded_source(
+    image: AbstractImage, source: DecodedImageSource, filter_specs: list[str]
+) -> list[AbstractRendition]:
+    """
+    Create the renditions for ``filter_specs`` from ``source`` and insert them in bulk, like
+    ``Image.create_renditions``. Returns the renditions that were inserted by this call.
+    """
+    rendition_model = image.get_rendition_model()
+    filters = [source.get_filter(filter_spec) for filter_spec in filter_specs]
+
+    def generate(rendition_filter: DecodedImageFilter) -> AbstractRendition:
+        return rendition_model(
+            image=image,
+            filter_spec=rendition_filter.spec,
+            focal_point_key=rendition_filter.get_cache_key(image),
+            file=image.generate_rendition_file(rendition_filter),
+        )
+
+    with ThreadPoolExecutor(max_workers=RENDITION_THREADS) as executor:
+        to_create = list(executor.map(generate, filters))
+
+    rendition_model.objects.bulk_create(to_create, ignore_conflicts=True)
+    # Another process may have inserted some of them in the meantime. bulk_create returns every
+    # object either way, so read back which rows hold the new files and drop the files of the others.
+    lookup = Q()
+    for rendition in to_create:
+        lookup |= Q(filter_spec=rendition.filter_spec, focal_point_key=rendition.focal_point_key)
+    persisted = {
+        (filter_spec, focal_point_key): (pk, file_name)
+        for pk, filter_spec, focal_point_key, file_name in image.renditions.filter(lookup).values_list(
+            "pk", "filter_spec", "focal_point_key", "file"
+        )
+    }
+    created = []
+    for rendition in to_create:
+        pk, file_name = persisted.get((rendition.filter_spec, rendition.focal_point_key), (None, None))
+        if file_name == rendition.file.name:
+            rendition.pk = pk
+            created.append(rendition)
+        else:
+            rendition.file.delete(save=False)
+    return created
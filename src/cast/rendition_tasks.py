@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from django_tasks import task
+from wagtail.images.models import Image
+
+from .models import Gallery, Post
+from .models.image_renditions import (
+    create_renditions_for_image,
+    get_obsolete_and_missing_rendition_strings,
+    invalidate_rendition_dependents,
+    release_rendition_job,
+)
+from .renditions import ImageType
+
+
+def get_image_types_in_use(image: Image) -> set[ImageType]:
+    """Return the image types posts and galleries use ``image`` with."""
+    image_types: set[ImageType] = set()
+    if Post.objects.filter(images=image).exists():
+        image_types.add("regular")
+    if Gallery.objects.filter(images=image).exists():
+        image_types.add("gallery")
+    return image_types
+
+
+@task()
+def create_image_renditions(image_id: int, image_types: list[ImageType]) -> None:
+    try:
+        image = Image.objects.filter(pk=image_id).first()
+        if image is None:
+            return
+        # Jobs are deduplicated per image, so a job enqueued for one image type also
+        # covers the other types the image is used with.
+        all_image_types = sorted(set(image_types) | get_image_types_in_use(image))
+        # Recomputed here, an earlier job or sync_renditions may have created some of them already.
+        _, missing_renditions = get_obsolete_and_missing_rendition_strings(
+            [(image_type, image) for image_type in all_image_types]
+        )
+        filter_specs = missing_renditions.get(image.pk)
+        if filter_specs:
+            create_renditions_for_image(image, filter_specs)
+            invalidate_rendition_dependents()
+    finally:
+        release_rendition_job(image_id)
@@ -1,5 +1,6 @@
 from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal, NewType, cast, get_args
 
@@ -58,22 +59,32 @@ SUPPORTED_IMAGE_FORMATS = set(get_args(ImageFormat))
 ImageFormats = Iterable[ImageFormat]
 
 
-def _build_image_type_to_slots() -> dict[ImageType, list[Rectangle]]:
-    return {
-        "regular": [Rectangle(Width(w), Height(h)) for w, h in appsettings.CAST_REGULAR_IMAGE_SLOT_DIMENSIONS],
-        "gallery": [Rectangle(Width(w), Height(h)) for w, h in appsettings.CAST_GALLERY_IMAGE_SLOT_DIMENSIONS],
-    }
+_IMAGE_TYPE_TO_SLOT_SETTING: dict[ImageType, str] = {
+    "regular": "CAST_REGULAR_IMAGE_SLOT_DIMENSIONS",
+    "gallery": "CAST_GALLERY_IMAGE_SLOT_DIMENSIONS",
+}
+
+
+@lru_cache(maxsize=32)
+def _build_slots(dimensions: tuple[tuple[int, int], ...]) -> tuple[Rectangle, ...]:
+    return tuple(Rectangle(Width(w), Height(h)) for w, h in dimensions)
 
 
 class _ImageTypeToSlots(Mapping[ImageType, list[Rectangle]]):
+    """
+    Slots per image type. The settings are read on each access so that overridden settings
+    apply, but the rectangles are only built once per distinct setting value.
+    """
+
     def __getitem__(self, key: ImageType) -> list[Rectangle]:
-        return _build_image_type_to_slots()[key]
+        dimensions = getattr(appsettings, _IMAGE_TYPE_TO_SLOT_SETTING[key])
+        return list(_build_slots(tuple((w, h) for w, h in dimensions)))
 
     def __iter__(self) -> Iterator[ImageType]:
-        return iter(_build_image_type_to_slots())
+        return iter(_IMAGE_TYPE_TO_SLOT_SETTING)
 
     def __len__(self) -> int:
-        return len(_build_image_type_to_slots())
+        return len(_IMAGE_TYPE_TO_SLOT_SETTING)
 
 
 class _DefaultImageFormats:
@@ -0,0 +1,159 @@
+"""Cached ``src`` and ``srcset`` data of images in their layout slots.
+
+Image and gallery blocks call ``get_srcset_images_for_slots`` for every image
+on every render. It derives the rendition filters of all slots and formats
+from the image dimensions and the slot settings, and matches them against the
+renditions of the image. An index page with 50 gallery thumbnails repeats
+that 50 times.
+
+When ``CAST_SRCSET_CACHE_TIMEOUT`` is positive, the resulting ``ImageForSlot``
+data is cached in the ``CAST_REPOSITORY_CACHE_ALIAS`` cache. The key hashes
+the image file and dimensions, the image type, the slot and format settings,
+and the filter spec and file name of every rendition. Creating, replacing or
+deleting a rendition therefore changes the key, so stale entries are never
+read and simply expire. A gallery fetches the entries of all of its images
+with one ``get_many``.
+
+The cached entries hold storage file names instead of URLs. Storages like S3
+with signed URLs hand out URLs that expire, so the URLs are resolved from the
+names on every render, which is cheap compared to computing the filters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+from django.core.cache import caches
+from django.db.models.fields.files import FieldFile
+from wagtail.images.models import AbstractImage, AbstractRendition
+
+from . import __version__, appsettings
+from .renditions import ImageForSlot, ImageType, Rectangle
+
+SRCSET_CACHE_KEY_PREFIX = "cast:srcset"
+# Bump when the shape of ImageForSlot or the way it is computed changes.
+SRCSET_CACHE_SCHEMA_VERSION = 2
+# Stands in for the URL of a file in cached entries, NUL never occurs in URLs or file names.
+FILE_NAME_MARKER = "\x00"
+FILE_NAME_PATTERN = re.compile(f"{FILE_NAME_MARKER}([^{FILE_NAME_MARKER}]*){FILE_NAME_MARKER}")
+
+ImagesForSlots = dict[Rectangle, ImageForSlot]
+SrcsetRequest = tuple[AbstractImage, ImageType, Mapping[str, AbstractRendition]]
+
+
+def get_srcset_cache_key(image: AbstractImage, image_type: ImageType, renditions: Mapping[str, Any]) -> str:
+    state = [
+        SRCSET_CACHE_SCHEMA_VERSION,
+        __version__,
+        image.pk,
+        image.file.name,
+        image.width,
+        image.height,
+        image_type,
+        appsettings.CAST_REGULAR_IMAGE_SLOT_DIMENSIONS,
+        appsettings.CAST_GALLERY_IMAGE_SLOT_DIMENSIONS,
+        appsettings.CAST_IMAGE_FORMATS,
+        appsettings.CAST_GALLERY_THUMBNAIL_RENDITIONS_SRGB,
+        sorted((filter_spec, rendition.file.name) for filter_spec, rendition in renditions.items()),
+    ]
+    digest = hashlib.sha256(json.dumps(state, default=str).encode("utf-8")).hexdigest()
+    return f"{SRCSET_CACHE_KEY_PREFIX}:{image.pk}:{image_type}:{digest}"
+
+
+class _NamedFile:
+    """A file whose URL is a placeholder for its name, resolved by ``resolve_file_urls``."""
+
+    def __init__(self, file: FieldFile) -> None:
+        self.name = file.name
+
+    @property
+    def url(self) -> str:
+        return f"{FILE_NAME_MARKER}{self.name}{FILE_NAME_MARKER}"
+
+
+class _WithNamedFile:
+    """An image or rendition whose file hands out placeholders instead of URLs."""
+
+    def __init__(self, wrapped: Any) -> None:
+        self._wrapped = wrapped
+        self.file = _NamedFile(wrapped.file)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._wrapped, name)
+
+    @property
+    def url(self) -> str:
+        return self.file.url
+
+
+def build_with_file_names(
+    build: Callable[..., ImagesForSlots],
+    image: AbstractImage,
+    image_type: ImageType,
+    renditions: Mapping[str, AbstractRendition],
+) -> ImagesForSlots:
+    """Run ``build`` with file name placeholders in place of every URL, so the result can be cached."""
+    named_renditions = {filter_spec: _WithNamedFile(rendition) for filter_spec, rendition in renditions.items()}
+    return build(_WithNamedFile(image), image_type, named_renditions)
+
+
+def resolve_file_urls(
+    images_for_slots: ImagesForSlots, image: AbstractImage, renditions: Mapping[str, AbstractRendition]
+) -> ImagesForSlots:
+    """Return a copy of ``images_for_slots`` with the file name placeholders replaced by URLs."""
+    files = {rendition.file.name: rendition.file for rendition in renditions.values()}
+    files[image.file.name] = image.file
+    urls: dict[str, str] = {}
+
+    def url(match: re.Match[str]) -> str:
+        name = match.group(1)
+        if name not in urls:
+            urls[name] = files[name].url
+        return urls[name]
+
+    def resolve(value: str) -> str:
+        return FILE_NAME_PATTERN.sub(url, value)
+
+    return {
+        slot: ImageForSlot(
+            Rectangle(width=image_for_slot.width, height=image_for_slot.height),
+            {image_format: resolve(src) for image_format, src in image_for_slot.src.items()},
+            {image_format: resolve(srcset) for image_format, srcset in image_for_slot.srcset.items()},
+        )
+        for slot, image_for_slot in images_for_slots.items()
+    }
+
+
+def is_srcset_cache_enabled() -> bool:
+    return appsettings.CAST_SRCSET_CACHE_TIMEOUT > 0
+
+
+def get_or_build_images_for_slots(
+    requests: Sequence[SrcsetRequest], build: Callable[..., ImagesForSlots]
+) -> list[ImagesForSlots]:
+    """
+    Return the images for slots of each ``(image, image_type, renditions)`` request, reading
+    all cached entries at once and building and caching the missing ones with ``build``.
+
+    Entries are built and cached with file names and get their URLs when they are returned.
+    """
+    if not is_srcset_cache_enabled():
+        return [build(*request) for request in requests]
+    cache = caches[appsettings.CAST_REPOSITORY_CACHE_ALIAS]
+    keys = [get_srcset_cache_key(*request) for request in requests]
+    cached = cache.get_many(keys)
+    built: dict[str, ImagesForSlots] = {}
+    results = []
+    for key, request in zip(keys, requests):
+        images_for_slots = cached.get(key) or built.get(key)
+        if images_for_slots is None:
+            images_for_slots = built[key] = build_with_file_names(build, *request)
+        image, _image_type, renditions = request
+        results.append(resolve_file_urls(images_for_slots, image, renditions))
+    if built:
+        cache.set_many(built, timeout=appsettings.CAST_SRCSET_CACHE_TIMEOUT)
+    return results
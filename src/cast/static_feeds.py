@@ -0,0 +1,248 @@
+"""Pre-rendered feed files.
+
+Podcast clients poll feed URLs every few minutes, and every poll renders the
+whole archive through Django's syndication framework. When
+``CAST_STATIC_FEEDS_ROOT`` is set, the feeds of a blog are rendered to files
+below ``<root>/<site hostname>/<feed url path>`` whenever a page is
+published, unpublished or moved, and whenever audios, videos, transcripts or
+images change. Rendering is enqueued once the transaction commits, so the task
+never renders uncommitted state. A blog whose rendering is still pending is not
+enqueued again, so a burst of changes renders its feeds once. A web server can serve
+those files directly, and the feed views return them before falling back to
+live rendering when a file is missing.
+
+The files are rendered with the theme of the blog or site. Requests that
+choose a theme of their own, by query parameter or session, are always
+rendered live.
+
+Files are written to a temporary file in the target directory and moved into
+place with ``os.replace``, so readers always see either the old or the new
+feed, never a partially written one.
+"""
+
+import contextlib
+import logging
+import os
+import tempfile
+from collections.abc import Callable, Iterator
+from functools import wraps
+from pathlib import Path
+from typing import Any
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import caches
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import FileResponse, Http404, HttpRequest
+from django.http.response import HttpResponseBase
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from wagtail.images import get_image_model
+from wagtail.models import Page, Site
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from . import appsettings
+from .feeds import AtomPodcastFeed, LatestEntriesAtomFeed, LatestEntriesFeed, RssPodcastFeed
+from .models import Audio, Blog, Podcast, Transcript, Video
+from .models.theme import get_template_base_dir
+
+logger = logging.getLogger(__name__)
+
+STATIC_FEED_JOB_KEY_PREFIX = "cast:static-feeds:job"
+# A lost job blocks rendering the feeds of its blog at most this long.
+STATIC_FEED_JOB_DEDUP_SECONDS = 600
+
+
+def is_static_feeds_enabled() -> bool:
+    return bool(appsettings.CAST_STATIC_FEEDS_ROOT)
+
+
+def static_feed_path(hostname: str, url_path: str) -> Path:
+    """Return the file path of the pre-rendered feed for ``url_path`` on ``hostname``."""
+    root = Path(appsettings.CAST_STATIC_FEEDS_ROOT).resolve()
+    path = (root / hostname / url_path.lstrip("/")).resolve()
+    if not path.is_relative_to(root):
+        raise SuspiciousFileOperation(f"Feed path {url_path!r} for {hostname!r} is outside the static feeds root.")
+    return path
+
+
+def get_blog_feeds(blog: Blog) -> Iterator[tuple[str, type[Feed], dict[str, str]]]:
+    """Yield ``(url name, feed class, url kwargs)`` for every feed of ``blog``."""
+    yield "cast:latest_entries_feed", LatestEntriesFeed, {"slug": blog.slug}
+    yield "cast:latest_entries_atom_feed", LatestEntriesAtomFeed, {"slug": blog.slug}
+    if isinstance(blog, Podcast):
+        for audio_format in Audio.mime_lookup:
+            kwargs = {"slug": blog.slug, "audio_format": audio_format}
+            yield "cast:podcast_feed_rss", RssPodcastFeed, kwargs
+            yield "cast:podcast_feed_atom", AtomPodcastFeed, kwargs
+
+
+def build_feed_request(site: Site, url_path: str) -> HttpRequest:
+    """Return a request for ``url_path`` that looks like it came from ``site``."""
+    secure = site.port == 443
+    return RequestFactory(SERVER_NAME=site.hostname).get(url_path, SERVER_PORT=site.port, secure=secure)
+
+
+def write_atomically(path: Path, content: bytes) -> None:
+    """Write ``content`` to ``path`` so that readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporary_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as temporary_file:
+            temporary_file.write(content)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        # mkstemp creates files only readable by the owner, the web server needs to read them.
+        os.chmod(temporary_name, 0o644)
+        os.replace(temporary_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temporary_name)
+        raise
+
+
+def render_static_feeds(blog: Blog) -> list[Path]:
+    """Render all feeds of ``blog`` to files and return the written paths.
+
+    Feeds that are not available anymore, because the blog was unpublished for
+    example, or that fail to render, have their files removed so the live view
+    answers instead.
+    """
+    site = blog.get_site()
+    if site is None:
+        return []
+    written = []
+    for url_name, feed_class, kwargs in get_blog_feeds(blog):
+        url_path = reverse(url_name, kwargs=kwargs)
+        path = static_feed_path(site.hostname, url_path)
+        try:
+            response = feed_class()(build_feed_request(site, url_path), **kwargs)
+        except Http404:
+            path.unlink(missing_ok=True)
+            continue
+        except Exception:
+            # An audio format without files for every episode, for example.
+            logger.warning("Could not render feed %s", url_path, exc_info=True)
+            path.unlink(missing_ok=True)
+            continue
+        write_atomically(path, response.content)
+        written.append(path)
+    return written
+
+
+def render_all_static_feeds() -> list[Path]:
+    """Render the feeds of every live blog."""
+    written = []
+    for blog in Blog.objects.live().specific():
+        written.extend(render_static_feeds(blog))
+    return written
+
+
+def request_selects_theme(request: HttpRequest) -> bool:
+    """Return whether ``request`` chooses a theme instead of the blog or site theme the files use."""
+    return get_template_base_dir(request, pre_selected="") != ""
+
+
+def serve_static_feed(view: Callable[..., HttpResponseBase], *, content_type: str) -> Callable[..., HttpResponseBase]:
+    """Wrap a feed view so a pre-rendered file is served before rendering the feed live."""
+
+    @wraps(view)
+    def wrapped_view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        if (
+            is_static_feeds_enabled()
+            and not request_selects_theme(request)
+            and (site := Site.find_for_request(request)) is not None
+        ):
+            try:
+                feed_file = static_feed_path(site.hostname, request.path).open("rb")
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+            else:
+                # The file may lag behind the database for a moment after publishing, so
+                # it gets validators of its own instead of those of the live feed.
+                stat = os.fstat(feed_file.fileno())
+                etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+                last_modified = int(stat.st_mtime)
+                response: HttpResponseBase | None = get_conditional_response(
+                    request, etag=etag, last_modified=last_modified
+                )
+                if response is None:
+                    response = FileResponse(feed_file, content_type=content_type)
+                else:
+                    feed_file.close()
+                response["ETag"] = etag
+                response["Last-Modified"] = http_date(last_modified)
+                return response
+        return view(request, *args, **kwargs)
+
+    return wrapped_view
+
+
+def static_feed_job_key(blog_id: int) -> str:
+    return f"{STATIC_FEED_JOB_KEY_PREFIX}:{blog_id}"
+
+
+def release_static_feed_job(blog_id: int) -> None:
+    caches[appsettings.CAST_REPOSITORY_CACHE_ALIAS].delete(static_feed_job_key(blog_id))
+
+
+def enqueue_static_feed_rendering(blog_id: int) -> bool:
+    """
+    Enqueue rendering the feeds of a blog unless that is already pending. Returns whether it was enqueued.
+    """
+    if not caches[appsettings.CAST_REPOSITORY_CACHE_ALIAS].add(
+        static_feed_job_key(blog_id), True, timeout=STATIC_FEED_JOB_DEDUP_SECONDS
+    ):
+        return False
+    # Imported here because importing the task module resolves the TASKS backend.
+    from .feed_tasks import render_blog_static_feeds
+
+    try:
+        render_blog_static_feeds.enqueue(blog_id)
+    except Exception:
+        release_static_feed_job(blog_id)
+        raise
+    return True
+
+
+def enqueue_static_feed_rendering_on_commit(blog_ids: list[int]) -> None:
+    """Enqueue rendering the feeds of ``blog_ids`` once the current transaction commits."""
+
+    def enqueue() -> None:
+        for blog_id in blog_ids:
+            enqueue_static_feed_rendering(blog_id)
+
+    transaction.on_commit(enqueue)
+
+
+def on_page_publish_state_changed(sender: Any, instance: Page, **kwargs: Any) -> None:
+    if not is_static_feeds_enabled():
+        return
+    enqueue_static_feed_rendering_on_commit(
+        list(Blog.objects.ancestor_of(instance, inclusive=True).values_list("pk", flat=True))
+    )
+
+
+def on_shared_content_changed(sender: Any, instance: Any, **kwargs: Any) -> None:
+    # Page moves change URLs across blogs and media are shared between blogs, like
+    # for the repository cache, all feeds are rendered again.
+    if not is_static_feeds_enabled():
+        return
+    enqueue_static_feed_rendering_on_commit(list(Blog.objects.live().values_list("pk", flat=True)))
+
+
+def connect_static_feed_receivers() -> None:
+    """Connect the signal receivers that re-render feed files after publishing or media changes."""
+    page_published.connect(on_page_publish_state_changed, dispatch_uid="cast_static_feeds_page_published")
+    page_unpublished.connect(on_page_publish_state_changed, dispatch_uid="cast_static_feeds_page_unpublished")
+    post_page_move.connect(on_shared_content_changed, dispatch_uid="cast_static_feeds_page_moved")
+    image_model = get_image_model()
+    # Renditions are left out: they are created lazily while pages render, and replacing or
+    # deleting an image, which removes its renditions, already sends the image signals.
+    for model in (Audio, Transcript, Video, image_model):
+        label = model._meta.label_lower
+        post_save.connect(on_shared_content_changed, sender=model, dispatch_uid=f"cast_static_feeds_saved:{label}")
+        post_delete.connect(on_shared_content_changed, sender=model, dispatch_uid=f"cast_static_feeds_deleted:{label}")
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import copy
 import re
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any
 
 from django.core.exceptions import ObjectDoesNotExist
@@ -218,6 +219,55 @@ def public_one_off_speaker_labels_for_transcript(transcript: Any, *, episode: An
     }
 
 
+def _episode_contexts_state(episodes: list[Any] | None) -> list[Any] | None:
+    if episodes is None:
+        return None
+    return [
+        [
+            episode.pk,
+            [
+                [assignment.contributor_id, clean_speaker_label(assignment.display_name)]
+                for assignment in episode.visible_contributor_assignments
+            ],
+        ]
+        for episode in episodes
+    ]
+
+
+def public_speaker_state_for_transcript(transcript: Any, *, episode: Any | None = None) -> list[Any]:
+    """Return the database state public speaker mapping and sanitization read for ``transcript``.
+
+    Public transcript output only depends on the raw artifacts, which are
+    covered by ``Transcript.artifact_fingerprint``, and on this state. Both
+    together can key caches and ETags of the public output without reading the
+    artifacts from storage.
+    """
+    from .models import Episode
+
+    audio = getattr(transcript, "audio", None)
+    episode_contexts = _public_episode_contexts_for_transcript(transcript, episode=episode)
+    # Without a usable episode context the allowed labels come from all live episodes of the audio.
+    fallback_contexts = None
+    if episode is not None and not isinstance(getattr(episode, "specific", episode), Episode):
+        fallback_contexts = _public_episode_contexts_for_transcript(transcript)
+    mapping_rows = [
+        [
+            row.speaker_label,
+            row.display_name,
+            row.contributor_id,
+            getattr(row.contributor, "visible", None),
+            getattr(row.contributor, "display_name", None),
+        ]
+        for row in _current_mapping_rows(transcript)
+    ]
+    return [
+        getattr(audio, "transcript_diarization_mode", ""),
+        _episode_contexts_state(episode_contexts),
+        _episode_contexts_state(fallback_contexts),
+        mapping_rows,
+    ]
+
+
 def public_speaker_mapping_for_transcript(transcript: Any, *, episode: Any | None = None) -> dict[str, str]:
     """Return approved read-time speaker-label replacements for a public context."""
     episodes = _public_episode_contexts_for_transcript(transcript, episode=episode)
@@ -291,42 +341,30 @@ def apply_public_speaker_mapping_to_dote_data(
     return apply_speaker_mapping_to_dote_data(data, public_speaker_mapping_for_transcript(transcript, episode=episode))
 
 
-def apply_speaker_mapping_to_webvtt_content(content: str, mapping: dict[str, str]) -> str:
-    if not mapping:
-        return content
-    mapped_lines = []
+def _iter_webvtt_cue_payload_lines(lines: Iterable[str], transform: Callable[[str], str]) -> Iterator[str]:
+    """Yield ``lines`` with every cue payload line passed through ``transform``."""
     in_cue_payload = False
-    for line in content.splitlines(keepends=True):
-        stripped = line.strip()
-        if not stripped:
+    for line in lines:
+        if not line.strip():
             in_cue_payload = False
-            mapped_lines.append(line)
-            continue
-        if WEBVTT_TIMING_SEPARATOR in line:
+        elif WEBVTT_TIMING_SEPARATOR in line:
             in_cue_payload = True
-            mapped_lines.append(line)
-            continue
-        if in_cue_payload:
-            line = _map_webvtt_payload_line(line, mapping)
-        mapped_lines.append(line)
-    return "".join(mapped_lines)
-
-
-def apply_public_speaker_mapping_to_webvtt_content(
-    content: str, transcript: Any, *, episode: Any | None = None
-) -> str:
-    return apply_speaker_mapping_to_webvtt_content(
-        content,
-        public_speaker_mapping_for_transcript(transcript, episode=episode),
-    )
+        elif in_cue_payload:
+            line = transform(line)
+        yield line
 
 
-def _map_webvtt_payload_line(line: str, mapping: dict[str, str]) -> str:
-    body = line.removesuffix("\r\n")
-    newline = "\r\n" if body != line else ""
-    if not newline:
-        body = line.removesuffix("\n")
-        newline = "\n" if body != line else ""
+def _split_line_ending(line: str) -> tuple[str, str]:
+    for newline in ("\r\n", "\n"):
+        if line.endswith(newline):
+            return line[: -len(newline)], newline
+    return line, ""
+
+
+def iter_speaker_mapped_webvtt_lines(lines: Iterable[str], mapping: dict[str, str]) -> Iterator[str]:
+    """Apply ``mapping`` to the speaker labels of WebVTT ``lines`` one line at a time."""
+    if not mapping:
+        return iter(lines)
 
     def replace_voice_opening(match: re.Match[str]) -> str:
         label = clean_speaker_label(match.group("label"))
@@ -335,16 +373,24 @@ def _map_webvtt_payload_line(line: str, mapping: dict[str, str]) -> str:
             return match.group(0)
         return f"<v{match.group('classes')} {target_label}>"
 
-    body = WEBVTT_VOICE_OPENING_RE.sub(replace_voice_opening, body)
+    def map_payload_line(line: str) -> str:
+        body, newline = _split_line_ending(line)
+        body = WEBVTT_VOICE_OPENING_RE.sub(replace_voice_opening, body)
+        generic_prefix_match = WEBVTT_GENERIC_SPEAKER_PREFIX_RE.match(body)
+        if generic_prefix_match is not None:
+            label = clean_speaker_label(generic_prefix_match.group("label"))
+            target_label = mapping.get(label)
+            if target_label:
+                body = f"{target_label}: {generic_prefix_match.group('text')}"
+        return f"{body}{newline}"
 
-    generic_prefix_match = WEBVTT_GENERIC_SPEAKER_PREFIX_RE.match(body)
-    if generic_prefix_match is not None:
-        label = clean_speaker_label(generic_prefix_match.group("label"))
-        target_label = mapping.get(label)
-        if target_label:
-            body = f"{target_label}: {generic_prefix_match.group('text')}"
+    return _iter_webvtt_cue_payload_lines(lines, map_payload_line)
 
-    return f"{body}{newline}"
+
+def apply_speaker_mapping_to_webvtt_content(content: str, mapping: dict[str, str]) -> str:
+    if not mapping:
+        return content
+    return "".join(iter_speaker_mapped_webvtt_lines(content.splitlines(keepends=True), mapping))
 
 
 def sanitize_podlove_data(data: dict[str, Any], allowed_speaker_labels: set[str] | None) -> dict[str, Any]:
@@ -428,34 +474,8 @@ def podlove_contributors_from_data(data: dict[str, Any]) -> list[dict[str, str]]
     return contributors
 
 
-def sanitize_webvtt_content(content: str, allowed_speaker_labels: set[str] | None) -> str:
-    if allowed_speaker_labels is None:
-        return content
-
-    sanitized_lines = []
-    in_cue_payload = False
-    for line in content.splitlines(keepends=True):
-        stripped = line.strip()
-        if not stripped:
-            in_cue_payload = False
-            sanitized_lines.append(line)
-            continue
-        if WEBVTT_TIMING_SEPARATOR in line:
-            in_cue_payload = True
-            sanitized_lines.append(line)
-            continue
-        if in_cue_payload:
-            line = _sanitize_webvtt_payload_line(line, allowed_speaker_labels)
-        sanitized_lines.append(line)
-    return "".join(sanitized_lines)
-
-
-def _sanitize_webvtt_payload_line(line: str, allowed_speaker_labels: set[str]) -> str:
-    body = line.removesuffix("\r\n")
-    newline = "\r\n" if body != line else ""
-    if not newline:
-        body = line.removesuffix("\n")
-        newline = "\n" if body != line else ""
+def sanitize_cue_text(text: str, allowed_speaker_labels: set[str]) -> str:
+    """Remove voice tags and generic speaker prefixes outside ``allowed_speaker_labels`` from cue ``text``."""
 
     def replace_voice_span(match: re.Match[str]) -> str:
         label = clean_speaker_label(match.group("label"))
@@ -463,20 +483,35 @@ def _sanitize_webvtt_payload_line(line: str, allowed_speaker_labels: set[str]) -
             return match.group("body")
         return match.group(0)
 
-    body = WEBVTT_VOICE_SPAN_RE.sub(replace_voice_span, body)
-
     def replace_voice_opening(match: re.Match[str]) -> str:
         label = clean_speaker_label(match.group("label"))
         if label and label not in allowed_speaker_labels:
             return ""
         return match.group(0)
 
-    body = WEBVTT_VOICE_OPENING_RE.sub(replace_voice_opening, body)
-
-    generic_prefix_match = WEBVTT_GENERIC_SPEAKER_PREFIX_RE.match(body)
+    text = WEBVTT_VOICE_SPAN_RE.sub(replace_voice_span, text)
+    text = WEBVTT_VOICE_OPENING_RE.sub(replace_voice_opening, text)
+    generic_prefix_match = WEBVTT_GENERIC_SPEAKER_PREFIX_RE.match(text)
     if generic_prefix_match is not None:
         label = clean_speaker_label(generic_prefix_match.group("label"))
         if label and label not in allowed_speaker_labels:
-            body = generic_prefix_match.group("text")
+            text = generic_prefix_match.group("text")
+    return text
+
+
+def iter_sanitized_webvtt_lines(lines: Iterable[str], allowed_speaker_labels: set[str] | None) -> Iterator[str]:
+    """Remove speaker labels outside ``allowed_speaker_labels`` from WebVTT ``lines`` one line at a time."""
+    if allowed_speaker_labels is None:
+        return iter(lines)
 
-    return f"{body}{newline}"
+    def sanitize_payload_line(line: str) -> str:
+        body, newline = _split_line_ending(line)
+        return f"{sanitize_cue_text(body, allowed_speaker_labels)}{newline}"
+
+    return _iter_webvtt_cue_payload_lines(lines, sanitize_payload_line)
+
+
+def sanitize_webvtt_content(content: str, allowed_speaker_labels: set[str] | None) -> str:
+    if allowed_speaker_labels is None:
+        return content
+    return "".join(iter_sanitized_webvtt_lines(content.splitlines(keepends=True), allowed_speaker_labels))
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from django_tasks import task
+
+from .models import Transcript
+
+
+@task()
+def rebuild_transcript_search_index_task(transcript_id: int) -> None:
+    transcript = Transcript.objects.filter(pk=transcript_id).first()
+    if transcript is None:
+        return
+    transcript.rebuild_search_index()
@@ -0,0 +1,178 @@
+"""Versioned, cached public transcript output.
+
+Every public transcript endpoint serves the raw artifact after applying the
+approved speaker mapping and sanitizing the speaker labels. That output only
+depends on the artifact content, which is fingerprinted on the transcript row,
+and on database state collected by ``public_speaker_state_for_transcript``.
+``get_public_transcript_version`` hashes both into an ETag, so conditional
+requests are answered without reading the artifact from storage.
+
+When ``CAST_TRANSCRIPT_CACHE_TIMEOUT`` is positive, the public output is also
+cached in the ``CAST_REPOSITORY_CACHE_ALIAS`` cache under a key containing that
+hash. Changed artifacts, mappings, or contributors produce a new key, so
+entries never have to be invalidated.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from django.core.cache import caches
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+from .. import appsettings
+from ..transcript_sanitization import (
+    apply_public_speaker_mapping_to_dote_data,
+    apply_public_speaker_mapping_to_podlove_data,
+    iter_sanitized_webvtt_lines,
+    iter_speaker_mapped_webvtt_lines,
+    public_speaker_mapping_for_transcript,
+    public_speaker_state_for_transcript,
+    sanitize_dote_data,
+    sanitize_podlove_data,
+    strict_public_speaker_labels_for_transcript,
+)
+from .dote import convert_dote_to_podcastindex_transcript
+
+if TYPE_CHECKING:
+    from cast.models import Transcript
+
+PUBLIC_TRANSCRIPT_CACHE_KEY_PREFIX = "cast:transcript:public"
+# Bump when the shape of a cached output changes.
+PUBLIC_TRANSCRIPT_SCHEMA_VERSION = 1
+
+OUTPUT_PODLOVE = "podlove"
+OUTPUT_PODCASTINDEX = "podcastindex"
+OUTPUT_WEBVTT = "webvtt"
+OUTPUT_PLAYER_CUE_INDEX = "player-cue-index"
+
+_Output = TypeVar("_Output")
+
+
+@dataclass(frozen=True)
+class PublicTranscriptVersion:
+    cache_key: str
+    etag: str
+
+
+def get_public_transcript_version(
+    transcript: Transcript, *, output: str, episode: Any | None = None, extra: Any = None
+) -> PublicTranscriptVersion:
+    """Return the cache key and ETag of one public output of ``transcript``.
+
+    ``extra`` takes additional inputs of the output, like the audio duration
+    used for player cues.
+    """
+    state = [
+        PUBLIC_TRANSCRIPT_SCHEMA_VERSION,
+        output,
+        getattr(episode, "pk", None),
+        transcript.transcript_artifact_fingerprint(),
+        public_speaker_state_for_transcript(transcript, episode=episode),
+        extra,
+    ]
+    digest = hashlib.sha256(json.dumps(state, default=str).encode("utf-8")).hexdigest()
+    return PublicTranscriptVersion(
+        cache_key=f"{PUBLIC_TRANSCRIPT_CACHE_KEY_PREFIX}:{transcript.pk}:{output}:{digest}",
+        etag=f'"{digest}"',
+    )
+
+
+def is_transcript_cache_enabled() -> bool:
+    return appsettings.CAST_TRANSCRIPT_CACHE_TIMEOUT > 0
+
+
+def get_or_build_public_output(version: PublicTranscriptVersion, build: Callable[[], _Output]) -> _Output:
+    """Return the cached output for ``version`` or build and cache it.
+
+    Exceptions raised by ``build`` propagate and nothing is cached.
+    """
+    if not is_transcript_cache_enabled():
+        return build()
+    cache = caches[appsettings.CAST_REPOSITORY_CACHE_ALIAS]
+    output = cache.get(version.cache_key)
+    if output is None:
+        output = build()
+        cache.set(version.cache_key, output, timeout=appsettings.CAST_TRANSCRIPT_CACHE_TIMEOUT)
+    return output
+
+
+def etag_matches(request: HttpRequest, etag: str) -> bool:
+    """Return whether the ``If-None-Match`` header of ``request`` matches ``etag`` (weak comparison)."""
+    candidates = parse_etags(request.headers.get("If-None-Match", ""))
+    return "*" in candidates or etag in {candidate.removeprefix("W/") for candidate in candidates}
+
+
+def not_modified(version: PublicTranscriptVersion) -> HttpResponse:
+    response = HttpResponseNotModified()
+    response["ETag"] = version.etag
+    return response
+
+
+def public_podlove_data(data: dict[str, Any], transcript: Transcript, *, episode: Any | None = None) -> dict[str, Any]:
+    """Apply the public speaker mapping to Podlove ``data`` and sanitize it."""
+    data = apply_public_speaker_mapping_to_podlove_data(data, transcript, episode=episode)
+    return sanitize_podlove_data(data, strict_public_speaker_labels_for_transcript(transcript, episode=episode))
+
+
+def build_public_podlove_data(transcript: Transcript, *, episode: Any | None = None) -> dict[str, Any]:
+    """Load the Podlove artifact and return its public version."""
+    with transcript.podlove.open("r") as file:
+        data = json.load(file)
+    return public_podlove_data(data, transcript, episode=episode)
+
+
+def build_public_podcastindex_data(transcript: Transcript, *, episode: Any | None = None) -> dict[str, Any]:
+    """Load the DOTe artifact and return its public version converted to podcastindex JSON."""
+    with transcript.dote.open("r") as file:
+        dote_data = json.load(file)
+    if not dote_data:
+        return dote_data
+    dote_data = apply_public_speaker_mapping_to_dote_data(dote_data, transcript, episode=episode)
+    dote_data = sanitize_dote_data(dote_data, strict_public_speaker_labels_for_transcript(transcript, episode=episode))
+    return convert_dote_to_podcastindex_transcript(dote_data)
+
+
+class _ClosingIterator:
+    """Iterate ``iterator`` and close ``file`` when done or when the response is closed."""
+
+    def __init__(self, iterator: Iterator[str], file: Any) -> None:
+        self._iterator = iterator
+        self._file = file
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def stream_public_webvtt_content(transcript: Transcript, *, episode: Any | None = None) -> Iterator[str]:
+    """Return the public version of the WebVTT artifact as an iterator over its lines.
+
+    The speaker mapping and the allowed labels are resolved and the file is
+    opened before this returns, so database access and a missing file fail
+    before a response starts. Only one cue is held in memory at a time.
+    """
+    mapping = public_speaker_mapping_for_transcript(transcript, episode=episode)
+    allowed_speaker_labels = strict_public_speaker_labels_for_transcript(transcript, episode=episode)
+    file = transcript.vtt.open("r")
+    lines = iter_sanitized_webvtt_lines(iter_speaker_mapped_webvtt_lines(file, mapping), allowed_speaker_labels)
+    return _ClosingIterator(lines, file)
+
+
+def build_public_webvtt_content(transcript: Transcript, *, episode: Any | None = None) -> str:
+    """Load the WebVTT artifact and return its public version."""
+    return "".join(stream_public_webvtt_content(transcript, episode=episode))
@@ -0,0 +1,179 @@
+"""Time-coded full-text search over transcript segments.
+
+The segment text of the Podlove artifact (or the DOTe artifact when there is
+no Podlove file) is stored as ``TranscriptSegment`` rows by a background task
+enqueued when the transcript artifacts change. Speaker labels are removed from
+the text, search results only show what was said. Every distinct, case-folded word of a segment gets a
+``TranscriptSearchTerm`` row, so a query is answered from the ``(term,
+segment)`` index without reading any artifact from storage.
+
+All words of a query have to match. The last word also matches as a prefix,
+so search-as-you-type works.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, QuerySet, Window
+from django.db.models.functions import RowNumber
+
+from ..transcript_sanitization import sanitize_cue_text
+from . import parsing
+from .dote import dote_timestamp_to_ms
+
+if TYPE_CHECKING:
+    from cast.models import Episode
+    from cast.models.transcript import Transcript, TranscriptSegment
+
+TERM_MAX_LENGTH = 64
+MAX_QUERY_TERMS = 8
+DEFAULT_MAX_EPISODES = 20
+DEFAULT_MAX_HITS_PER_EPISODE = 10
+
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class TranscriptSearchHit:
+    start_ms: int
+    text: str
+
+
+@dataclass(frozen=True)
+class TranscriptSearchResult:
+    episode: Episode
+    hits: list[TranscriptSearchHit]
+
+
+def tokenize(text: str) -> list[str]:
+    """Return the distinct, case-folded words of ``text`` in order of appearance."""
+    terms = dict.fromkeys(word[:TERM_MAX_LENGTH] for word in _WORD.findall(text.casefold()))
+    return list(terms)
+
+
+def _load_json(transcript: Transcript, field_name: str) -> Any:
+    file_field = getattr(transcript, field_name)
+    if not file_field:
+        return None
+    try:
+        with file_field.open("r") as file:
+            return json.load(file)
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+
+
+def public_segment_text(value: Any) -> str:
+    """Return the cue text of a segment without voice tags or generic speaker prefixes."""
+    if not isinstance(value, str):
+        return ""
+    return parsing.clean_sample_text(sanitize_cue_text(parsing.clean_sample_text(value), allowed_speaker_labels=set()))
+
+
+def iter_transcript_segments(transcript: Transcript) -> Iterable[tuple[int, str]]:
+    """Yield ``(start_ms, text)`` for every segment with a start and text."""
+    podlove_data = _load_json(transcript, "podlove")
+    if isinstance(podlove_data, dict) and isinstance(podlove_data.get("transcripts"), list):
+        for segment in podlove_data["transcripts"]:
+            if not isinstance(segment, dict):
+                continue
+            start = parsing.parse_record_start_seconds(segment, timestamp_fields=("start",))
+            text = public_segment_text(segment.get("text"))
+            if start is not None and text:
+                yield round(start * 1000), text
+        return
+    dote_data = _load_json(transcript, "dote")
+    if isinstance(dote_data, dict) and isinstance(dote_data.get("lines"), list):
+        for line in dote_data["lines"]:
+            if not isinstance(line, dict):
+                continue
+            start_ms = dote_timestamp_to_ms(line.get("startTime"))
+            text = public_segment_text(line.get("text"))
+            if start_ms is not None and text:
+                yield start_ms, text
+
+
+def enqueue_search_index_rebuild(transcript_id: int) -> None:
+    # Imported here because importing the task module resolves the TASKS backend.
+    from cast.transcript_tasks import rebuild_transcript_search_index_task
+
+    rebuild_transcript_search_index_task.enqueue(transcript_id)
+
+
+def rebuild_transcript_search_index(transcript: Transcript) -> int:
+    """Replace the search segments of ``transcript`` and return how many were stored."""
+    from cast.models import TranscriptSearchTerm, TranscriptSegment
+
+    segments = [
+        TranscriptSegment(transcript=transcript, position=position, start_ms=start_ms, text=text)
+        for position, (start_ms, text) in enumerate(iter_transcript_segments(transcript))
+    ]
+    with transaction.atomic():
+        transcript.search_segments.all().delete()
+        # bulk_create only sets primary keys on some databases, so read them back
+        TranscriptSegment.objects.bulk_create(segments, batch_size=500)
+        segment_ids = dict(transcript.search_segments.values_list("position", "pk"))
+        TranscriptSearchTerm.objects.bulk_create(
+            (
+                TranscriptSearchTerm(segment_id=segment_ids[segment.position], term=term)
+                for segment in segments
+                for term in tokenize(segment.text)
+            ),
+            batch_size=1000,
+        )
+    return len(segments)
+
+
+def matching_segments(query: str) -> QuerySet[TranscriptSegment]:
+    """Return the segments containing every word of ``query``, the last one as a prefix."""
+    from cast.models import TranscriptSearchTerm, TranscriptSegment
+
+    terms = tokenize(query)[:MAX_QUERY_TERMS]
+    if not terms:
+        return TranscriptSegment.objects.none()
+    segments = TranscriptSegment.objects.all()
+    *complete_terms, last_term = terms
+    for term in complete_terms:
+        segments = segments.filter(Exists(TranscriptSearchTerm.objects.filter(segment=OuterRef("pk"), term=term)))
+    return segments.filter(
+        Exists(TranscriptSearchTerm.objects.filter(segment=OuterRef("pk"), term__startswith=last_term))
+    )
+
+
+def search_transcripts(
+    query: str,
+    *,
+    episodes: QuerySet[Episode],
+    max_episodes: int = DEFAULT_MAX_EPISODES,
+    max_hits_per_episode: int = DEFAULT_MAX_HITS_PER_EPISODE,
+) -> list[TranscriptSearchResult]:
+    """Return the newest of ``episodes`` whose transcript matches ``query``, with their first hits."""
+    segments = matching_segments(query)
+    matching_episodes = list(
+        episodes.filter(Exists(segments.filter(transcript__audio_id=OuterRef("podcast_audio_id")))).order_by(
+            "-visible_date", "-pk"
+        )[:max_episodes]
+    )
+    if not matching_episodes:
+        return []
+    hits_by_audio_id: dict[int, list[TranscriptSearchHit]] = {}
+    hit_rows = (
+        segments.filter(transcript__audio_id__in={episode.podcast_audio_id for episode in matching_episodes})
+        .annotate(
+            rank=Window(RowNumber(), partition_by=F("transcript__audio_id"), order_by=F("start_ms").asc()),
+        )
+        .filter(rank__lte=max_hits_per_episode)
+        .values_list("transcript__audio_id", "start_ms", "text")
+        .order_by("transcript__audio_id", "start_ms")
+    )
+    for audio_id, start_ms, text in hit_rows:
+        hits_by_audio_id.setdefault(audio_id, []).append(TranscriptSearchHit(start_ms=start_ms, text=text))
+    return [
+        TranscriptSearchResult(episode=episode, hits=hits_by_audio_id[episode.podcast_audio_id])
+        for episode in matching_episodes
+    ]
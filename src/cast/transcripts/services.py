@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import json
 from collections.abc import Mapping
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from django.utils import timezone
 
@@ -70,6 +71,186 @@ def sync_speaker_mappings(transcript: Transcript) -> None:
             mapping.save(update_fields=update_fields)
 
 
+JSON_ARTIFACT_FIELDS = ("podlove", "dote", "speakers")
+
+
+def clean_speaker_label_mapping(mapping: Mapping[str, str]) -> dict[str, str]:
+    cleaned_mapping: dict[str, str] = {}
+    for source, target in mapping.items():
+        source_label = parsing.clean_speaker_label(source)
+        target_label = parsing.clean_speaker_label(target)
+        if source_label and target_label and source_label != target_label:
+            cleaned_mapping[source_label] = target_label
+    return cleaned_mapping
+
+
+class TranscriptArtifactEdit:
+    """Batch of speaker edits applied to all stored transcript formats at once.
+
+    Each artifact (Podlove, DOTe, WebVTT and the private ``speakers``
+    sidecar) is read at most once, on first use, and every operation works on
+    the same in-memory copy. ``commit`` writes only the artifacts that
+    changed, stages their new files concurrently and saves the transcript row
+    once. Nothing is written before ``commit``.
+    """
+
+    def __init__(self, transcript: Transcript) -> None:
+        self.transcript = transcript
+        self._artifacts: dict[str, Any] = {}
+        self._changed_fields: set[str] = set()
+
+    def _json(self, field_name: str) -> dict[str, Any]:
+        if field_name not in self._artifacts:
+            if field_name == "speakers":
+                self._artifacts[field_name] = self.transcript.speakers_data
+            else:
+                self._artifacts[field_name] = self.transcript._load_transcript_json(field_name)
+        return self._artifacts[field_name]
+
+    def _vtt(self) -> str | None:
+        if not self.transcript.vtt:
+            return None
+        if "vtt" not in self._artifacts:
+            self._artifacts["vtt"] = self.transcript._load_text_file("vtt")
+        return self._artifacts["vtt"]
+
+    def _set_vtt(self, content: str, changed: bool) -> None:
+        if changed:
+            self._artifacts["vtt"] = content
+            self._changed_fields.add("vtt")
+
+    def _mark_changed(self, field_name: str, changed: bool) -> None:
+        if changed:
+            self._changed_fields.add(field_name)
+
+    @property
+    def changed_fields(self) -> list[str]:
+        return [field_name for field_name in (*JSON_ARTIFACT_FIELDS, "vtt") if field_name in self._changed_fields]
+
+    def rewrite_speaker_labels(self, mapping: Mapping[str, str]) -> bool:
+        """Replace the ``mapping`` keys with their values in every public format."""
+        cleaned_mapping = clean_speaker_label_mapping(mapping)
+        if not cleaned_mapping:
+            return False
+        podlove_changed = podlove.rewrite_speakers(self._json("podlove"), cleaned_mapping)
+        self._mark_changed("podlove", podlove_changed)
+        dote_changed = dote.rewrite_speakers(self._json("dote"), cleaned_mapping)
+        self._mark_changed("dote", dote_changed)
+        vtt_changed = False
+        if (content := self._vtt()) is not None:
+            content, vtt_changed = webvtt.rewrite_speakers(content, cleaned_mapping)
+            self._set_vtt(content, vtt_changed)
+        return podlove_changed or dote_changed or vtt_changed
+
+    def clear_suggestions(self, start_milliseconds: set[int]) -> int:
+        """Remove the public speaker of the segments and cues starting at ``start_milliseconds``."""
+        applied, changed = podlove.clear_suggestions(self._json("podlove"), start_milliseconds)
+        self._mark_changed("podlove", changed)
+        dote_applied, changed = dote.clear_suggestions(self._json("dote"), start_milliseconds)
+        self._mark_changed("dote", changed)
+        applied += dote_applied
+        if (content := self._vtt()) is not None:
+            content, vtt_applied, changed = webvtt.clear_suggestions_from_content(content, start_milliseconds)
+            self._set_vtt(content, changed)
+            applied += vtt_applied
+        return applied
+
+    def apply_suggestions(self, names_by_start_ms: dict[int, str]) -> int:
+        """Set the public speaker of the segments and cues starting at the keys of ``names_by_start_ms``."""
+        applied = podlove.apply_suggestions(self._json("podlove"), names_by_start_ms)
+        self._mark_changed("podlove", bool(applied))
+        dote_applied = dote.apply_suggestions(self._json("dote"), names_by_start_ms)
+        self._mark_changed("dote", bool(dote_applied))
+        applied += dote_applied
+        if (content := self._vtt()) is not None:
+            content, vtt_applied, changed = webvtt.apply_suggestions_to_content(content, names_by_start_ms)
+            self._set_vtt(content, changed)
+            applied += vtt_applied
+        return applied
+
+    def get_speaker_suggestions(self) -> list[dict]:
+        """Per-segment known-speaker suggestions, including decisions made in this edit."""
+        segments = self._json("speakers").get("segments", [])
+        return [segment for segment in segments if isinstance(segment, dict)]
+
+    def save_known_speaker_editor_decisions(
+        self, decisions_by_position: Mapping[int, Mapping[str, str] | None]
+    ) -> int:
+        """Store per-segment editor decisions in the private sidecar and return how many changed."""
+        segments = self._json("speakers").get("segments")
+        if not isinstance(segments, list):
+            return 0
+        changed = 0
+        suggestion_position = -1
+        for segment in segments:
+            if not isinstance(segment, dict):
+                continue
+            suggestion_position += 1
+            if suggestion_position not in decisions_by_position:
+                continue
+            decision = known_speakers.normalize_editor_decision(decisions_by_position[suggestion_position])
+            existing_decision = known_speakers.normalize_editor_decision(
+                segment.get(known_speakers.KNOWN_SPEAKER_EDITOR_DECISION_FIELD)
+            )
+            if decision is None:
+                if known_speakers.KNOWN_SPEAKER_EDITOR_DECISION_FIELD in segment:
+                    del segment[known_speakers.KNOWN_SPEAKER_EDITOR_DECISION_FIELD]
+                    changed += 1
+                continue
+            if existing_decision == decision:
+                continue
+            segment[known_speakers.KNOWN_SPEAKER_EDITOR_DECISION_FIELD] = decision
+            changed += 1
+        self._mark_changed("speakers", bool(changed))
+        return changed
+
+    def apply_known_speaker_suggestions(self, *, smooth: bool = True) -> int:
+        """Write the known-speaker suggestions of the sidecar into every public format.
+
+        See ``Transcript.apply_known_speaker_suggestions`` for the rules.
+        """
+        suggestions = sorted(self.get_speaker_suggestions(), key=parsing.segment_sort_key)
+        display_names = known_speakers.resolve_display_names(suggestions, smooth=smooth)
+        names_by_start_ms: dict[int, str] = {}
+        rejected_start_ms: set[int] = set()
+        for segment, name in zip(suggestions, display_names):
+            try:
+                start_ms = int(round(float(segment["start"]) * 1000))
+            except (TypeError, ValueError, KeyError):
+                continue
+            if name:
+                names_by_start_ms[start_ms] = name
+                rejected_start_ms.discard(start_ms)
+            elif known_speakers.segment_has_reject_decision(segment):
+                rejected_start_ms.add(start_ms)
+        if not names_by_start_ms and not rejected_start_ms:
+            return 0
+        applied = self.clear_suggestions(rejected_start_ms)
+        if names_by_start_ms:
+            applied += self.apply_suggestions(names_by_start_ms)
+        return applied
+
+    def _serialize(self, field_name: str) -> bytes:
+        if field_name == "vtt":
+            return self._artifacts[field_name].encode("utf-8")
+        return json.dumps(self._artifacts[field_name], ensure_ascii=False, indent=2).encode("utf-8")
+
+    def commit(self) -> list[str]:
+        """Write the changed artifacts, save the transcript and return the changed field names."""
+        changed_fields = self.changed_fields
+        if not changed_fields:
+            return []
+        files = []
+        for field_name in changed_fields:
+            file_field = getattr(self.transcript, field_name)
+            files.append((file_field, file_field.name.rsplit("/", 1)[-1], self._serialize(field_name)))
+        replacements = StagedFileReplacementGroup()
+        replacements.stage_concurrently(files)
+        replacements.save_model(self.transcript, update_fields=changed_fields)
+        self._changed_fields.clear()
+        return changed_fields
+
+
 def apply_known_speaker_suggestions(transcript: Transcript, *, smooth: bool = True) -> int:
     """Apply known-speaker suggestions to public transcript output.
 
@@ -94,41 +275,9 @@ def apply_known_speaker_suggestions(transcript: Transcript, *, smooth: bool = Tr
     available for audit and re-application. Returns the number of public
     transcript entries matched across stored formats.
     """
-    suggestions = sorted(transcript.get_speaker_suggestions(), key=parsing.segment_sort_key)
-    display_names = known_speakers.resolve_display_names(suggestions, smooth=smooth)
-    names_by_start_ms: dict[int, str] = {}
-    rejected_start_ms: set[int] = set()
-    for segment, name in zip(suggestions, display_names):
-        try:
-            start_ms = int(round(float(segment["start"]) * 1000))
-        except (TypeError, ValueError, KeyError):
-            continue
-        if name:
-            names_by_start_ms[start_ms] = name
-            rejected_start_ms.discard(start_ms)
-        elif known_speakers.segment_has_reject_decision(segment):
-            rejected_start_ms.add(start_ms)
-    if not names_by_start_ms and not rejected_start_ms:
-        return 0
-    replacements = StagedFileReplacementGroup()
-    try:
-        applied = transcript._clear_suggestions_from_podlove(rejected_start_ms, replacements=replacements)
-        applied += transcript._clear_suggestions_from_dote(rejected_start_ms, replacements=replacements)
-        if transcript.vtt:
-            applied += transcript._clear_suggestions_from_webvtt(rejected_start_ms, replacements=replacements)
-        if names_by_start_ms:
-            applied += transcript._apply_suggestions_to_podlove(names_by_start_ms, replacements=replacements)
-            applied += transcript._apply_suggestions_to_dote(names_by_start_ms, replacements=replacements)
-            if transcript.vtt:
-                applied += transcript._apply_suggestions_to_webvtt(names_by_start_ms, replacements=replacements)
-        if applied:
-            if replacements.replacements:
-                replacements.save_model(transcript)
-            else:
-                transcript.save()
-    except Exception:
-        replacements.rollback()
-        raise
+    edit = TranscriptArtifactEdit(transcript)
+    applied = edit.apply_known_speaker_suggestions(smooth=smooth)
+    edit.commit()
     return applied
 
 
@@ -142,40 +291,9 @@ def save_known_speaker_editor_decisions(
     such as ``speaker``, ``speaker_uncertain``, candidate lists, confidence,
     margin, and raw diarization labels are never overwritten.
     """
-    data = transcript.speakers_data
-    segments = data.get("segments")
-    if not isinstance(segments, list):
-        return 0
-    changed = 0
-    suggestion_position = -1
-    for segment in segments:
-        if not isinstance(segment, dict):
-            continue
-        suggestion_position += 1
-        if suggestion_position not in decisions_by_position:
-            continue
-        decision = known_speakers.normalize_editor_decision(decisions_by_position[suggestion_position])
-        existing_decision = known_speakers.normalize_editor_decision(
-            segment.get(known_speakers.KNOWN_SPEAKER_EDITOR_DECISION_FIELD)
-        )
-        if decision is None:
-            if known_speakers.KNOWN_SPEAKER_EDITOR_DECISION_FIELD in segment:
-                del segment[known_speakers.KNOWN_SPEAKER_EDITOR_DECISION_FIELD]
-                changed += 1
-            continue
-        if existing_decision == decision:
-            continue
-        segment[known_speakers.KNOWN_SPEAKER_EDITOR_DECISION_FIELD] = decision
-        changed += 1
-    if not changed:
-        return 0
-    replacements = StagedFileReplacementGroup()
-    try:
-        transcript._write_speakers_data(data, replacements=replacements)
-        replacements.save_model(transcript, update_fields=["speakers"])
-    except Exception:
-        replacements.rollback()
-        raise
+    edit = TranscriptArtifactEdit(transcript)
+    changed = edit.save_known_speaker_editor_decisions(decisions_by_position)
+    edit.commit()
     return changed
 
 
@@ -186,42 +304,9 @@ def rewrite_speaker_labels(transcript: Transcript, mapping: Mapping[str, str]) -
     DOTe ``speakerDesignation``, and WebVTT voice-label values are replaced
     in-place.
     """
-    cleaned_mapping: dict[str, str] = {}
-    for source, target in mapping.items():
-        source_label = parsing.clean_speaker_label(source)
-        target_label = parsing.clean_speaker_label(target)
-        if source_label and target_label and source_label != target_label:
-            cleaned_mapping[source_label] = target_label
-    if not cleaned_mapping:
-        return False
-
-    changed_fields = []
-    replacements = StagedFileReplacementGroup()
-    try:
-        podlove_data = transcript._load_transcript_json("podlove")
-        if podlove.rewrite_speakers(podlove_data, cleaned_mapping):
-            transcript._save_json_file("podlove", podlove_data, replacements=replacements)
-            changed_fields.append("podlove")
-
-        dote_data = transcript._load_transcript_json("dote")
-        if dote.rewrite_speakers(dote_data, cleaned_mapping):
-            transcript._save_json_file("dote", dote_data, replacements=replacements)
-            changed_fields.append("dote")
-
-        if transcript.vtt:
-            vtt_content = transcript._load_text_file("vtt")
-            rewritten_vtt_content, vtt_changed = webvtt.rewrite_speakers(vtt_content, cleaned_mapping)
-            if vtt_changed:
-                transcript._save_text_file("vtt", rewritten_vtt_content, replacements=replacements)
-                changed_fields.append("vtt")
-
-        if not changed_fields:
-            return False
-        replacements.save_model(transcript, update_fields=changed_fields)
-    except Exception:
-        replacements.rollback()
-        raise
-    return True
+    edit = TranscriptArtifactEdit(transcript)
+    edit.rewrite_speaker_labels(mapping)
+    return bool(edit.commit())
 
 
 def get_speaker_labels(transcript: Transcript) -> list[str]:
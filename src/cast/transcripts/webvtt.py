@@ -1,7 +1,7 @@
 """Pure WebVTT transcript transforms."""
 
 import re
-from collections.abc import Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping
 
 from . import parsing
 
@@ -27,10 +27,12 @@ def timing_line_start_ms(line: str) -> int | None:
     return webvtt_timestamp_to_ms(start_timestamp)
 
 
-def get_speaker_labels(content: str) -> set[str]:
+def get_speaker_labels(content: str | Iterable[str]) -> set[str]:
+    """Return the speaker labels of the cue payloads of ``content`` (a string or its lines)."""
+    lines = content.splitlines() if isinstance(content, str) else content
     labels: set[str] = set()
     in_cue_payload = False
-    for line in content.splitlines():
+    for line in lines:
         stripped = line.strip()
         if not stripped:
             in_cue_payload = False
@@ -51,44 +53,46 @@ def get_speaker_labels(content: str) -> set[str]:
     return labels
 
 
-def clear_suggestions_from_content(content: str, start_milliseconds: set[int]) -> tuple[str, int, bool]:
-    rewritten_lines: list[str] = []
-    payload_lines: list[str] | None = None
-    should_clear = False
-    applied = 0
-    changed = False
+def iter_cue_rewrites(
+    lines: Iterable[str], rewrite_cue: Callable[[int | None, list[str]], list[str]]
+) -> Iterator[str]:
+    """Yield ``lines`` with the payload of every cue passed through ``rewrite_cue``.
 
-    def flush_payload() -> None:
-        nonlocal applied, changed, payload_lines, should_clear
-        if payload_lines is None:
-            return
-        lines = payload_lines
-        if should_clear:
-            lines, cue_changed, cue_applied = clear_cue_voice(lines)
-            if cue_applied:
-                applied += 1
-            changed = changed or cue_changed
-        rewritten_lines.extend(lines)
-        payload_lines = None
-        should_clear = False
-
-    for line in content.splitlines(keepends=True):
+    ``rewrite_cue`` gets the start of the cue in milliseconds and its payload
+    lines. Only one cue payload is buffered at a time.
+    """
+    payload_lines: list[str] | None = None
+    start_ms: int | None = None
+    for line in lines:
         if payload_lines is not None:
-            if not line.strip():
-                flush_payload()
-                rewritten_lines.append(line)
-            else:
+            if line.strip():
                 payload_lines.append(line)
-            continue
-
-        if TIMING_SEPARATOR in line:
+                continue
+            yield from rewrite_cue(start_ms, payload_lines)
+            payload_lines = None
+        elif TIMING_SEPARATOR in line:
             start_ms = timing_line_start_ms(line)
-            should_clear = start_ms in start_milliseconds if start_ms is not None else False
             payload_lines = []
-        rewritten_lines.append(line)
+        yield line
+    if payload_lines is not None:
+        yield from rewrite_cue(start_ms, payload_lines)
+
+
+def clear_suggestions_from_content(content: str, start_milliseconds: set[int]) -> tuple[str, int, bool]:
+    applied = 0
+    changed = False
+
+    def clear_cue(start_ms: int | None, lines: list[str]) -> list[str]:
+        nonlocal applied, changed
+        if start_ms not in start_milliseconds:
+            return lines
+        lines, cue_changed, cue_applied = clear_cue_voice(lines)
+        applied += cue_applied
+        changed = changed or cue_changed
+        return lines
 
-    flush_payload()
-    return "".join(rewritten_lines), applied, changed
+    rewritten = "".join(iter_cue_rewrites(content.splitlines(keepends=True), clear_cue))
+    return rewritten, applied, changed
 
 
 def clear_cue_voice(lines: list[str]) -> tuple[list[str], bool, bool]:
@@ -105,43 +109,21 @@ def clear_cue_voice(lines: list[str]) -> tuple[list[str], bool, bool]:
 
 
 def apply_suggestions_to_content(content: str, names_by_start_ms: Mapping[int, str]) -> tuple[str, int, bool]:
-    rewritten_lines: list[str] = []
-    payload_lines: list[str] | None = None
-    current_name: str | None = None
     applied = 0
     changed = False
 
-    def flush_payload() -> None:
-        nonlocal applied, changed, current_name, payload_lines
-        if payload_lines is None:
-            return
-        lines = payload_lines
-        if current_name:
-            lines, cue_changed, cue_applied = set_cue_voice(lines, current_name)
-            if cue_applied:
-                applied += 1
-            changed = changed or cue_changed
-        rewritten_lines.extend(lines)
-        current_name = None
-        payload_lines = None
-
-    for line in content.splitlines(keepends=True):
-        if payload_lines is not None:
-            if not line.strip():
-                flush_payload()
-                rewritten_lines.append(line)
-            else:
-                payload_lines.append(line)
-            continue
+    def apply_to_cue(start_ms: int | None, lines: list[str]) -> list[str]:
+        nonlocal applied, changed
+        name = names_by_start_ms.get(start_ms) if start_ms is not None else None
+        if not name:
+            return lines
+        lines, cue_changed, cue_applied = set_cue_voice(lines, name)
+        applied += cue_applied
+        changed = changed or cue_changed
+        return lines
 
-        if TIMING_SEPARATOR in line:
-            start_ms = timing_line_start_ms(line)
-            current_name = names_by_start_ms.get(start_ms) if start_ms is not None else None
-            payload_lines = []
-        rewritten_lines.append(line)
-
-    flush_payload()
-    return "".join(rewritten_lines), applied, changed
+    rewritten = "".join(iter_cue_rewrites(content.splitlines(keepends=True), apply_to_cue))
+    return rewritten, applied, changed
 
 
 def set_cue_voice(lines: list[str], name: str) -> tuple[list[str], bool, bool]:
@@ -169,25 +151,22 @@ def set_payload_line_voice(line: str, name: str) -> tuple[str, bool, bool]:
     return rewritten_line, rewritten_line != line, replacements > 0
 
 
-def rewrite_speakers(content: str, mapping: Mapping[str, str]) -> tuple[str, bool]:
-    rewritten_lines = []
-    changed = False
+def iter_rewritten_speakers(lines: Iterable[str], mapping: Mapping[str, str]) -> Iterator[str]:
+    """Yield ``lines`` with the voice labels in cue payloads renamed by ``mapping``."""
     in_cue_payload = False
-    for line in content.splitlines(keepends=True):
-        stripped = line.strip()
-        if not stripped:
+    for line in lines:
+        if not line.strip():
             in_cue_payload = False
-            rewritten_lines.append(line)
         elif TIMING_SEPARATOR in line:
             in_cue_payload = True
-            rewritten_lines.append(line)
         elif in_cue_payload:
-            line, line_changed = rewrite_payload_line(line, mapping)
-            changed = changed or line_changed
-            rewritten_lines.append(line)
-        else:
-            rewritten_lines.append(line)
-    return "".join(rewritten_lines), changed
+            line, _line_changed = rewrite_payload_line(line, mapping)
+        yield line
+
+
+def rewrite_speakers(content: str, mapping: Mapping[str, str]) -> tuple[str, bool]:
+    rewritten = "".join(iter_rewritten_speakers(content.splitlines(keepends=True), mapping))
+    return rewritten, rewritten != content
 
 
 def rewrite_payload_line(line: str, mapping: Mapping[str, str]) -> tuple[str, bool]:
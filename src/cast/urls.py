@@ -1,13 +1,12 @@
 from typing import Any
 
 from django.urls import include, path
-from django.views.decorators.cache import cache_page
 
 from . import feeds
 from .views import meta
 from .views.chapters import chapters_json
 from .views.dev import components_view, dev_health_view, theme_compare_view
-from .views.feed import feed_detail
+from .views.feed import feed_detail, feed_view
 from .views.gallery import gallery_modal
 from .views.styleguide import styleguide
 from .views.theme import select_theme
@@ -18,6 +17,7 @@ from .views.transcript import (
     podlove_transcript_json,
     webvtt_transcript,
 )
+from .views.voxhelm import voxhelm_job_callback
 
 app_name = "cast"
 urlpatterns: list[Any] = [
@@ -28,6 +28,8 @@ urlpatterns: list[Any] = [
     path("transcripts/podcastindex/<int:pk>/", view=podcastindex_transcript_json, name="podcastindex-transcript-json"),
     # WebVTT transcripts
     path("transcripts/vtt/<int:pk>/", view=webvtt_transcript, name="webvtt-transcript"),
+    # Voxhelm job completion callback
+    path("voxhelm/jobs/callback/", view=voxhelm_job_callback, name="voxhelm-job-callback"),
     # Podcasting 2.0 chapters
     path("chapters/<int:pk>/", view=chapters_json, name="chapters-json"),
     # HTML transcripts
@@ -39,24 +41,34 @@ urlpatterns: list[Any] = [
     # Feeds
     path(
         "<slug:slug>/feed/rss.xml",
-        view=cache_page(5 * 60)(feeds.LatestEntriesFeed()),
+        view=feed_view(feeds.LatestEntriesFeed()),
         name="latest_entries_feed",
     ),
     path(
         "<slug:slug>/feed/atom.xml",
-        view=cache_page(5 * 60)(feeds.LatestEntriesAtomFeed()),
+        view=feed_view(feeds.LatestEntriesAtomFeed()),
         name="latest_entries_atom_feed",
     ),
     path(
         "<slug:slug>/feed/podcast/<audio_format>/rss.xml",
-        view=cache_page(5 * 60)(feeds.RssPodcastFeed()),
+        view=feed_view(feeds.RssPodcastFeed()),
         name="podcast_feed_rss",
     ),
     path(
         "<slug:slug>/feed/podcast/<audio_format>/atom.xml",
-        view=cache_page(5 * 60)(feeds.AtomPodcastFeed()),
+        view=feed_view(feeds.AtomPodcastFeed()),
         name="podcast_feed_atom",
     ),
+    path(
+        "<slug:slug>/feed/podcast/<audio_format>/archive/<int:archive_page>/rss.xml",
+        view=feed_view(feeds.RssPodcastFeed()),
+        name="podcast_feed_rss_archive",
+    ),
+    path(
+        "<slug:slug>/feed/podcast/<audio_format>/archive/<int:archive_page>/atom.xml",
+        view=feed_view(feeds.AtomPodcastFeed()),
+        name="podcast_feed_atom_archive",
+    ),
     # Meta views like twitter player cards etc
     path("<slug:blog_slug>/<slug:episode_slug>/twitter-player/", view=meta.twitter_player, name="twitter-player"),
     # Store selected theme in session
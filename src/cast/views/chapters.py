@@ -1,20 +1,40 @@
 from __future__ import annotations
 
-from django.http import HttpRequest, HttpResponse, JsonResponse
+import json
+
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
 
-from cast.audio_access import authorize_audio_access
+from cast.audio_access import authorize_audio_access, patch_audio_cache_headers
 from cast.models import Audio
 from cast.player import build_chapters
+from cast.player_cache import get_chapters_version, get_or_build_payload
+from cast.transcripts.public import etag_matches
 
 
-def chapters_json(request: HttpRequest, pk: int) -> HttpResponse:
-    """Return Podcasting 2.0 chapters JSON for an audio object."""
-    audio = get_object_or_404(Audio, pk=pk)
-    authorize_audio_access(request, audio=audio, explicit_anchor_id=request.GET.get("episode_id"))
-    chapters = build_chapters(audio)
+def build_chapters_content(audio: Audio) -> bytes:
     chapter_data: list[dict[str, int | str]] = [
-        {"startTime": chapter["start"], "title": chapter["title"]} for chapter in chapters
+        {"startTime": chapter["start"], "title": chapter["title"]} for chapter in build_chapters(audio)
     ]
     data: dict[str, str | list[dict[str, int | str]]] = {"version": "1.2.0", "chapters": chapter_data}
-    return JsonResponse(data, content_type="application/json+chapters")
+    return json.dumps(data).encode("utf-8")
+
+
+def chapters_json(request: HttpRequest, pk: int) -> HttpResponse:
+    """Return Podcasting 2.0 chapters JSON for an audio object.
+
+    The ETag hashes the chapter marks of the audio, so a matching
+    ``If-None-Match`` is answered without building the chapters JSON.
+    """
+    audio = get_object_or_404(Audio, pk=pk)
+    anchor = authorize_audio_access(request, audio=audio, explicit_anchor_id=request.GET.get("episode_id"))
+    version = get_chapters_version(audio.pk)
+    response: HttpResponse
+    if etag_matches(request, version.etag):
+        response = HttpResponseNotModified()
+    else:
+        content = get_or_build_payload(version, lambda: build_chapters_content(audio))
+        response = HttpResponse(content, content_type="application/json+chapters")
+    response["ETag"] = version.etag
+    patch_audio_cache_headers(response, anchor)
+    return response
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import Callable
+from functools import partial, wraps
+from typing import Any, cast
 
 from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
 from django.shortcuts import render
 from django.template import TemplateDoesNotExist
 from django.template.loader import get_template
 from django.urls import reverse
+from django.utils.http import http_date
+from django.views.decorators.cache import cache_page
+from django.views.decorators.http import condition
 
 from cast import appsettings
+from cast.feeds import RepositoryMixin, feed_etag, feed_last_modified, get_feed_validators
 from cast.models import Audio, Blog
 from cast.models.theme import get_template_base_dir
 from cast.site_lookup import get_site_specific_page_or_404
+from cast.static_feeds import serve_static_feed
+
+FEED_CACHE_TIMEOUT = 5 * 60
 
 
 def get_podcast_feed_urls(blog: Blog) -> list[dict[str, str]]:
@@ -67,3 +77,55 @@ def _resolve_feed_detail_template(template_base_dir: str) -> str:
         return candidate
     except TemplateDoesNotExist:
         return f"cast/{FEED_DETAIL_FALLBACK_THEME}/feed_detail.html"
+
+
+def render_feed(feed: RepositoryMixin) -> Callable[..., HttpResponseBase]:
+    """Return a view rendering ``feed``, streamed item by item if ``CAST_STREAMING_FEEDS`` is set."""
+
+    @wraps(feed)
+    def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        if appsettings.CAST_STREAMING_FEEDS:
+            return feed.stream(request, *args, **kwargs)
+        return feed(request, *args, **kwargs)
+
+    return view
+
+
+def with_feed_validators(
+    view: Callable[..., HttpResponseBase], *, is_podcast: bool
+) -> Callable[..., HttpResponseBase]:
+    """Set the feed validators on freshly rendered responses.
+
+    This runs inside ``cache_page`` so a cached response keeps the validators that
+    describe its body. The syndication framework's own Last-Modified header is
+    replaced because ``condition()`` compares against our value.
+    """
+
+    @wraps(view)
+    def wrapped_view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        response = view(request, *args, **kwargs)
+        validators = get_feed_validators(request, slug=kwargs["slug"], is_podcast=is_podcast)
+        if validators is not None:
+            response["ETag"] = validators.etag
+            if validators.last_modified is not None:
+                response["Last-Modified"] = http_date(validators.last_modified.timestamp())
+        return response
+
+    return wrapped_view
+
+
+def feed_view(feed: RepositoryMixin) -> Callable[..., HttpResponseBase]:
+    """Return the URL view for ``feed``.
+
+    Conditional requests are answered first, so an unchanged feed costs one
+    aggregate query. Then a pre-rendered file is served if there is one, and
+    only then the feed is rendered (and cached for a few minutes, unless it
+    is streamed).
+    """
+    view = with_feed_validators(render_feed(feed), is_podcast=feed.is_podcast)
+    view = cache_page(FEED_CACHE_TIMEOUT)(view)
+    view = serve_static_feed(view, content_type=cast(Any, feed.feed_type).content_type)
+    return condition(
+        etag_func=partial(feed_etag, is_podcast=feed.is_podcast),
+        last_modified_func=partial(feed_last_modified, is_podcast=feed.is_podcast),
+    )(view)
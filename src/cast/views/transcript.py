@@ -5,7 +5,7 @@ from typing import Any, TypedDict, cast
 
 from django.core.exceptions import ValidationError
 from django.forms.boundfield import BoundField
-from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBase, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template import TemplateDoesNotExist
 from django.template.loader import get_template
@@ -39,18 +39,9 @@ from ..models import (
 from ..audio_access import authorize_transcript_access, request_may_view_page
 from ..models.contributors import ContributorVoiceReference
 from ..site_lookup import get_site_specific_page_or_404
-from ..transcripts import editing, parsing
-from ..transcripts.dote import convert_dote_to_podcastindex_transcript, dote_timestamp_to_ms
-from ..transcript_sanitization import (
-    apply_public_speaker_mapping_to_dote_data,
-    apply_public_speaker_mapping_to_podlove_data,
-    apply_public_speaker_mapping_to_webvtt_content,
-    public_episode_from_request,
-    sanitize_dote_data,
-    sanitize_podlove_data,
-    sanitize_webvtt_content,
-    strict_public_speaker_labels_for_transcript,
-)
+from ..transcripts import editing, parsing, public
+from ..transcripts.dote import dote_timestamp_to_ms
+from ..transcript_sanitization import public_episode_from_request
 from . import AuthenticatedHttpRequest, HtmxHttpRequest
 from .media import MediaAdminConfig, MediaAdminViews
 
@@ -121,12 +112,16 @@ def _render_transcript_html(
 ) -> HttpResponse:
     if not transcript.podlove:
         return HttpResponse("Transcript JSON not available", status=404)
+    # No ETag here: the rendered page also depends on the theme and the page context.
+    version = public.get_public_transcript_version(transcript, output=public.OUTPUT_PODLOVE, episode=episode)
     try:
-        data = transcript.podlove_data
+        data = public.get_or_build_public_output(
+            version, lambda: public.build_public_podlove_data(transcript, episode=episode)
+        )
+    except (FileNotFoundError, OSError):
+        data = public.public_podlove_data({}, transcript, episode=episode)
     except json.JSONDecodeError:
         return HttpResponse("Invalid JSON format in podlove file", status=400)
-    data = apply_public_speaker_mapping_to_podlove_data(data, transcript, episode=episode)
-    data = sanitize_podlove_data(data, strict_public_speaker_labels_for_transcript(transcript, episode=episode))
     if episode is not None:
         context = episode.get_context(request)
         context["episode"] = episode
@@ -318,8 +313,10 @@ def _handle_known_speaker_review(
         multiple_episodes=speaker_mapping_context["multiple_episodes"],
     )
     if known_speaker_review_form.is_valid():
-        changed = transcript.save_known_speaker_editor_decisions(known_speaker_review_form.segment_decisions)
-        applied = transcript.apply_known_speaker_suggestions(smooth=False)
+        edit = transcript.edit_artifacts()
+        changed = edit.save_known_speaker_editor_decisions(known_speaker_review_form.segment_decisions)
+        applied = edit.apply_known_speaker_suggestions(smooth=False)
+        edit.commit()
         if changed or applied:
             messages.success(
                 request,
@@ -554,18 +551,21 @@ def podlove_transcript_json(request: HttpRequest, pk: int) -> HttpResponse:
     """Return the podlove transcript content as JSON because of CORS restrictions."""
     transcript = get_object_or_404(Transcript, pk=pk)
     authorize_transcript_access(request, transcript=transcript, explicit_anchor_id=request.GET.get("episode_id"))
-    if transcript.podlove:
-        # Open the file and load its contents as JSON
-        with transcript.podlove.open("r") as file:
-            try:
-                data = json.load(file)  # assumes the file content is JSON
-            except json.JSONDecodeError:
-                return HttpResponse("Invalid JSON format in podlove file", status=400)
-        episode = public_episode_from_request(request, transcript=transcript)
-        data = apply_public_speaker_mapping_to_podlove_data(data, transcript, episode=episode)
-        data = sanitize_podlove_data(data, strict_public_speaker_labels_for_transcript(transcript, episode=episode))
-        return JsonResponse(data)
-    return HttpResponse("Podlove file not available", status=404)
+    if not transcript.podlove:
+        return HttpResponse("Podlove file not available", status=404)
+    episode = public_episode_from_request(request, transcript=transcript)
+    version = public.get_public_transcript_version(transcript, output=public.OUTPUT_PODLOVE, episode=episode)
+    if public.etag_matches(request, version.etag):
+        return public.not_modified(version)
+    try:
+        data = public.get_or_build_public_output(
+            version, lambda: public.build_public_podlove_data(transcript, episode=episode)
+        )
+    except json.JSONDecodeError:
+        return HttpResponse("Invalid JSON format in podlove file", status=400)
+    response = JsonResponse(data)
+    response["ETag"] = version.etag
+    return response
 
 
 def podcastindex_transcript_json(request: HttpRequest, pk: int) -> HttpResponse:
@@ -574,40 +574,44 @@ def podcastindex_transcript_json(request: HttpRequest, pk: int) -> HttpResponse:
     authorize_transcript_access(request, transcript=transcript, explicit_anchor_id=request.GET.get("episode_id"))
     if not transcript.dote:
         return HttpResponse("podcastindex JSON file not available", status=404)
+    episode = public_episode_from_request(request, transcript=transcript)
+    version = public.get_public_transcript_version(transcript, output=public.OUTPUT_PODCASTINDEX, episode=episode)
+    if public.etag_matches(request, version.etag):
+        return public.not_modified(version)
     try:
-        episode = public_episode_from_request(request, transcript=transcript)
-        with transcript.dote.open("r") as file:
-            dote_data = json.load(file)
-        if not dote_data:
-            return JsonResponse(dote_data)
-        dote_data = apply_public_speaker_mapping_to_dote_data(dote_data, transcript, episode=episode)
-        dote_data = sanitize_dote_data(
-            dote_data,
-            strict_public_speaker_labels_for_transcript(transcript, episode=episode),
+        data = public.get_or_build_public_output(
+            version, lambda: public.build_public_podcastindex_data(transcript, episode=episode)
         )
-        return JsonResponse(convert_dote_to_podcastindex_transcript(dote_data))
     except (FileNotFoundError, OSError):
         return HttpResponse("podcastindex JSON file missing", status=404)
     except json.JSONDecodeError:
         return HttpResponse("Invalid JSON format in dote file", status=400)
+    response = JsonResponse(data)
+    response["ETag"] = version.etag
+    return response
 
 
-def webvtt_transcript(request: HttpRequest, pk: int) -> HttpResponse:
+def webvtt_transcript(request: HttpRequest, pk: int) -> HttpResponseBase:
     """Return the transcript content as WebVTT because of CORS restrictions."""
     transcript = get_object_or_404(Transcript, pk=pk)
     authorize_transcript_access(request, transcript=transcript, explicit_anchor_id=request.GET.get("episode_id"))
-    if transcript.vtt:
-        # Open the file and return its contents as WebVTT
-        with transcript.vtt.open("r") as file:
-            content = file.read()
-        episode = public_episode_from_request(request, transcript=transcript)
-        content = apply_public_speaker_mapping_to_webvtt_content(content, transcript, episode=episode)
-        content = sanitize_webvtt_content(
-            content,
-            strict_public_speaker_labels_for_transcript(transcript, episode=episode),
+    if not transcript.vtt:
+        return HttpResponse("WebVTT file not available", status=404)
+    episode = public_episode_from_request(request, transcript=transcript)
+    version = public.get_public_transcript_version(transcript, output=public.OUTPUT_WEBVTT, episode=episode)
+    if public.etag_matches(request, version.etag):
+        return public.not_modified(version)
+    response: HttpResponseBase
+    if public.is_transcript_cache_enabled():
+        content = public.get_or_build_public_output(
+            version, lambda: public.build_public_webvtt_content(transcript, episode=episode)
         )
-        return HttpResponse(content, content_type="text/vtt")
-    return HttpResponse("WebVTT file not available", status=404)
+        response = HttpResponse(content, content_type="text/vtt")
+    else:
+        lines = public.stream_public_webvtt_content(transcript, episode=episode)
+        response = StreamingHttpResponse(lines, content_type="text/vtt")
+    response["ETag"] = version.etag
+    return response
 
 
 def episode_transcript(request: HtmxHttpRequest, blog_slug: str, episode_slug: str) -> HttpResponse:
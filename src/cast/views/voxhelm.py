@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import hmac
+import json
+from functools import partial
+
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
-from django.http import HttpRequest, HttpResponse
+from django.db import transaction
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from wagtail.admin import messages
 from wagtail.models import Site
@@ -18,6 +24,7 @@ from ..transcripts.editing import episode_from_latest_revision
 from ..voxhelm import (
     VoxhelmError,
     enqueue_audio_transcript_generation,
+    get_setting,
     get_transcript_generation_status_context,
 )
 
@@ -147,3 +154,35 @@ def generate_audio_transcript(request: HttpRequest, audio_id: int) -> HttpRespon
 
 def get_audio_transcript_status_context(*, audio: Audio) -> dict[str, str | bool]:
     return get_transcript_generation_status_context(audio=audio)
+
+
+@csrf_exempt
+@require_POST
+def voxhelm_job_callback(request: HttpRequest) -> HttpResponse:
+    """Let Voxhelm report a finished job, so its generation completes without waiting for the next poll.
+
+    The payload only names the job. The completion task fetches the job state from Voxhelm itself.
+    """
+    token = get_setting("CAST_VOXHELM_WEBHOOK_TOKEN", "")
+    if not isinstance(token, str) or not token.strip():
+        raise Http404
+    authorization = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(authorization.encode("utf-8"), f"Bearer {token.strip()}".encode()):
+        return HttpResponseForbidden()
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid JSON payload.")
+    job_id = str(payload.get("id") or payload.get("job_id") or "").strip() if isinstance(payload, dict) else ""
+    if not job_id:
+        return HttpResponseBadRequest("Missing job id.")
+    # Deliberately imported here, see enqueue_audio_transcript_generation.
+    from ..voxhelm_tasks import complete_transcript_generation
+
+    with transaction.atomic():
+        # waits for a poll that is finishing the job right now
+        generation = get_object_or_404(TranscriptGeneration.objects.select_for_update(), voxhelm_job_id=job_id)
+        if not generation.is_active:
+            raise Http404
+        transaction.on_commit(partial(complete_transcript_generation.enqueue, generation.pk))
+    return HttpResponse(status=202)
@@ -26,6 +26,7 @@ from .service import (
     DOTE_REQUIRED_KEYS,
     TranscriptEnqueueResult,
     TranscriptGenerationResult,
+    TranscriptJobArtifacts,
     TranscriptSubmission,
     VoxhelmTranscriptService,
     build_failure_message,
@@ -82,6 +83,7 @@ __all__ = [
     "TranscriptEnqueueResult",
     "TranscriptGeneration",
     "TranscriptGenerationResult",
+    "TranscriptJobArtifacts",
     "TranscriptSubmission",
     "VoxhelmClient",
     "VoxhelmError",
@@ -0,0 +1,206 @@
+"""Run many Voxhelm transcript jobs at once.
+
+``VoxhelmTranscriptService.generate_for_audio`` submits one job and blocks in
+``VoxhelmClient.wait_for_job`` until it finishes. For backfills,
+``TranscriptBatch`` keeps up to ``concurrency`` jobs in flight, polls them
+together with one ``get_job`` request per job and round, and stores the
+artifacts of each job as soon as it finishes.
+
+Progress can be written to a JSON state file. Rerunning with the same file
+skips finished audios and resumes polling submitted jobs instead of
+submitting them again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Any
+
+from .client import TERMINAL_JOB_STATES
+from .exceptions import VoxhelmError
+from .service import TranscriptGenerationResult, VoxhelmTranscriptService
+
+if TYPE_CHECKING:
+    from cast.models.audio import Audio
+
+BATCH_STATE_VERSION = 1
+
+
+class TranscriptBatchState:
+    """Per-audio progress of a batch, optionally persisted to a JSON file."""
+
+    SUBMITTED = "submitted"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, path: Path | None = None, audios: dict[str, dict[str, Any]] | None = None) -> None:
+        self.path = path
+        self.audios = audios or {}
+
+    @classmethod
+    def load(cls, path: str | Path) -> TranscriptBatchState:
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise VoxhelmError(f"Could not read transcript batch state file {path}: {exc}") from exc
+        if not isinstance(data, dict) or data.get("version") != BATCH_STATE_VERSION:
+            raise VoxhelmError(f"Unsupported transcript batch state file {path}.")
+        audios = data.get("audios")
+        if not isinstance(audios, dict):
+            raise VoxhelmError(f"Unsupported transcript batch state file {path}.")
+        return cls(path, audios)
+
+    def get(self, audio_id: int) -> dict[str, Any]:
+        return self.audios.get(str(audio_id), {})
+
+    def is_done(self, audio_id: int) -> bool:
+        return self.get(audio_id).get("state") == self.DONE
+
+    def update(self, audio_id: int, **entry: Any) -> None:
+        self.audios[str(audio_id)] = entry
+        self.save()
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        # write a sibling file first, so an interrupted run never leaves a truncated state file
+        temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+        temporary_path.write_text(
+            json.dumps({"version": BATCH_STATE_VERSION, "audios": self.audios}, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(temporary_path, self.path)
+
+
+@dataclass(frozen=True)
+class TranscriptBatchItem:
+    audio: Audio
+    task_ref: str
+    episode: Any | None = None
+
+
+@dataclass(frozen=True)
+class TranscriptBatchOutcome:
+    item: TranscriptBatchItem
+    result: TranscriptGenerationResult | None = None
+    error: VoxhelmError | None = None
+
+
+@dataclass
+class _InFlightJob:
+    item: TranscriptBatchItem
+    job_id: str
+    source_url: str
+    job_payload: dict[str, Any]
+    deadline: float
+
+
+class TranscriptBatch:
+    def __init__(
+        self,
+        service: VoxhelmTranscriptService,
+        *,
+        concurrency: int,
+        state: TranscriptBatchState | None = None,
+        clock: Callable[[], float] = monotonic,
+        wait: Callable[[float], None] = sleep,
+    ) -> None:
+        self.service = service
+        self.client = service.client
+        self.concurrency = concurrency
+        self.state = state or TranscriptBatchState()
+        self.clock = clock
+        self.wait = wait
+
+    def run(self, items: Iterable[TranscriptBatchItem]) -> Iterator[TranscriptBatchOutcome]:
+        """Yield one outcome per item, in the order the jobs finish."""
+        pending = deque(items)
+        in_flight: list[_InFlightJob] = []
+        while pending or in_flight:
+            while pending and len(in_flight) < self.concurrency:
+                item = pending.popleft()
+                try:
+                    in_flight.append(self._start(item))
+                except VoxhelmError as exc:
+                    yield self._fail(item, exc)
+
+            finished = 0
+            for job in list(in_flight):
+                outcome = self._poll(job)
+                if outcome is not None:
+                    in_flight.remove(job)
+                    finished += 1
+                    yield outcome
+            if in_flight and not finished:
+                self.wait(self.client.poll_interval_seconds)
+
+    def _start(self, item: TranscriptBatchItem) -> _InFlightJob:
+        audio_id = item.audio.pk
+        entry = self.state.get(audio_id)
+        deadline = self.clock() + self.client.job_timeout_seconds
+        if entry.get("state") == TranscriptBatchState.SUBMITTED and entry.get("job_id"):
+            return _InFlightJob(
+                item=item,
+                job_id=str(entry["job_id"]),
+                source_url=str(entry.get("source_url", "")),
+                job_payload={},
+                deadline=deadline,
+            )
+        submission = self.service.submit_for_audio(item.audio, task_ref=item.task_ref, episode=item.episode)
+        self.state.update(
+            audio_id,
+            state=TranscriptBatchState.SUBMITTED,
+            job_id=submission.job_id,
+            source_url=submission.source_url,
+            task_ref=submission.task_ref,
+        )
+        return _InFlightJob(
+            item=item,
+            job_id=submission.job_id,
+            source_url=submission.source_url,
+            job_payload=submission.job_payload,
+            deadline=deadline,
+        )
+
+    def _poll(self, job: _InFlightJob) -> TranscriptBatchOutcome | None:
+        # Until the job is terminal, errors keep the job submitted in the state file, so a rerun resumes it.
+        try:
+            if str(job.job_payload.get("state", "")) not in TERMINAL_JOB_STATES:
+                job.job_payload = self.client.get_job(job.job_id)
+        except VoxhelmError as exc:
+            return TranscriptBatchOutcome(item=job.item, error=exc)
+        if str(job.job_payload.get("state", "")) not in TERMINAL_JOB_STATES:
+            if self.clock() >= job.deadline:
+                return TranscriptBatchOutcome(
+                    item=job.item, error=VoxhelmError(f"Timed out waiting for Voxhelm job {job.job_id}.")
+                )
+            return None
+        try:
+            result = self.service.complete_audio_job(
+                job.item.audio,
+                job_id=job.job_id,
+                source_url=job.source_url,
+                initial_job_payload=job.job_payload,
+            )
+        except VoxhelmError as exc:
+            return self._fail(job.item, exc, job_id=job.job_id)
+        self.state.update(
+            job.item.audio.pk,
+            state=TranscriptBatchState.DONE,
+            job_id=result.job_id,
+            transcript_id=result.transcript.pk,
+        )
+        return TranscriptBatchOutcome(item=job.item, result=result)
+
+    def _fail(self, item: TranscriptBatchItem, exc: VoxhelmError, *, job_id: str = "") -> TranscriptBatchOutcome:
+        self.state.update(item.audio.pk, state=TranscriptBatchState.FAILED, job_id=job_id, error=str(exc))
+        return TranscriptBatchOutcome(item=item, error=exc)
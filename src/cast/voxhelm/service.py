@@ -31,6 +31,15 @@ class TranscriptGenerationResult:
     source_url: str
 
 
+@dataclass(frozen=True)
+class TranscriptJobArtifacts:
+    job_id: str
+    podlove: bytes
+    dote: bytes
+    vtt: bytes
+    speakers: bytes | None = None
+
+
 @dataclass(frozen=True)
 class TranscriptSubmission:
     job_id: str
@@ -317,14 +326,13 @@ class VoxhelmTranscriptService:
             job_payload=job_payload,
         )
 
-    def complete_audio_job(
+    def fetch_job_artifacts(
         self,
-        audio: Audio,
         *,
         job_id: str,
-        source_url: str,
         initial_job_payload: dict[str, Any] | None = None,
-    ) -> TranscriptGenerationResult:
+    ) -> TranscriptJobArtifacts:
+        """Wait for the Voxhelm job and download its artifacts without touching the database."""
         job_payload = initial_job_payload or {}
         if str(job_payload.get("id", "")) != job_id:
             job_payload = {}
@@ -333,23 +341,46 @@ class VoxhelmTranscriptService:
         if job_payload.get("state") != "succeeded":
             raise VoxhelmError(build_failure_message(job_payload))
 
-        podlove = self.client.download_artifact(require_artifact_path(job_payload, "podlove"))
-        dote = self.client.download_artifact(require_artifact_path(job_payload, "dote"))
-        vtt = self.client.download_artifact(require_artifact_path(job_payload, "vtt"))
         speakers_path = optional_artifact_path(job_payload, "speakers")
-        speakers = self.client.download_artifact(speakers_path) if speakers_path else None
+        return TranscriptJobArtifacts(
+            job_id=job_id,
+            podlove=self.client.download_artifact(require_artifact_path(job_payload, "podlove")),
+            dote=self.client.download_artifact(require_artifact_path(job_payload, "dote")),
+            vtt=self.client.download_artifact(require_artifact_path(job_payload, "vtt")),
+            speakers=self.client.download_artifact(speakers_path) if speakers_path else None,
+        )
+
+    def store_job_artifacts(
+        self, audio: Audio, artifacts: TranscriptJobArtifacts, *, source_url: str
+    ) -> TranscriptGenerationResult:
         transcript, created = self._get_or_create_transcript(audio=audio)
         self._update_collection(transcript=transcript, audio=audio)
         self._save_artifacts(
-            transcript=transcript, audio=audio, podlove=podlove, dote=dote, vtt=vtt, speakers=speakers
+            transcript=transcript,
+            audio=audio,
+            podlove=artifacts.podlove,
+            dote=artifacts.dote,
+            vtt=artifacts.vtt,
+            speakers=artifacts.speakers,
         )
         return TranscriptGenerationResult(
             transcript=transcript,
             created=created,
-            job_id=job_id,
+            job_id=artifacts.job_id,
             source_url=source_url,
         )
 
+    def complete_audio_job(
+        self,
+        audio: Audio,
+        *,
+        job_id: str,
+        source_url: str,
+        initial_job_payload: dict[str, Any] | None = None,
+    ) -> TranscriptGenerationResult:
+        artifacts = self.fetch_job_artifacts(job_id=job_id, initial_job_payload=initial_job_payload)
+        return self.store_job_artifacts(audio, artifacts, source_url=source_url)
+
     def generate_for_audio(
         self,
         audio: Audio,
@@ -1,30 +1,113 @@
 from __future__ import annotations
 
-from django.shortcuts import get_object_or_404
-from django_tasks import task
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django_tasks import TaskResultStatus, task
+from django_tasks.exceptions import TaskResultDoesNotExist
 
 from .models import TranscriptGeneration
-from .voxhelm import VoxhelmTranscriptService
+from .voxhelm import TERMINAL_JOB_STATES, TranscriptJobArtifacts, VoxhelmError, VoxhelmTranscriptService
+
+TRANSCRIPT_POLL_MAX_DELAY_SECONDS = 60.0
+
+
+def next_poll_delay(*, elapsed_seconds: float, poll_interval_seconds: float) -> float:
+    """Wait a tenth of the time the job has been running, between the poll interval and a minute."""
+    return max(poll_interval_seconds, min(elapsed_seconds / 10, TRANSCRIPT_POLL_MAX_DELAY_SECONDS))
+
+
+def lock_active_generation(generation_id: int) -> TranscriptGeneration | None:
+    return (
+        TranscriptGeneration.objects.select_related("audio", "site")
+        .select_for_update(of=("self",))
+        .filter(pk=generation_id, status__in=TranscriptGeneration.ACTIVE_STATUSES)
+        .first()
+    )
+
+
+def has_pending_poll(generation: TranscriptGeneration) -> bool:
+    """Return whether ``generation.task_result_id`` names a check that has not started yet."""
+    backend = complete_transcript_generation.get_backend()
+    if not generation.task_result_id or not backend.supports_get_result:
+        return False
+    try:
+        task_result = backend.get_result(generation.task_result_id)
+    except TaskResultDoesNotExist:
+        return False
+    return task_result.status == TaskResultStatus.READY
+
+
+def schedule_transcript_poll(generation_id: int, *, delay_seconds: float) -> None:
+    with transaction.atomic():
+        generation = lock_active_generation(generation_id)
+        # A run started by the Voxhelm callback must not start a second chain of checks.
+        if generation is None or has_pending_poll(generation):
+            return
+        run_after = timezone.now() + timedelta(seconds=delay_seconds)
+        task_result = complete_transcript_generation.using(run_after=run_after).enqueue(generation_id)
+        generation.task_result_id = str(task_result.id)
+        generation.save(update_fields=["task_result_id", "updated_at"])
+
+
+def poll_transcript_generation(
+    generation: TranscriptGeneration, service: VoxhelmTranscriptService
+) -> TranscriptJobArtifacts | None:
+    """Check the Voxhelm job of ``generation`` once.
+
+    Return the downloaded artifacts when the job finished, otherwise schedule
+    the next check with backoff and return ``None``.
+    """
+    job_payload = service.client.get_job(generation.voxhelm_job_id)
+    if str(job_payload.get("state", "")) in TERMINAL_JOB_STATES:
+        return service.fetch_job_artifacts(job_id=generation.voxhelm_job_id, initial_job_payload=job_payload)
+
+    now = timezone.now()
+    elapsed_seconds = (now - (generation.started_at or now)).total_seconds()
+    if elapsed_seconds >= service.client.job_timeout_seconds:
+        raise VoxhelmError(f"Timed out waiting for Voxhelm job {generation.voxhelm_job_id}.")
+    schedule_transcript_poll(
+        generation.pk,
+        delay_seconds=next_poll_delay(
+            elapsed_seconds=elapsed_seconds, poll_interval_seconds=service.client.poll_interval_seconds
+        ),
+    )
+    return None
 
 
 @task(backend="cast_transcripts")
 def complete_transcript_generation(generation_id: int) -> None:
-    generation = get_object_or_404(
-        TranscriptGeneration.objects.select_related("audio", "site"),
-        pk=generation_id,
-    )
-    if generation.status == TranscriptGeneration.Status.SUCCEEDED:
-        return
+    # Claimed with a short lock, the Voxhelm requests below run outside of any transaction.
+    with transaction.atomic():
+        generation = lock_active_generation(generation_id)
+        # finished by an earlier poll or the Voxhelm callback
+        if generation is None:
+            return
+        if generation.status == TranscriptGeneration.Status.QUEUED:
+            generation.mark_running()
 
-    generation.mark_running()
     service = VoxhelmTranscriptService(request_or_site=generation.site)
     try:
-        service.complete_audio_job(
-            generation.audio,
-            job_id=generation.voxhelm_job_id,
-            source_url=generation.source_url,
-        )
+        if not complete_transcript_generation.get_backend().supports_defer:
+            # Backends that cannot schedule tasks, like the immediate backend, wait for the job here.
+            artifacts: TranscriptJobArtifacts | None = service.fetch_job_artifacts(job_id=generation.voxhelm_job_id)
+        else:
+            artifacts = poll_transcript_generation(generation, service)
+        if artifacts is None:
+            return
+        # a failed job must not leave half of its artifacts behind
+        with transaction.atomic():
+            # The callback and a scheduled check may both have downloaded the artifacts,
+            # only the first one to take the lock stores them.
+            locked_generation = lock_active_generation(generation_id)
+            if locked_generation is None:
+                return
+            service.store_job_artifacts(generation.audio, artifacts, source_url=generation.source_url)
+            locked_generation.mark_succeeded()
     except Exception as exc:
-        generation.mark_failed(str(exc))
+        with transaction.atomic():
+            locked_generation = lock_active_generation(generation_id)
+            if locked_generation is not None:
+                locked_generation.mark_failed(str(exc))
         raise
-    generation.mark_succeeded()
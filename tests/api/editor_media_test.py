@@ -256,10 +256,9 @@ class TestEditorMediaEndpoints:
     ):
         run_probe = mocker.patch(
             "cast.models.audio.run_media_probe",
-            side_effect=[
-                subprocess.CompletedProcess([], 0, stdout=b"1.000000\n"),
-                subprocess.CompletedProcess([], 0, stdout=b'{"chapters": []}'),
-            ],
+            return_value=subprocess.CompletedProcess(
+                [], 0, stdout=b'{"format": {"duration": "1.000000"}, "chapters": []}'
+            ),
         )
         api_client.force_authenticate(user=superuser)
         url = reverse("cast:api:editor_media_audios")
@@ -268,7 +267,7 @@ class TestEditorMediaEndpoints:
         data = response.json()
         assert data["title"] == "Uploaded audio"
         assert data["m4a"].startswith("/media/")
-        assert run_probe.call_count == 2
+        assert run_probe.call_count == 1
 
         blocked = api_client.post(
             url,
@@ -305,12 +304,9 @@ class TestEditorMediaEndpoints:
         second_upload = SimpleUploadedFile("second.m4a", upload_bytes, content_type="audio/mp4")
         mocker.patch(
             "cast.models.audio.run_media_probe",
-            side_effect=[
-                subprocess.CompletedProcess([], 0, stdout=b"1.000000\n"),
-                subprocess.CompletedProcess([], 0, stdout=b'{"chapters": []}'),
-                subprocess.CompletedProcess([], 0, stdout=b"1.000000\n"),
-                subprocess.CompletedProcess([], 0, stdout=b'{"chapters": []}'),
-            ],
+            return_value=subprocess.CompletedProcess(
+                [], 0, stdout=b'{"format": {"duration": "1.000000"}, "chapters": []}'
+            ),
         )
         mocker.patch.object(
             editor_media.audio_permission_policy, "user_has_permission_for_instance", return_value=False
@@ -381,34 +377,30 @@ class TestEditorMediaEndpoints:
         assert response.status_code == 500
         assert response.json()["code"] == "cleanup_failed"
 
-    def test_audio_upload_chapter_timeout_keeps_saved_audio(self, api_client, superuser, m4a_audio, mocker):
+    def test_audio_upload_reads_chapters_from_the_upload_probe(self, api_client, superuser, m4a_audio, mocker):
+        probe_output = b'{"format": {"duration": "2.000000"}, "chapters": [{"start_time": "1.000000", "tags": {"title": "Intro"}}]}'
         run_probe = mocker.patch(
             "cast.models.audio.run_media_probe",
-            side_effect=[
-                subprocess.CompletedProcess([], 0, stdout=b"1.000000\n"),
-                subprocess.TimeoutExpired(cmd="ffprobe", timeout=1),
-            ],
+            return_value=subprocess.CompletedProcess([], 0, stdout=probe_output),
         )
         api_client.force_authenticate(user=superuser)
         url = reverse("cast:api:editor_media_audios")
 
-        response = api_client.post(
-            url, {"title": "Audio without extracted chapters", "m4a": m4a_audio}, format="multipart"
-        )
+        response = api_client.post(url, {"title": "Audio with chapters", "m4a": m4a_audio}, format="multipart")
 
         assert response.status_code == 201, response.content
         audio = Audio.objects.get(id=response.json()["id"])
-        assert audio.title == "Audio without extracted chapters"
-        assert audio.chaptermarks.count() == 0
-        assert run_probe.call_count == 2
+        assert [chaptermark.title for chaptermark in audio.chaptermarks.all()] == ["Intro"]
+        assert run_probe.call_count == 1
 
     def test_audio_upload_malformed_chapter_marks_keep_saved_audio(self, api_client, superuser, m4a_audio, mocker):
         mocker.patch(
             "cast.models.audio.run_media_probe",
-            side_effect=[
-                subprocess.CompletedProcess([], 0, stdout=b"1.000000\n"),
-                subprocess.CompletedProcess([], 0, stdout=b'{"chapters": [{"start_time": "1.000000", "tags": {}}]}'),
-            ],
+            return_value=subprocess.CompletedProcess(
+                [],
+                0,
+                stdout=b'{"format": {"duration": "1.000000"}, "chapters": [{"start_time": "1.000000", "tags": {}}]}',
+            ),
         )
         api_client.force_authenticate(user=superuser)
         url = reverse("cast:api:editor_media_audios")
@@ -427,10 +419,9 @@ class TestEditorMediaEndpoints:
         budget = mocker.patch("cast.api.editor.media.media_probe_budget", wraps=media_probe.media_probe_budget)
         mocker.patch(
             "cast.models.audio.run_media_probe",
-            side_effect=[
-                subprocess.CompletedProcess([], 0, stdout=b"1.000000\n"),
-                subprocess.CompletedProcess([], 0, stdout=b'{"chapters": []}'),
-            ],
+            return_value=subprocess.CompletedProcess(
+                [], 0, stdout=b'{"format": {"duration": "1.000000"}, "chapters": []}'
+            ),
         )
         api_client.force_authenticate(user=superuser)
 
@@ -7,9 +7,10 @@ import pytest
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.request import Request
-from wagtail.models import PageViewRestriction
+from wagtail.models import Page, PageViewRestriction
 
 from cast import modal_facet_counts
+from cast.api import views
 from cast.api.serializers import AudioPodloveSerializer
 from cast.api.views import (
     AudioPodloveDetailView,
@@ -19,6 +20,7 @@ from cast.api.views import (
     ThemeListView,
 )
 from cast.devdata import create_transcript, generate_blog_with_media
+from cast.player_cache import PlayerPayloadVersion
 from cast.models import Audio, Contributor, EpisodeContributor, PostCategory, TranscriptSpeakerMapping
 
 from tests.factories import PostFactory, UserFactory
@@ -252,14 +254,68 @@ class TestPodcastAudio:
 
         class MockRequest:
             query_params: dict = {}
+            headers: dict = {}
 
         mocker.patch("cast.api.views.authorize_audio_access")
         mocker.patch("cast.api.views.AudioPodloveDetailView.get_object")
         mocker.patch("cast.api.views.AudioPodloveDetailView.get_serializer")
+        mocker.patch(
+            "cast.api.views.get_podlove_episode_version",
+            return_value=PlayerPayloadVersion(cache_key="podlove", etag='"podlove"'),
+        )
         podlove_view = AudioPodloveDetailView()
         response = podlove_view.retrieve(MockRequest())
         assert response.status_code == 200
 
+    def test_podlove_detail_is_revalidated_with_an_etag(self, api_client, episode):
+        audio = episode.podcast_audio
+        url = reverse("cast:api:audio_podlove_detail", kwargs={"pk": audio.pk, "post_id": episode.pk})
+        first = api_client.get(url, format="json")
+        assert first["Cache-Control"] == "public, max-age=3600, stale-while-revalidate=86400"
+
+        not_modified = api_client.get(url, format="json", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert not_modified.status_code == 304
+
+        episode.save_revision().publish()
+        republished = api_client.get(url, format="json", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert republished.status_code == 200
+
+        audio.title = "Renamed"
+        audio.save()
+        renamed = api_client.get(url, format="json", HTTP_IF_NONE_MATCH=republished["ETag"])
+        assert renamed.status_code == 200
+        assert renamed.json()["title"] == "Renamed"
+
+    def test_podlove_detail_etag_follows_page_and_image_rows(self, api_client, episode, image):
+        """Changes made without signals, like those seen by another worker, change the ETag."""
+        audio = episode.podcast_audio
+        url = reverse("cast:api:audio_podlove_detail", kwargs={"pk": audio.pk, "post_id": episode.pk})
+        first = api_client.get(url, format="json")
+
+        Page.objects.filter(pk=episode.blog.pk).update(title="Renamed Podcast", last_published_at=timezone.now())
+        renamed = api_client.get(url, format="json", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert renamed.status_code == 200
+        assert renamed.json()["show"]["title"] == "Renamed Podcast"
+
+        type(episode).objects.filter(pk=episode.pk).update(cover_image=image)
+        with_cover = api_client.get(url, format="json", HTTP_IF_NONE_MATCH=renamed["ETag"])
+        assert with_cover.status_code == 200
+
+        type(image).objects.filter(pk=image.pk).update(focal_point_x=0, focal_point_y=0)
+        refocused = api_client.get(url, format="json", HTTP_IF_NONE_MATCH=with_cover["ETag"])
+        assert refocused.status_code == 200
+
+    def test_podlove_detail_payload_is_cached(self, api_client, episode, mocker, settings):
+        settings.CAST_PLAYER_CACHE_TIMEOUT = 60
+        to_representation = mocker.spy(AudioPodloveSerializer, "to_representation")
+        url = reverse("cast:api:audio_podlove_detail", kwargs={"pk": episode.podcast_audio.pk, "post_id": episode.pk})
+
+        first = api_client.get(url, format="json")
+        second = api_client.get(url, format="json")
+
+        assert to_representation.call_count == 1
+        assert first.json() == second.json()
+
     def test_podlove_detail_malformed_episode_id_is_rejected_even_with_valid_post_anchor(self, api_client, episode):
         """Every supplied anchor must authorize: a malformed ``episode_id`` is a 404."""
         audio = episode.podcast_audio
@@ -396,6 +452,35 @@ class TestPodcastAudio:
         fonts = config["theme"]["fonts"]
         assert fonts["regular"]["family"][0] == "CustomSans"
 
+    def test_podlove_player_config_etag(self, api_client, settings):
+        url = reverse("cast:api:player_config")
+        first = api_client.get(url, format="json")
+        assert first["Cache-Control"] == "public, max-age=3600"
+        assert "Cookie" in first["Vary"]
+
+        not_modified = api_client.get(url, format="json", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert not_modified.status_code == 304
+        assert not_modified["ETag"] == first["ETag"]
+
+        dark = api_client.get(f"{url}?color_scheme=dark", format="json", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert dark.status_code == 200
+        settings.CAST_PODLOVE_PLAYER_THEMES = {"default": {"tokens": {"brand": "#123456"}}}
+        changed = api_client.get(url, format="json", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert changed.status_code == 200
+        assert changed.json()["theme"]["tokens"]["brand"] == "#123456"
+
+    def test_podlove_player_config_is_cached(self, api_client, mocker, settings):
+        settings.CAST_PLAYER_CACHE_TIMEOUT = 60
+        settings.CAST_PODLOVE_PLAYER_THEMES = {"default": {"tokens": {"brand": "#654321"}}}
+        build = mocker.spy(views, "build_podlove_player_config")
+        url = reverse("cast:api:player_config")
+
+        first = api_client.get(url, format="json")
+        second = api_client.get(url, format="json")
+
+        assert build.call_count == 1
+        assert first.json() == second.json()
+
     def test_podlove_player_config_default_override(self, api_client, mocker, settings):
         url = reverse("cast:api:player_config")
         mocker.patch("cast.api.views.get_template_base_dir", return_value="plain")
@@ -2,7 +2,9 @@ from datetime import timedelta
 from uuid import uuid4
 
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
 
+from cast import media_probe
 from cast.models.audio import Audio, ChapterMark, sync_chapter_marks
 
 
@@ -49,26 +51,116 @@ class TestAudioModel:
             }
         ) == [{"start": "2.000000", "title": "Chapter"}]
 
-    def test_audio_duration(self, audio):
-        duration = audio._get_audio_duration(audio.m4a.path)
-        assert duration in (timedelta(microseconds=746667), timedelta(microseconds=700000))
+    def test_audio_probe_metadata(self, audio):
+        metadata = Audio.metadata_from_probe(Audio._probe_audio_file(audio.m4a.path))
+        assert metadata["duration"] in (0.746667, 0.7)
+        assert metadata["codec"] == "aac"
+        assert metadata["channels"] >= 1
+        assert metadata["size"] == audio.m4a.size
+        assert metadata["chapters"] == []
 
-    def test_audio_duration_no_match(self, mocker):
+    def test_audio_probe_invalid_output(self, mocker):
         mock_run = mocker.patch("cast.models.audio.subprocess.run", return_value=mocker.Mock(stdout=b"foobar"))
         with pytest.raises(ValueError):
-            Audio._get_audio_duration("https://example.com/test.m4a")
+            Audio._probe_audio_file("https://example.com/test.m4a")
         call_kwargs = mock_run.call_args
         assert call_kwargs.kwargs["check"] is True
         assert call_kwargs.kwargs["timeout"] == 30
         argv = call_kwargs.args[0]
         assert argv[0] == "ffprobe"
+        assert {"-show_format", "-show_streams", "-show_chapters"} <= set(argv)
         assert "https://example.com/test.m4a" in argv
 
-    def test_audio_create_duration(self, audio):
-        duration = "00:01:01.00"
-        audio._get_audio_duration = lambda x: duration
+        mock_run.return_value = mocker.Mock(stdout=b"[]")
+        with pytest.raises(ValueError):
+            Audio._probe_audio_file("https://example.com/test.m4a")
+
+    def test_metadata_from_probe(self):
+        probe_data = {
+            "format": {"duration": "61.500000", "bit_rate": "128000", "size": "983040"},
+            "streams": [
+                {"codec_type": "video", "codec_name": "mjpeg"},
+                {"codec_type": "audio", "codec_name": "mp3", "channels": 2, "sample_rate": "44100"},
+            ],
+            "chapters": [{"start_time": "0.000000", "tags": {"title": "Intro"}}],
+        }
+        assert Audio.metadata_from_probe(probe_data) == {
+            "duration": 61.5,
+            "bit_rate": 128000,
+            "codec": "mp3",
+            "channels": 2,
+            "sample_rate": 44100,
+            "size": 983040,
+            "chapters": [{"start": "0.000000", "title": "Intro"}],
+        }
+        assert Audio.metadata_from_probe({"format": [], "streams": {}})["duration"] is None
+        with pytest.raises(ValueError, match="Could not parse duration"):
+            Audio.metadata_from_probe({"format": {"duration": "N/A"}})
+
+    def test_audio_create_duration(self, audio, mocker):
+        mocker.patch("cast.models.audio.Audio._probe_audio_file", return_value={"format": {"duration": "61.000000"}})
+        audio.duration, audio.data = None, {}
+        audio.create_duration()
+        assert audio.duration == timedelta(seconds=61)
+        assert audio.data["probe"]["m4a"]["file"] == audio.m4a.name
+
+    def test_audio_create_duration_skips_formats_without_duration(self, audio, mocker):
+        mocker.patch(
+            "cast.models.audio.Audio.uploaded_audio_files",
+            [("m4a", audio.m4a), ("mp3", audio.m4a)],
+        )
+        audio.duration, audio.data = None, {"probe": {"m4a": {"file": audio.m4a.name, "duration": None}}}
+        mocker.patch("cast.models.audio.Audio._probe_audio_file", return_value={"format": {"duration": "3.000000"}})
         audio.create_duration()
-        assert audio.duration == duration
+        assert audio.duration == timedelta(seconds=3)
+
+    def test_audio_chaptermarks_probed_without_recorded_metadata(self, audio):
+        audio.data = {}
+        assert audio.get_chaptermark_data_from_file("m4a") == []
+
+    def test_audio_create_duration_probes_each_file_once(self, audio, mocker):
+        probe = mocker.patch(
+            "cast.models.audio.Audio._probe_audio_file", return_value={"format": {"duration": "1.000000"}}
+        )
+        audio.mp3 = SimpleUploadedFile("test.mp3", b"ID3 audio", content_type="audio/mpeg")
+        audio.duration, audio.data = None, {}
+        audio.save()
+        audio.save()
+
+        assert probe.call_count == 2
+        assert set(audio.data["probe"]) == {"m4a", "mp3"}
+
+        # only a new upload is probed once the duration is known
+        audio.opus = SimpleUploadedFile("test.opus", b"OggS audio", content_type="audio/ogg")
+        audio.save()
+
+        assert probe.call_args.args[0] == audio.opus.path
+        assert set(audio.data["probe"]) == {"m4a", "mp3", "opus"}
+        audio.mp3.delete(save=False)
+        audio.opus.delete(save=False)
+
+    def test_audio_same_name_replacement_is_probed_again(self, audio, mocker):
+        probe = mocker.patch(
+            "cast.models.audio.Audio._probe_audio_file", return_value={"format": {"duration": "1.000000", "size": "9"}}
+        )
+        audio.mp3 = SimpleUploadedFile("test.mp3", b"ID3 audio", content_type="audio/mpeg")
+        audio.duration, audio.data = None, {}
+        audio.save()
+        mp3_name = audio.mp3.name
+
+        # an overwriting storage keeps the name of the replaced file
+        storage = audio.mp3.storage
+        mocker.patch.object(storage, "get_available_name", side_effect=lambda name, max_length=None: name)
+        mocker.patch.object(storage, "_save", side_effect=lambda name, content: name)
+        probe.return_value = {"format": {"duration": "1.000000", "size": "12"}}
+        audio.mp3 = SimpleUploadedFile(mp3_name, b"ID3 replaced", content_type="audio/mpeg")
+        audio.save()
+
+        assert audio.mp3.name == mp3_name
+        assert probe.call_args.args[0] == audio.mp3.path
+        assert audio.data["probe"]["mp3"]["size"] == 12
+        mocker.stopall()
+        audio.mp3.delete(save=False)
 
     def test_audio_create_duration_no_duration(self, audio, mocker):
         class Field:
@@ -76,20 +168,20 @@ class TestAudioModel:
             path = "/tmp/to.mp3"
 
         field = Field()
-        get_audio_duration = mocker.patch("cast.models.audio.Audio._get_audio_duration", return_value="duration")
+        probe = mocker.patch("cast.models.audio.Audio._probe_audio_file", return_value={})
         mocker.patch("cast.models.audio.Audio.uploaded_audio_files", [("mp3", field)])
         audio.create_duration()
-        get_audio_duration.assert_called_once_with(field.url)
+        probe.assert_called_once_with(field.url)
 
     def test_audio_create_duration_no_file_field(self, audio, mocker):
         class Field:  # not a FileField
             foo = "bar"
 
         field = Field()
-        get_audio_duration = mocker.patch("cast.models.audio.Audio._get_audio_duration", return_value="duration")
+        probe = mocker.patch("cast.models.audio.Audio._probe_audio_file", return_value={})
         mocker.patch("cast.models.audio.Audio.uploaded_audio_files", [("mp3", field)])
         audio.create_duration()
-        assert get_audio_duration.call_count == 0
+        assert probe.call_count == 0
 
     def test_audio_duration_str_none(self, audio):
         """duration_str returns empty string when duration is NULL."""
@@ -117,7 +209,7 @@ class TestAudioModel:
         run = mocker.patch("cast.models.audio.subprocess.run", return_value=RunReturn())
         mocker.patch("cast.models.audio.Audio.clean_ffprobe_chaptermarks")
         _ = audio.get_chaptermark_data_from_file("mp3")
-        assert field.url == run.call_args[0][0][2]
+        assert field.url == run.call_args[0][0][-1]
 
     def test_get_episode_url_from_audio(self, episode):
         audio = episode.podcast_audio
@@ -256,7 +348,11 @@ class TestAudioModel:
 
     def test_save_populates_duration_and_file_size_metadata(self, user, m4a_audio, mocker):
         expected_duration = timedelta(seconds=2, microseconds=500000)
-        mocker.patch("cast.models.audio.Audio._get_audio_duration", return_value=expected_duration)
+        probe_data = {
+            "format": {"duration": "2.500000", "bit_rate": "64000", "size": str(m4a_audio.size)},
+            "streams": [{"codec_type": "audio", "codec_name": "aac", "channels": 1, "sample_rate": "44100"}],
+        }
+        mocker.patch("cast.models.audio.Audio._probe_audio_file", return_value=probe_data)
 
         audio = Audio(user=user, m4a=m4a_audio, title="duration-and-size")
         audio.save()
@@ -264,6 +360,18 @@ class TestAudioModel:
 
         assert audio.duration == expected_duration
         assert audio.data["size"]["m4a"] == m4a_audio.size
+        assert audio.data["probe"]["m4a"] == {
+            "file": audio.m4a.name,
+            "duration": 2.5,
+            "bit_rate": 64000,
+            "codec": "aac",
+            "channels": 1,
+            "sample_rate": 44100,
+            "size": m4a_audio.size,
+            "chapters": [],
+        }
+        # the chapters recorded by the probe are reused
+        assert audio.get_chaptermark_data_from_file("m4a") == []
 
     def test_save_passes_using_to_follow_up_update_save(self, audio, mocker):
         base_save = mocker.patch("cast.models.audio.TimeStampedModel.save")
@@ -281,7 +389,7 @@ class TestAudioModel:
     def test_save_skips_enrichment_save_when_nothing_changes(self, audio, mocker):
         base_save = mocker.patch("cast.models.audio.TimeStampedModel.save")
         audio.duration = timedelta(seconds=1)
-        audio.data = {"size": {"m4a": audio.m4a.size}}
+        audio.data = {"size": {"m4a": audio.m4a.size}, "probe": {"m4a": {"file": audio.m4a.name, "size": None}}}
 
         audio.save()
 
@@ -372,3 +480,17 @@ def test_sync_chapter_marks_update_changed_chaptermarks(audio):
     cm2.full_clean()
     actual_to_add, actual_to_update, actual_to_remove = sync_chapter_marks([cm1], [cm2])
     assert len(actual_to_update) == 1
+
+
+def test_probe_concurrently_shares_the_probe_budget():
+    def probe(name):
+        if name == "broken":
+            raise ValueError(name)
+        return name, media_probe.media_probe_budget_active()
+
+    with media_probe.media_probe_budget(5):
+        results = media_probe.probe_concurrently(probe, {"m4a": "a", "mp3": "b"})
+        with pytest.raises(ValueError, match="broken"):
+            media_probe.probe_concurrently(probe, {"m4a": "a", "mp3": "broken"})
+
+    assert results == {"m4a": ("a", True), "mp3": ("b", True)}
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from cast.benchmarks import fetch, get_benchmark_targets, run_benchmarks, seed_benchmark_site
+from cast.models import Episode, Post
+
+
+@pytest.fixture(autouse=True)
+def clear_feed_cache():
+    # The feed URLs are wrapped in cache_page.
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def benchmark_site():
+    return seed_benchmark_site(number_of_posts=2)
+
+
+@pytest.mark.django_db
+def test_seed_benchmark_site(benchmark_site):
+    assert Post.objects.child_of(benchmark_site.blog).count() == 2
+    episodes = Episode.objects.child_of(benchmark_site.podcast)
+    assert episodes.count() == 2
+    assert episodes.first().podcast_audio.transcript is not None
+
+
+@pytest.mark.django_db
+def test_benchmark_targets_cover_pages_feeds_and_api(benchmark_site):
+    names = {target.name for target in get_benchmark_targets(benchmark_site)}
+
+    assert {"blog_index", "post_detail", "latest_entries_feed", "podcast_feed_atom_mp3"} <= names
+    podcast_feeds = {name for name in names if name.startswith("podcast_feed_")}
+    assert podcast_feeds == {f"podcast_feed_{kind}_{fmt}" for kind in ("rss", "atom") for fmt in ("m4a", "mp3")}
+
+
+@pytest.mark.django_db
+def test_benchmark_targets_cover_every_audio_format_with_files(benchmark_site):
+    audio = Episode.objects.child_of(benchmark_site.podcast).first().podcast_audio
+    audio.opus = audio.mp3.name
+    audio.save(duration=False, cache_file_sizes=False)
+
+    names = {target.name for target in get_benchmark_targets(benchmark_site)}
+
+    assert {"podcast_feed_rss_opus", "podcast_feed_atom_opus"} <= names
+    assert not any(name.endswith("_oga") for name in names)
+    assert {"wagtail_pages_api_listing", "wagtail_pages_api_detail"} <= names
+    assert not any("archive" in name for name in names)
+
+
+@pytest.mark.django_db
+def test_benchmark_targets_include_feed_archives_when_paged(benchmark_site, settings):
+    settings.CAST_PODCAST_FEED_PAGE_SIZE = 1
+
+    names = {target.name for target in get_benchmark_targets(benchmark_site)}
+
+    assert "podcast_feed_rss_archive_m4a" in names
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+def test_run_benchmarks_reports_every_target(benchmark_site):
+    report = run_benchmarks(benchmark_site, repeat=1)
+
+    assert report["parameters"]["number_of_posts"] == 2
+    results = {result["name"]: result for result in report["results"]}
+    assert {result["status_code"] for result in results.values()} == {200}
+    assert results["latest_entries_feed"]["cold"]["queries"] > results["latest_entries_feed"]["warm"]["queries"]
+    assert results["blog_index"]["cold"]["peak_memory_kib"] > 0
+    json.dumps(report)
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+def test_benchmark_repository_command_writes_json(mocker, tmp_path):
+    create_test_db = mocker.patch.object(connection.creation, "create_test_db", return_value="old")
+    destroy_test_db = mocker.patch.object(connection.creation, "destroy_test_db")
+    output = tmp_path / "benchmark.json"
+
+    call_command("benchmark_repository", posts=[1], repeat=1, output=output)
+
+    [report] = json.loads(output.read_text())
+    assert report["parameters"]["number_of_posts"] == 1
+    assert Post.objects.count() == 0
+    create_test_db.assert_called_once()
+    destroy_test_db.assert_called_once_with("old", verbosity=0)
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+def test_benchmark_repository_command_prints_json(mocker, capsys):
+    mocker.patch.object(connection.creation, "create_test_db", return_value="old")
+    mocker.patch.object(connection.creation, "destroy_test_db")
+    mocker.patch("cast.management.commands.benchmark_repository.seed_benchmark_site")
+    mocker.patch("cast.management.commands.benchmark_repository.run_benchmarks", return_value={"results": []})
+
+    call_command("benchmark_repository")
+
+    assert json.loads(capsys.readouterr().out) == [{"results": []}]
+
+
+@pytest.mark.django_db
+def test_fetch_consumes_streaming_responses(blog, settings):
+    settings.CAST_STREAMING_FEEDS = True
+
+    response = fetch(Client(), reverse("cast:latest_entries_feed", kwargs={"slug": blog.slug}))
+
+    assert response.streaming
+    assert response.status_code == 200
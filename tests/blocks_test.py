@@ -268,6 +268,14 @@ def test_get_srcset_images_for_slots_fetched_renditions_contain_all_filter_strin
     assert images_for_slot[slot].src["jpeg"] == "https://example.com/test.jpg"
 
 
+def test_get_srcset_images_for_slots_uses_original_while_renditions_are_missing():
+    [slot] = IMAGE_TYPE_TO_SLOTS["regular"]
+    image = cast(AbstractImage, StubBigImage())
+    images_for_slot = get_srcset_images_for_slots(image, "regular", renditions={})
+    assert images_for_slot[slot].src["jpeg"] == "https://example.com/test.jpg"
+    assert images_for_slot[slot].srcset["jpeg"] == "https://example.com/test.jpg 6000w"
+
+
 @pytest.mark.django_db
 def test_gallery_block_get_context_parent_context_none():
     """Just make sure parent context is set to {} if it is None."""
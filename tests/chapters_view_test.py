@@ -5,6 +5,7 @@ from django.urls import reverse
 from wagtail.models import PageViewRestriction
 
 from cast.models import ChapterMark
+from cast.player import build_chapters
 
 
 @pytest.mark.django_db
@@ -68,3 +69,63 @@ class TestPodcastChaptersJsonView:
         assert response.status_code == 200
         assert response["Content-Type"] == "application/json+chapters"
         assert response.json() == {"version": "1.2.0", "chapters": []}
+
+    def test_public_chapters_are_revalidated_with_an_etag(self, client, episode):
+        ChapterMark.objects.create(audio=episode.podcast_audio, start=time(0, 1, 0), title="Intro")
+        url = self._url(episode.podcast_audio, episode_id=episode.pk)
+
+        first = client.get(url)
+        assert first["Cache-Control"] == "public, max-age=3600, stale-while-revalidate=86400"
+        not_modified = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert not_modified.status_code == 304
+        assert not_modified["ETag"] == first["ETag"]
+
+    def test_syncing_chaptermarks_changes_the_etag(self, client, episode):
+        audio = episode.podcast_audio
+        ChapterMark.objects.create(audio=audio, start=time(0, 1, 0), title="Intro")
+        url = self._url(audio, episode_id=episode.pk)
+        first = client.get(url)
+
+        ChapterMark.objects.sync_chaptermarks(audio, [ChapterMark(audio=audio, start=time(0, 1, 0), title="Welcome")])
+        response = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert response.status_code == 200
+        assert response["ETag"] != first["ETag"]
+        assert response.json()["chapters"] == [{"startTime": 60, "title": "Welcome"}]
+
+    def test_chapters_updated_without_signals_change_the_etag(self, client, episode):
+        audio = episode.podcast_audio
+        ChapterMark.objects.create(audio=audio, start=time(0, 1, 0), title="Intro")
+        url = self._url(audio, episode_id=episode.pk)
+        first = client.get(url)
+
+        # a queryset update sends no post_save, like an edit made by another worker
+        ChapterMark.objects.filter(audio=audio).update(title="Welcome")
+        response = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert response.status_code == 200
+        assert response["ETag"] != first["ETag"]
+        assert response.json()["chapters"] == [{"startTime": 60, "title": "Welcome"}]
+
+    def test_cached_chapters_are_not_rebuilt(self, client, episode, settings, mocker):
+        settings.CAST_PLAYER_CACHE_TIMEOUT = 60
+        ChapterMark.objects.create(audio=episode.podcast_audio, start=time(0, 1, 0), title="Intro")
+        build = mocker.patch("cast.views.chapters.build_chapters", wraps=build_chapters)
+        url = self._url(episode.podcast_audio, episode_id=episode.pk)
+
+        first = client.get(url)
+        second = client.get(url)
+
+        assert build.call_count == 1
+        assert first.content == second.content
+
+    def test_chapters_for_an_editor_preview_are_private(self, client, episode, admin_user):
+        ChapterMark.objects.create(audio=episode.podcast_audio, start=time(0, 1, 0), title="Intro")
+        episode.unpublish()
+        client.force_login(admin_user)
+
+        response = client.get(self._url(episode.podcast_audio, episode_id=episode.pk))
+
+        assert response.status_code == 200
+        assert response["Cache-Control"] == "private, no-store"
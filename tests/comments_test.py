@@ -163,6 +163,17 @@ class TestCommentModeration:
             assert self.comment.is_removed
             assert not self.comment.is_public
 
+    @pytest.mark.django_db
+    def test_default_spamfilter_from_database(self):
+        from cast.models import SpamFilter
+        from cast.models.moderation import NaiveBayes
+
+        SpamFilter.objects.create(name="default", model=NaiveBayes().fit([("spam", "some comment")]))
+        with patch("cast.comments.receivers.default_moderator", new=Moderator(self.stub_class)):
+            signals.comment_will_be_posted.send(sender=self.comment_class, comment=self.comment, request=self.request)
+            assert self.comment.is_removed
+            assert not self.comment.is_public
+
     def test_moderated_comment_is_not_marked_is_removed(self):
         with patch(
             "cast.comments.receivers.default_moderator", new=Moderator(self.stub_class, spamfilter=self.predict_ham)
@@ -0,0 +1,179 @@
+from datetime import time
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from django.http import HttpResponse
+
+from cast.devdata import create_transcript
+from cast.feeds import get_feed_validators
+from cast.models import ChapterMark
+from cast.models.repository import FeedContext
+from cast.views.feed import with_feed_validators
+from tests.factories import PostFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_feed_cache():
+    # The feed URLs are wrapped in cache_page.
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def spy_feed_builder(mocker):
+    return mocker.spy(FeedContext, "data_for_feed_cachable")
+
+
+def blog_feed_url(blog):
+    return reverse("cast:latest_entries_feed", kwargs={"slug": blog.slug})
+
+
+def podcast_feed_url(podcast):
+    return reverse("cast:podcast_feed_rss", kwargs={"slug": podcast.slug, "audio_format": "m4a"})
+
+
+@pytest.mark.django_db
+def test_feed_response_has_validators(client, blog):
+    response = client.get(blog_feed_url(blog))
+
+    assert response.status_code == 200
+    assert response["ETag"].startswith('"')
+    assert "Last-Modified" in response
+
+
+@pytest.mark.django_db
+def test_unchanged_feed_returns_not_modified_before_building_repository(
+    client, blog, spy_feed_builder, django_assert_max_num_queries
+):
+    etag = client.get(blog_feed_url(blog))["ETag"]
+
+    with django_assert_max_num_queries(5):
+        response = client.get(f"{blog_feed_url(blog)}?poll=1", headers={"if-none-match": etag})
+
+    assert response.status_code == 304
+    assert spy_feed_builder.call_count == 1
+
+
+@pytest.mark.django_db
+def test_publishing_a_post_changes_the_etag(client, blog):
+    etag = client.get(blog_feed_url(blog))["ETag"]
+
+    post = PostFactory(owner=blog.owner, parent=blog, title="new post", slug="new-post")
+    post.save_revision().publish()
+    response = client.get(f"{blog_feed_url(blog)}?poll=1", headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_podcast_feed_honors_if_modified_since(client, episode):
+    podcast = episode.blog
+    last_modified = client.get(podcast_feed_url(podcast))["Last-Modified"]
+
+    response = client.get(podcast_feed_url(podcast), headers={"if-modified-since": last_modified})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_editing_episode_audio_changes_the_etag(client, episode):
+    podcast = episode.blog
+    etag = client.get(podcast_feed_url(podcast))["ETag"]
+
+    episode.podcast_audio.title = "new audio title"
+    episode.podcast_audio.save()
+    response = client.get(f"{podcast_feed_url(podcast)}?poll=1", headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_adding_a_transcript_changes_the_podcast_etag(client, episode):
+    podcast = episode.blog
+    etag = client.get(podcast_feed_url(podcast))["ETag"]
+
+    create_transcript(audio=episode.podcast_audio)
+    response = client.get(f"{podcast_feed_url(podcast)}?poll=1", headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert "podcast:transcript" in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_editing_chapters_changes_the_podcast_etag(client, episode):
+    podcast = episode.blog
+    ChapterMark.objects.create(audio=episode.podcast_audio, start=time(0, 1, 0), title="Intro")
+    etag = client.get(podcast_feed_url(podcast))["ETag"]
+
+    # a queryset update sends no signal
+    ChapterMark.objects.filter(audio=episode.podcast_audio).update(title="Welcome")
+    response = client.get(f"{podcast_feed_url(podcast)}?poll=1", headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_saving_an_image_changes_the_etag(client, blog, image):
+    etag = client.get(blog_feed_url(blog))["ETag"]
+
+    image.title = "renamed"
+    image.save()
+    response = client.get(f"{blog_feed_url(blog)}?poll=1", headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_feeds_of_one_blog_have_different_etags(client, blog):
+    rss = client.get(blog_feed_url(blog))
+    atom = client.get(reverse("cast:latest_entries_atom_feed", kwargs={"slug": blog.slug}))
+    assert rss["ETag"] != atom["ETag"]
+
+
+@pytest.mark.django_db
+def test_unknown_feed_is_not_found(client):
+    response = client.get(
+        reverse("cast:latest_entries_feed", kwargs={"slug": "does-not-exist"}), headers={"if-none-match": "*"}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_validators_are_computed_once_per_request(rf, blog, django_assert_num_queries):
+    post = PostFactory(owner=blog.owner, parent=blog, title="new post", slug="new-post")
+    post.save_revision().publish()
+    request = rf.get(blog_feed_url(blog))
+    validators = get_feed_validators(request, slug=blog.slug, is_podcast=False)
+
+    with django_assert_num_queries(0):
+        assert get_feed_validators(request, slug=blog.slug, is_podcast=False) is validators
+    post.refresh_from_db()
+    assert validators.last_modified == post.last_published_at
+
+
+@pytest.mark.django_db
+def test_cached_response_keeps_its_validators(client, blog):
+    first = client.get(blog_feed_url(blog))
+
+    post = PostFactory(owner=blog.owner, parent=blog, title="new post", slug="new-post")
+    post.save_revision().publish()
+    cached = client.get(blog_feed_url(blog))
+
+    # The body is served from cache_page, so it must not claim the new validators.
+    assert cached.content == first.content
+    assert cached["ETag"] == first["ETag"]
+
+
+@pytest.mark.django_db
+def test_validators_are_not_set_for_unknown_blogs(rf):
+    view = with_feed_validators(lambda request, **kwargs: HttpResponse(), is_podcast=False)
+    response = view(rf.get("/"), slug="does-not-exist")
+    assert not response.has_header("ETag")
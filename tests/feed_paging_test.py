@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone
+from xml.etree import ElementTree
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from cast import appsettings
+from cast.feeds import FEED_HISTORY_NAMESPACE
+from cast.models import Episode
+from cast.models.repository import paginate_feed_queryset
+from tests.factories import EpisodeFactory
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+@pytest.fixture(autouse=True)
+def clear_feed_cache():
+    # The feed URLs are wrapped in cache_page.
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def page_size(settings):
+    settings.CAST_PODCAST_FEED_PAGE_SIZE = 2
+    return 2
+
+
+def add_episode(podcast, audio, number):
+    return EpisodeFactory(
+        owner=podcast.owner,
+        parent=podcast,
+        title=f"episode {number}",
+        slug=f"episode-{number}",
+        podcast_audio=audio,
+        visible_date=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(days=number),
+    )
+
+
+@pytest.fixture
+def episodes(podcast, audio):
+    return [add_episode(podcast, audio, number) for number in range(1, 6)]
+
+
+def feed_url(podcast, archive_page=None, kind="rss"):
+    kwargs = {"slug": podcast.slug, "audio_format": "m4a"}
+    if archive_page is None:
+        return reverse(f"cast:podcast_feed_{kind}", kwargs=kwargs)
+    return reverse(f"cast:podcast_feed_{kind}_archive", kwargs=kwargs | {"archive_page": archive_page})
+
+
+def get_rss(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return ElementTree.fromstring(response.content).find("channel")
+
+
+def titles(channel):
+    return [item.findtext("title") for item in channel.findall("item")]
+
+
+def links(channel):
+    return {link.get("rel"): link.get("href") for link in channel.findall(f"{ATOM}link") if link.get("rel") != "self"}
+
+
+@pytest.mark.django_db
+def test_paginate_feed_queryset(podcast, episodes):
+    queryset = Episode.objects.descendant_of(podcast).order_by("-visible_date")
+
+    assert [e.title for e in paginate_feed_queryset(queryset, page_size=2)] == ["episode 5", "episode 4"]
+    assert [e.title for e in paginate_feed_queryset(queryset, page_size=2, archive_page=1)] == [
+        "episode 2",
+        "episode 1",
+    ]
+
+
+@pytest.mark.django_db
+def test_feed_is_not_paged_by_default(client, podcast, episodes):
+    response = client.get(feed_url(podcast))
+
+    assert FEED_HISTORY_NAMESPACE not in response.content.decode("utf-8")
+    assert len(ElementTree.fromstring(response.content).find("channel").findall("item")) == 5
+    assert client.get(feed_url(podcast, archive_page=1)).status_code == 404
+
+
+@pytest.mark.django_db
+def test_subscription_document_holds_newest_episodes(client, podcast, episodes, page_size):
+    channel = get_rss(client, feed_url(podcast))
+
+    assert titles(channel) == ["episode 5", "episode 4"]
+    newest_archive = f"http://testserver{feed_url(podcast, archive_page=2)}"
+    assert links(channel) == {"next": newest_archive, "prev-archive": newest_archive}
+    assert channel.find(f"{{{FEED_HISTORY_NAMESPACE}}}archive") is None
+
+
+@pytest.mark.django_db
+def test_archive_pages_link_to_each_other(client, podcast, episodes, page_size):
+    oldest = get_rss(client, feed_url(podcast, archive_page=1))
+    newest = get_rss(client, feed_url(podcast, archive_page=2))
+
+    assert titles(oldest) == ["episode 2", "episode 1"]
+    assert titles(newest) == ["episode 4", "episode 3"]
+    assert links(oldest) == {
+        "current": f"http://testserver{feed_url(podcast)}",
+        "next-archive": f"http://testserver{feed_url(podcast, archive_page=2)}",
+    }
+    assert links(newest)["prev-archive"] == f"http://testserver{feed_url(podcast, archive_page=1)}"
+    assert "next-archive" not in links(newest)
+    assert oldest.find(f"{{{FEED_HISTORY_NAMESPACE}}}archive") is not None
+
+
+@pytest.mark.django_db
+def test_archive_pages_are_stable(client, podcast, audio, episodes, page_size):
+    before = titles(get_rss(client, feed_url(podcast, archive_page=1)))
+    add_episode(podcast, audio, 6)
+    cache.clear()
+
+    assert titles(get_rss(client, feed_url(podcast, archive_page=1))) == before
+    assert titles(get_rss(client, feed_url(podcast, archive_page=3))) == ["episode 6", "episode 5"]
+
+
+@pytest.mark.django_db
+def test_incomplete_archive_page_is_not_found(client, podcast, episodes, page_size):
+    assert client.get(feed_url(podcast, archive_page=3)).status_code == 404
+    assert client.get(feed_url(podcast, archive_page=0)).status_code == 404
+
+
+@pytest.mark.django_db
+def test_atom_feed_is_paged(client, podcast, episodes, page_size):
+    response = client.get(feed_url(podcast, archive_page=1, kind="atom"))
+
+    root = ElementTree.fromstring(response.content)
+    assert [entry.findtext(f"{ATOM}title") for entry in root.findall(f"{ATOM}entry")] == ["episode 2", "episode 1"]
+    rels = {link.get("rel"): link.get("href") for link in root.findall(f"{ATOM}link")}
+    assert rels["current"] == f"http://testserver{feed_url(podcast, kind='atom')}"
+
+
+@pytest.mark.django_db
+def test_paged_feed_from_django_models(client, podcast, episodes, page_size, monkeypatch):
+    monkeypatch.setattr(appsettings, "CAST_REPOSITORY", "django", raising=False)
+
+    assert titles(get_rss(client, feed_url(podcast))) == ["episode 5", "episode 4"]
+
+
+@pytest.mark.django_db
+def test_short_feed_has_no_archives(client, podcast, audio, page_size):
+    add_episode(podcast, audio, 1)
+
+    channel = get_rss(client, feed_url(podcast))
+
+    assert titles(channel) == ["episode 1"]
+    assert links(channel) == {}
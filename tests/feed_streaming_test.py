@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from cast.feeds import LatestEntriesFeed
+from cast.models import Post
+from tests.factories import PostFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_feed_cache():
+    # The feed URLs are wrapped in cache_page.
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def streaming(settings):
+    settings.CAST_STREAMING_FEEDS = True
+
+
+def podcast_feed_url(podcast, kind):
+    return reverse(f"cast:podcast_feed_{kind}", kwargs={"slug": podcast.slug, "audio_format": "m4a"})
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["cast:latest_entries_feed", "cast:latest_entries_atom_feed"])
+def test_streamed_feed_matches_rendered_feed(client, mocker, settings, blog, post, url_name):
+    # clearing the cache would start a new media generation and change the ETag
+    mocker.patch("cast.feeds.get_media_generation", return_value=1)
+    url = reverse(url_name, kwargs={"slug": blog.slug})
+    rendered = client.get(url)
+
+    cache.clear()
+    settings.CAST_STREAMING_FEEDS = True
+    streamed = client.get(url)
+
+    assert streamed.streaming
+    assert b"".join(streamed.streaming_content) == rendered.content
+    assert streamed["Content-Type"] == rendered["Content-Type"]
+    assert streamed["ETag"] == rendered["ETag"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("kind", ["rss", "atom"])
+def test_streamed_podcast_feed_matches_rendered_feed(client, settings, episode, kind):
+    url = podcast_feed_url(episode.blog, kind)
+    rendered = client.get(url)
+
+    cache.clear()
+    settings.CAST_STREAMING_FEEDS = True
+    content = b"".join(client.get(url).streaming_content)
+
+    assert content == rendered.content
+    assert episode.title in content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_items_are_rendered_while_streaming(rf, blog, mocker, streaming):
+    for number in range(3):
+        PostFactory(owner=blog.owner, parent=blog, title=f"post {number}", slug=f"post-{number}")
+    get_description = mocker.spy(Post, "get_description")
+
+    response = LatestEntriesFeed().stream(rf.get("/feed/"), slug=blog.slug)
+    chunks = iter(response.streaming_content)
+
+    prologue = next(chunks)
+    assert prologue.startswith(b"<?xml") and b"<channel>" in prologue
+    assert get_description.call_count == 0
+    assert b"<item>" in next(chunks)
+    assert get_description.call_count == 1
+    rest = b"".join(chunks)
+    assert get_description.call_count == 3
+    assert rest.endswith(b"</channel></rss>")
+
+
+@pytest.mark.django_db
+def test_streamed_feeds_are_not_page_cached(client, blog, post, streaming):
+    url = reverse("cast:latest_entries_feed", kwargs={"slug": blog.slug})
+    b"".join(client.get(url).streaming_content)
+
+    post.title = "changed title"
+    post.save_revision().publish()
+
+    assert "changed title" in b"".join(client.get(url).streaming_content).decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_streaming_mode_is_not_shared_with_other_threads(rf, blog, mocker):
+    feed = LatestEntriesFeed()
+    seen_in_other_thread = []
+    get_feed = LatestEntriesFeed.get_feed
+
+    def get_feed_checking_other_thread(self, obj, request):
+        thread = threading.Thread(target=lambda: seen_in_other_thread.append(feed.streaming))
+        thread.start()
+        thread.join()
+        assert self.streaming
+        return get_feed(self, obj, request)
+
+    mocker.patch.object(LatestEntriesFeed, "get_feed", get_feed_checking_other_thread)
+    b"".join(feed.stream(rf.get("/"), slug=blog.slug).streaming_content)
+
+    assert seen_in_other_thread == [False]
+    assert not feed.streaming
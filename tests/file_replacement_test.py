@@ -104,6 +104,37 @@ def test_grouped_replacement_failure_removes_already_written_new_files_and_keeps
     ]
 
 
+def test_concurrent_staging_writes_every_file() -> None:
+    storage = RecordingStorage(files={"old-podlove.json", "old-dote.json"})
+    podlove = RecordingField(storage, "old-podlove.json")
+    dote = RecordingField(storage, "old-dote.json")
+    replacements = StagedFileReplacementGroup()
+
+    replacements.stage_concurrently([])
+    replacements.stage_concurrently([(podlove, "podlove.json", b"new podlove"), (dote, "dote.json", b"new dote")])
+
+    assert [replacement.field for replacement in replacements.replacements] == [podlove, dote]
+    assert podlove.name == "podlove-123456789abc.json"
+    assert dote.name == "dote-123456789abc.json"
+
+
+def test_concurrent_staging_failure_rolls_back_the_whole_group() -> None:
+    storage = RecordingStorage(
+        files={"old-podlove.json", "old-dote.json"},
+        fail_save_contains="dote",
+    )
+    podlove = RecordingField(storage, "old-podlove.json")
+    dote = RecordingField(storage, "old-dote.json")
+    replacements = StagedFileReplacementGroup()
+
+    with pytest.raises(OSError, match="replacement write failed"):
+        replacements.stage_concurrently([(podlove, "podlove.json", b"new podlove"), (dote, "dote.json", b"new dote")])
+
+    assert podlove.name == "old-podlove.json"
+    assert dote.name == "old-dote.json"
+    assert storage.files == {"old-podlove.json", "old-dote.json"}
+
+
 @pytest.mark.django_db
 def test_db_save_failure_removes_new_files_and_restores_in_memory_field_names() -> None:
     storage = RecordingStorage(files={"old-podlove.json", "old-dote.json"})
@@ -872,3 +872,43 @@ class TestKnownSpeakerReviewView:
             {"action": "apply-known-speakers"},
         )
         assert response.status_code == 302
+
+
+@pytest.mark.django_db
+def test_artifact_edit_reads_each_artifact_once_and_saves_once(audio, mocker):
+    podlove = copy.deepcopy(PODLOVE)
+    podlove["transcripts"][0]["speaker"] = "Speaker 1"
+    transcript = make_transcript(audio, podlove=podlove, dote=DOTE, vtt=VTT, speakers=SPEAKERS)
+    old_vtt_name = transcript.vtt.name
+    load_json = mocker.spy(transcript, "_load_transcript_json")
+    load_text = mocker.spy(transcript, "_load_text_file")
+    save = mocker.spy(Transcript, "save")
+
+    edit = transcript.edit_artifacts()
+    assert edit.rewrite_speaker_labels({"Speaker 1": "Host"})
+    assert not edit.rewrite_speaker_labels({"Speaker 9": "Nobody"})
+    assert edit.save_known_speaker_editor_decisions({1: {"action": KNOWN_SPEAKER_DECISION_REJECT, "speaker": ""}}) == 1
+    assert edit.apply_known_speaker_suggestions(smooth=False) == 9
+    assert [call.args[0] for call in load_json.call_args_list] == ["podlove", "dote"]
+    assert load_text.call_count == 1
+    save.assert_not_called()
+
+    assert edit.commit() == ["podlove", "dote", "speakers", "vtt"]
+    assert edit.commit() == []
+    assert save.call_count == 1
+    assert transcript.vtt.name != old_vtt_name
+    assert [segment["speaker"] for segment in transcript.podlove_data["transcripts"]] == ["Johannes", "", "Dominik"]
+    assert transcript.get_known_speaker_editor_decisions() == {
+        1: {"action": KNOWN_SPEAKER_DECISION_REJECT, "speaker": ""}
+    }
+
+
+@pytest.mark.django_db
+def test_artifact_edit_without_vtt_leaves_unchanged_artifacts_alone(audio):
+    transcript = make_transcript(audio, podlove=PODLOVE, dote=DOTE, speakers=SPEAKERS)
+    old_podlove_name = transcript.podlove.name
+
+    edit = transcript.edit_artifacts()
+    assert edit.clear_suggestions({10000}) == 2
+    assert edit.commit() == []
+    assert transcript.podlove.name == old_podlove_name
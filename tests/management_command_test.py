@@ -402,16 +402,24 @@ def test_sync_renditions_with_post_slug_deletes_obsolete_and_builds_missing(mock
         "cast.management.commands.sync_renditions.get_obsolete_and_missing_rendition_strings",
         return_value=([123], {image.id: ["fill-1x1"]}),
     )
-    mocker.patch("cast.management.commands.sync_renditions.track", side_effect=lambda items, description=None: items)
-    image_get = mocker.patch("cast.management.commands.sync_renditions.Image.objects.get", return_value=image)
-    get_renditions = mocker.patch.object(image, "get_renditions")
+    mocker.patch("cast.management.commands.sync_renditions.track", side_effect=lambda items, **kwargs: items)
+    create_missing = mocker.patch(
+        "cast.management.commands.sync_renditions.iter_create_missing_renditions", return_value=iter([(image.id, 1)])
+    )
+    invalidate_rendition_dependents = mocker.patch(
+        "cast.management.commands.sync_renditions.invalidate_rendition_dependents"
+    )
+    output = StringIO()
 
-    call_command("sync_renditions", post_slug=post.slug)
+    call_command("sync_renditions", post_slug=post.slug, workers=4, stdout=output)
 
+    invalidate_rendition_dependents.assert_called_once_with()
     get_missing.assert_called_once()
     filter_qs.assert_called_once_with(id__in=[123])
-    image_get.assert_called_once_with(id=image.id)
-    get_renditions.assert_called_once_with("fill-1x1")
+    create_missing.assert_called_once_with({image.id: ["fill-1x1"]}, workers=4)
+    assert "missing renditions=1 images=1" in output.getvalue()
+    assert "created renditions=1 images=1 seconds=" in output.getvalue()
+    assert "renditions_per_second=" in output.getvalue()
 
 
 @pytest.mark.django_db
@@ -422,14 +430,15 @@ def test_sync_renditions_with_unique_blog_slug_syncs_descendants(mocker, blog, p
         "cast.management.commands.sync_renditions.get_obsolete_and_missing_rendition_strings",
         return_value=([321], {image.id: ["fill-2x2"]}),
     )
-    mocker.patch("cast.management.commands.sync_renditions.track", side_effect=lambda items, description=None: items)
-    mocker.patch("cast.management.commands.sync_renditions.Image.objects.get", return_value=image)
-    get_renditions = mocker.patch.object(image, "get_renditions")
+    mocker.patch("cast.management.commands.sync_renditions.track", side_effect=lambda items, **kwargs: items)
+    create_missing = mocker.patch(
+        "cast.management.commands.sync_renditions.iter_create_missing_renditions", return_value=iter([(image.id, 1)])
+    )
 
-    call_command("sync_renditions", blog_slug=blog.slug)
+    call_command("sync_renditions", blog_slug=blog.slug, stdout=StringIO())
 
     filter_qs.assert_called_once_with(id__in=[321])
-    get_renditions.assert_called_once_with("fill-2x2")
+    create_missing.assert_called_once_with({image.id: ["fill-2x2"]}, workers=1)
 
 
 @pytest.mark.django_db
@@ -443,11 +452,16 @@ def test_sync_renditions_without_filters_uses_all_posts(mocker):
         return_value=([], {}),
     )
     mocker.patch("cast.management.commands.sync_renditions.Rendition.objects.filter")
-    mocker.patch("cast.management.commands.sync_renditions.track", side_effect=lambda items, description=None: items)
+    mocker.patch("cast.management.commands.sync_renditions.track", side_effect=lambda items, **kwargs: items)
+    invalidate_rendition_dependents = mocker.patch(
+        "cast.management.commands.sync_renditions.invalidate_rendition_dependents"
+    )
 
-    call_command("sync_renditions")
+    call_command("sync_renditions", stdout=StringIO())
 
     all_posts.assert_called_once_with()
+    # nothing was created, so nothing is invalidated
+    invalidate_rendition_dependents.assert_not_called()
 
 
 def test_media_replace_dry_run_with_yes_warns_and_does_not_write(mocker):
@@ -177,13 +177,13 @@ def test_video_form_rejects_oversized_upload(settings):
 
 @pytest.mark.django_db
 def test_audio_save_rejects_invalid_upload_before_ffprobe(user, mocker):
-    get_duration = mocker.patch("cast.models.audio.Audio._get_audio_duration")
+    probe = mocker.patch("cast.models.audio.Audio._probe_audio_file")
     audio = Audio(user=user, m4a=upload("clip.m4a", b"not a media file", "audio/mp4"))
 
     with pytest.raises(ValidationError):
         audio.save()
 
-    get_duration.assert_not_called()
+    probe.assert_not_called()
     assert Audio.objects.count() == 0
 
 
@@ -72,7 +72,7 @@ class TestPostModel:
         sync_calls, rendition_calls = [], []
         monkeypatch.setattr(type(post), "sync_media_ids", lambda self: sync_calls.append(1))
         monkeypatch.setattr(
-            pages_module, "create_missing_renditions_for_posts", lambda posts: rendition_calls.append(1)
+            pages_module, "enqueue_missing_renditions_for_posts", lambda posts: rendition_calls.append(1)
         )
 
         post.save(sync_media=False, create_renditions=False)
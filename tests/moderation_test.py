@@ -86,6 +86,71 @@ def test_lots_of_unknown_tokens_lead_to_ham_if_spam_has_more_words():
     assert predicted_label == "spam"
 
 
+def test_predict_matches_word_by_word_probabilities():
+    train = [
+        ("spam", "cheap pills cheap watches"),
+        ("spam", "cheap offer now"),
+        ("ham", "nice post about django"),
+    ]
+    model = NaiveBayes().fit(train)
+    message = "cheap django pills unknown words"
+
+    expected = dict(model.prior_probabilities)
+    for word in model.tokenize(message):
+        counts_per_label = model.word_label_counts.get(word, {})
+        expected = normalize(model.update_probabilities(expected, counts_per_label, model.number_of_all_words))
+
+    probabilities = model.predict(message)
+    assert probabilities == pytest.approx(expected)
+
+
+def test_normalize_without_probabilities():
+    assert normalize({}) == {}
+
+
+def test_predict_long_message_does_not_underflow():
+    model = NaiveBayes().fit([("spam", "foo bar"), ("ham", "baz")])
+
+    probabilities = model.predict("foo " * 5000)
+
+    assert probabilities["spam"] == pytest.approx(1.0)
+    assert sum(probabilities.values()) == pytest.approx(1.0)
+
+
+def test_fit_recompiles_model():
+    model = NaiveBayes().fit([("spam", "foo")])
+    assert model.compile() is model.compile()
+    assert model.predict_label("foo") == "spam"
+
+    model.fit([("ham", "foo"), ("ham", "bar")])
+
+    assert model.compile().labels == ["ham"]
+    assert model.predict_label("bar") == "ham"
+
+
+@pytest.mark.django_db()
+def test_get_cached_default_without_spamfilter():
+    assert SpamFilter.get_cached_default() is None
+
+
+@pytest.mark.django_db()
+def test_get_cached_default_reloads_changed_spamfilter(django_assert_num_queries):
+    spamfilter = SpamFilter.objects.create(name="default", model=NaiveBayes().fit([("spam", "foo")]))
+    cached = SpamFilter.get_cached_default()
+    assert cached == SpamFilter.get_default() == spamfilter
+
+    with django_assert_num_queries(1):
+        assert SpamFilter.get_cached_default() is cached
+    assert cached.model.predict_label("foo") == "spam"
+
+    spamfilter.model = NaiveBayes().fit([("ham", "foo")])
+    spamfilter.save()
+
+    reloaded = SpamFilter.get_cached_default()
+    assert reloaded is not cached
+    assert reloaded.model.predict_label("foo") == "ham"
+
+
 @pytest.mark.django_db()
 def test_model_default_serialization():
     class StubModel:
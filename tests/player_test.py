@@ -12,6 +12,7 @@ from cast.checks import check_cast_audio_player_settings, check_cast_setting_typ
 from cast.devdata import create_transcript
 from cast.models.audio import ChapterMark
 from cast.player import (
+    CueIndex,
     _clock_seconds,
     _finite_number,
     audio_player_context_flags,
@@ -226,6 +227,36 @@ class TestBuildCues:
 
 
 @pytest.mark.django_db
+def make_cues(*spans):
+    return [{"start": start, "end": end, "speaker": "", "text": f"cue {start}"} for start, end in spans]
+
+
+class TestCueIndex:
+    def test_all_round_trips_cues(self):
+        cues = make_cues((0.0, 1.0), (1.0, 2.5)) + [{"start": 3.0, "end": 4.0, "speaker": "Zoë", "text": "a,b"}]
+        index = CueIndex(cues)
+        assert len(index) == 3
+        assert index.all() == cues
+        assert CueIndex([]).all() == []
+
+    def test_window_includes_cues_playing_at_start(self):
+        index = CueIndex(make_cues((0.0, 5.0), (5.0, 10.0), (10.0, 15.0), (15.0, 20.0)))
+        assert [cue["start"] for cue in index.window(7.0, 15.0)] == [5.0, 10.0]
+        assert [cue["start"] for cue in index.window(0.0, 1.0)] == [0.0]
+        assert index.window(20.0, 30.0) == []
+        assert index.window(8.0, 8.0) == []
+
+    def test_window_keeps_long_overlapping_cue(self):
+        index = CueIndex(make_cues((0.0, 30.0), (5.0, 6.0), (10.0, 12.0)))
+        assert [cue["start"] for cue in index.window(11.0, 11.5)] == [0.0, 5.0, 10.0]
+
+    def test_page(self):
+        index = CueIndex(make_cues((0.0, 1.0), (1.0, 2.0), (2.0, 3.0)))
+        assert [cue["start"] for cue in index.page(1, 2)] == [0.0, 1.0]
+        assert [cue["start"] for cue in index.page(2, 2)] == [2.0]
+        assert index.page(3, 2) == []
+
+
 class TestSanitizationParity:
     def test_non_public_speakers_removed_and_no_raw_fields(self, audio, episode):
         from cast.models import Contributor, EpisodeContributor
@@ -422,6 +453,51 @@ class TestFallbackEndpoint:
         assert again.content == b""
         assert again["ETag"] == etag
 
+    def _create_long_transcript(self, audio):
+        segments = [
+            {"start_ms": second * 1000, "end_ms": (second + 1) * 1000, "text": f"s{second}"} for second in range(5)
+        ]
+        create_transcript(audio=audio, podlove={"transcripts": segments})
+
+    def test_time_window(self, client, audio, episode):
+        self._create_long_transcript(audio)
+        data = client.get(self._url(audio), {"post_id": episode.pk, "from": "1.5", "to": "3"}).json()
+        assert [cue["text"] for cue in data["cues"]] == ["s1", "s2"]
+        assert data["count"] == 5
+        data = client.get(self._url(audio), {"post_id": episode.pk, "from": "3"}).json()
+        assert [cue["text"] for cue in data["cues"]] == ["s3", "s4"]
+
+    def test_pages(self, client, audio, episode):
+        self._create_long_transcript(audio)
+        first = client.get(self._url(audio), {"post_id": episode.pk, "page_size": "2"}).json()
+        assert [cue["text"] for cue in first["cues"]] == ["s0", "s1"]
+        assert first["next"] == 2
+        last = client.get(self._url(audio), {"post_id": episode.pk, "page": "3", "page_size": "2"}).json()
+        assert last == {"cues": [last["cues"][0]], "count": 5, "next": None}
+        assert last["cues"][0]["text"] == "s4"
+
+    def test_windows_without_transcript(self, client, audio, episode):
+        data = client.get(self._url(audio), {"post_id": episode.pk, "page": "1"}).json()
+        assert data == {"cues": [], "count": 0, "next": None}
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"from": "1", "page": "1"},
+            {"from": "nan"},
+            {"from": "-1"},
+            {"to": "soon"},
+            {"page": "0"},
+            {"page_size": "0"},
+            {"page_size": "100000"},
+        ],
+    )
+    def test_invalid_selection(self, client, audio, episode, params):
+        self._create_long_transcript(audio)
+        response = client.get(self._url(audio), {"post_id": episode.pk} | params)
+        assert response.status_code == 400
+        assert response.json() == {"error": "Invalid cue selection"}
+
 
 class TestContextFlags:
     def test_podlove_mode(self, settings):
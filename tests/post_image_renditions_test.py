@@ -1,11 +1,20 @@
+from concurrent.futures import Future
+
 import pytest
+from django.core.cache import cache
 
 from cast.models import Post
 from cast.models.image_renditions import (
+    count_images_missing_renditions,
+    enqueue_image_renditions,
+    enqueue_missing_renditions_for_posts,
     get_all_filterstrings,
     get_gallery_thumbnail_srgb_counterpart_filterstrings,
     get_obsolete_and_missing_rendition_strings,
+    iter_create_missing_renditions,
+    rendition_job_key,
 )
+from cast.rendition_tasks import create_image_renditions, get_image_types_in_use
 
 
 @pytest.mark.django_db
@@ -130,3 +139,127 @@ def test_post_get_obsolete_and_missing_rendition_strings_for_disabled_srgb_polic
         rendition_queryset.srgb_gallery_avif_thumbnail_pk,
     }
     assert "width-240" in missing_renditions[1]
+
+
+@pytest.mark.django_db
+def test_iter_create_missing_renditions_creates_renditions_per_image(image):
+    missing = {image.pk: {"width-1", "width-2"}, image.pk + 1000: {"width-1"}}
+
+    created = dict(iter_create_missing_renditions(missing))
+
+    assert created == {image.pk: 2, image.pk + 1000: 0}
+    assert set(image.renditions.values_list("filter_spec", flat=True)) == {"width-1", "width-2"}
+    # renditions committed by an interrupted run are not created twice
+    list(iter_create_missing_renditions({image.pk: {"width-1", "width-2"}}))
+    assert image.renditions.count() == 2
+
+
+class SynchronousExecutor:
+    def __init__(self, *, max_workers, initializer):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, function, *args):
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+
+@pytest.mark.django_db
+def test_iter_create_missing_renditions_spreads_images_over_process_pool(mocker, image):
+    mocker.patch("cast.models.image_renditions.ProcessPoolExecutor", SynchronousExecutor)
+    close_all = mocker.patch("cast.models.image_renditions.connections.close_all")
+
+    created = list(iter_create_missing_renditions({image.pk: {"width-3"}, image.pk + 1000: {"width-3"}}, workers=2))
+
+    close_all.assert_called_once_with()
+    assert sorted(created) == [(image.pk, 1), (image.pk + 1000, 0)]
+    assert image.renditions.filter(filter_spec="width-3").exists()
+
+
+@pytest.mark.django_db
+def test_enqueue_missing_renditions_for_posts_creates_renditions_in_task(post_with_image):
+    [image] = post_with_image.images.all()
+    image.renditions.all().delete()
+
+    missing_renditions = enqueue_missing_renditions_for_posts(iter([post_with_image]))
+
+    # the immediate backend of the tests runs the job right away
+    assert set(image.renditions.values_list("filter_spec", flat=True)) >= missing_renditions[image.pk]
+    assert count_images_missing_renditions(missing_renditions) == 0
+    assert count_images_missing_renditions({}) == 0
+    assert cache.get(rendition_job_key(image.pk)) is None
+    # a later job for the same image has nothing left to do
+    renditions_count = image.renditions.count()
+    create_image_renditions.call(image.pk, ["regular"])
+    assert image.renditions.count() == renditions_count
+
+
+@pytest.mark.django_db
+def test_enqueue_image_renditions_skips_pending_jobs(mocker, image):
+    task = mocker.patch("cast.rendition_tasks.create_image_renditions")
+    key = rendition_job_key(image.pk)
+    cache.add(key, True)
+
+    try:
+        # a pending job of other image types blocks the image as well
+        assert enqueue_image_renditions(image.pk, ["gallery"]) is False
+    finally:
+        cache.delete(key)
+    task.using.assert_not_called()
+    assert count_images_missing_renditions({image.pk: {"width-4"}}) == 1
+
+
+@pytest.mark.django_db
+def test_create_image_renditions_task_invalidates_dependents_once(mocker, image):
+    image.renditions.all().delete()
+    invalidate_rendition_dependents = mocker.patch("cast.rendition_tasks.invalidate_rendition_dependents")
+
+    create_image_renditions.call(image.pk, ["regular"])
+
+    assert image.renditions.count() > 1
+    invalidate_rendition_dependents.assert_called_once_with()
+
+
+@pytest.mark.django_db
+def test_create_image_renditions_task_covers_all_image_types_of_the_image(gallery, image):
+    image.renditions.all().delete()
+
+    # enqueued for the regular type while a gallery job would have been skipped as pending
+    create_image_renditions.call(image.pk, ["regular"])
+
+    _, missing_renditions = get_obsolete_and_missing_rendition_strings([("regular", image), ("gallery", image)])
+    assert missing_renditions == {}
+
+
+@pytest.mark.django_db
+def test_get_image_types_in_use_for_post_image(post_with_image):
+    [post_image] = post_with_image.images.all()
+
+    assert get_image_types_in_use(post_image) == {"regular"}
+
+
+@pytest.mark.django_db
+def test_enqueue_image_renditions_releases_job_when_enqueue_fails(mocker, image):
+    mocker.patch("cast.rendition_tasks.create_image_renditions").using.side_effect = RuntimeError("backend down")
+
+    with pytest.raises(RuntimeError):
+        enqueue_image_renditions(image.pk, ["regular"])
+
+    assert cache.get(rendition_job_key(image.pk)) is None
+
+
+@pytest.mark.django_db
+def test_create_image_renditions_task_ignores_deleted_images(image):
+    image_id = image.pk
+    cache.add(rendition_job_key(image_id), True)
+    image.delete()
+
+    create_image_renditions.call(image_id, ["regular"])
+
+    assert cache.get(rendition_job_key(image_id)) is None
@@ -154,3 +154,16 @@ def test_serve_preview_calls_media_sync(rf, post_with_image):
     request = rf.get("/post/1/")
     post_with_image.serve_preview(request, "draft")
     assert image in post_with_image.images.all()
+
+
+@pytest.mark.django_db
+def test_serve_preview_shows_pending_renditions(rf, mocker, post_with_image):
+    image = post_with_image.images.first()
+    mocker.patch(
+        "cast.models.pages.enqueue_missing_renditions_for_posts", return_value={image.pk: {"width-1|format-avif"}}
+    )
+
+    response = post_with_image.serve_preview(rf.get("/post/1/"), "draft")
+
+    assert response.context_data["pending_rendition_images"] == 1
+    assert "Renditions for 1 image are still being created" in response.rendered_content
@@ -0,0 +1,157 @@
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image as PILImage
+from PIL import ImageCms
+from wagtail.images import get_image_model
+from wagtail.images.models import Filter, Image
+from willow.plugins.pillow import PillowImage
+
+from cast.models.image_renditions import (
+    create_missing_renditions_for_images,
+    create_renditions_for_image,
+    invalidate_rendition_dependents,
+)
+from cast.rendition_pipeline import DecodedImageSource, SharedPillowImage, create_renditions_from_decoded_source
+
+
+@pytest.fixture(autouse=True)
+def clear_rendition_cache():
+    # Wagtail caches renditions by image id, which the rolled back images of other tests share.
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _image_file(name, image_format, **save_kwargs):
+    output = BytesIO()
+    PILImage.new("RGB", (40, 20), (200, 50, 25)).save(output, image_format, **save_kwargs)
+    return SimpleUploadedFile(name=name, content=output.getvalue())
+
+
+@pytest.fixture()
+def profiled_jpeg_image(db):
+    icc_profile = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    image = Image(title="profiled", file=_image_file("profiled.jpg", "JPEG", icc_profile=icc_profile))
+    image.save()
+    return image
+
+
+@pytest.mark.django_db
+def test_create_renditions_for_image_decodes_and_resizes_once(mocker, profiled_jpeg_image):
+    image = profiled_jpeg_image
+    decode = mocker.spy(PillowImage, "open")
+    resize = mocker.spy(PillowImage, "resize")
+    transform = mocker.spy(PillowImage, "transform_colorspace_to_srgb")
+    filter_specs = {"width-10", "width-10|format-avif", "width-10|srgb", "width-10|srgb|format-avif"}
+
+    assert create_renditions_for_image(image, filter_specs) == 4
+
+    assert decode.call_count == 1
+    assert resize.call_count == 1
+    assert transform.call_count == 1
+    renditions = {rendition.filter_spec: rendition for rendition in image.renditions.all()}
+    assert set(renditions) == filter_specs
+    assert {(rendition.width, rendition.height) for rendition in renditions.values()} == {(10, 5)}
+    with renditions["width-10|srgb|format-avif"].get_willow_image() as avif:
+        assert avif.format_name == "avif"
+
+
+@pytest.mark.django_db
+def test_create_missing_renditions_for_images_invalidates_dependents_once(mocker, profiled_jpeg_image, image):
+    invalidate_rendition_dependents = mocker.patch("cast.models.image_renditions.invalidate_rendition_dependents")
+
+    create_missing_renditions_for_images({profiled_jpeg_image.pk: {"width-10", "width-12"}, image.pk: {"width-13"}})
+    create_missing_renditions_for_images({})
+
+    invalidate_rendition_dependents.assert_called_once_with()
+
+
+@pytest.mark.django_db
+def test_invalidate_rendition_dependents_invalidates_media_and_static_feeds(mocker):
+    # neither the bulk insert nor Image.create_renditions sends post_save
+    invalidate_media = mocker.patch("cast.models.image_renditions.invalidate_media")
+    on_shared_content_changed = mocker.patch("cast.static_feeds.on_shared_content_changed")
+
+    invalidate_rendition_dependents()
+
+    invalidate_media.assert_called_once_with()
+    on_shared_content_changed.assert_called_once_with(sender=get_image_model().get_rendition_model(), instance=None)
+
+
+@pytest.mark.django_db
+def test_create_renditions_from_decoded_source_keeps_existing_renditions(profiled_jpeg_image):
+    image = profiled_jpeg_image
+    existing = image.get_rendition("width-10")
+    source = DecodedImageSource.open(image)
+
+    created = create_renditions_from_decoded_source(image, source, ["width-10", "width-12"])
+
+    assert [rendition.filter_spec for rendition in created] == ["width-12"]
+    assert image.renditions.get(filter_spec="width-10") == existing
+
+
+@pytest.mark.django_db
+def test_decoded_image_source_leaves_svg_and_gif_to_wagtail():
+    gif = Image(title="gif", file=_image_file("animation.gif", "GIF"))
+    gif.save()
+
+    assert DecodedImageSource.open(gif) is None
+    assert DecodedImageSource.open(SimpleNamespace(is_svg=lambda: True)) is None
+
+    create_renditions_for_image(gif, ["width-10", "width-12"])
+    assert gif.renditions.count() == 2
+
+
+@pytest.mark.django_db
+def test_decoded_image_source_leaves_animated_webp_to_wagtail():
+    frames = [PILImage.new("RGB", (40, 20), color) for color in ((200, 50, 25), (25, 50, 200))]
+    output = BytesIO()
+    frames[0].save(output, "WEBP", save_all=True, append_images=frames[1:], duration=100)
+    animated = Image(title="animated", file=SimpleUploadedFile(name="animated.webp", content=output.getvalue()))
+    animated.save()
+
+    assert DecodedImageSource.open(animated) is None
+
+
+@pytest.mark.django_db
+def test_create_renditions_from_decoded_source_drops_files_of_conflicting_rows(mocker, profiled_jpeg_image):
+    image = profiled_jpeg_image
+    source = DecodedImageSource.open(image)
+    rendition_model = image.get_rendition_model()
+    bulk_create = rendition_model.objects.bulk_create
+    generated = []
+
+    def insert_concurrently(objs, **kwargs):
+        # another process inserts width-10 between the rendering and the insert
+        other_filter = Filter(spec="width-10")
+        rendition_model.objects.create(
+            image=image,
+            filter_spec=other_filter.spec,
+            focal_point_key=other_filter.get_cache_key(image),
+            file=image.generate_rendition_file(other_filter),
+        )
+        generated.extend((rendition.filter_spec, rendition.file.name) for rendition in objs)
+        return bulk_create(objs, **kwargs)
+
+    mocker.patch.object(rendition_model.objects, "bulk_create", side_effect=insert_concurrently)
+
+    created = create_renditions_from_decoded_source(image, source, ["width-10", "width-12"])
+
+    assert [rendition.filter_spec for rendition in created] == ["width-12"]
+    assert created[0].pk == image.renditions.get(filter_spec="width-12").pk
+    storage = rendition_model._meta.get_field("file").storage
+    assert not storage.exists(dict(generated)["width-10"])
+    assert storage.exists(image.renditions.get(filter_spec="width-10").file.name)
+    assert storage.exists(created[0].file.name)
+
+
+def test_shared_pillow_image_without_source_computes_directly():
+    # TransformColorspaceToSrgbOperation rebuilds images without their ICC profile via type(willow)(image)
+    willow = SharedPillowImage(PILImage.new("RGB", (40, 20)))
+
+    assert willow.format_name is None
+    assert willow.resize((10, 5)).image.size == (10, 5)
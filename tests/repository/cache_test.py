@@ -0,0 +1,313 @@
+import pytest
+from django.core.cache import cache
+from django.http import QueryDict
+from django.urls import reverse
+
+from cast import appsettings
+from cast.feeds import LatestEntriesFeed
+from cast.models import Blog
+from cast.models.repository import BlogIndexContext, FeedContext
+from cast.models.repository.cache import (
+    GLOBAL_GENERATION_KEY,
+    blog_generation_key,
+    build_cache_key,
+    build_description_cache_key,
+    get_generations,
+    get_or_build_cachable_data,
+    get_or_render_description,
+    invalidate_all_blogs,
+    invalidate_blog,
+    invalidate_for_page,
+    normalize_parameters,
+)
+from cast.models.pages import Post
+from tests.factories import PostFactory
+
+
+@pytest.fixture
+def repository_cache(settings):
+    settings.CAST_REPOSITORY_CACHE_TIMEOUT = 60
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture
+def published_post(blog, body):
+    return PostFactory(owner=blog.owner, parent=blog, title="test entry", slug="test-entry", body=body)
+
+
+def render_feed(rf, blog):
+    # Call the feed directly, the URL conf wraps it in a response cache.
+    return LatestEntriesFeed()(rf.get(reverse("cast:latest_entries_feed", kwargs={"slug": blog.slug})), slug=blog.slug)
+
+
+def create_live_post(blog, title, slug):
+    post = PostFactory(owner=blog.owner, parent=blog, title=title, slug=slug)
+    post.save_revision().publish()
+    return post
+
+
+@pytest.fixture
+def description_cache(settings):
+    settings.CAST_DESCRIPTION_CACHE_TIMEOUT = 60
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture
+def spy_post_serve(mocker):
+    return mocker.spy(Post, "serve")
+
+
+@pytest.fixture
+def spy_blog_index_builder(mocker):
+    return mocker.spy(BlogIndexContext, "data_for_blog_index_cachable")
+
+
+@pytest.fixture
+def spy_feed_builder(mocker):
+    return mocker.spy(FeedContext, "data_for_feed_cachable")
+
+
+def test_normalize_parameters_is_order_insensitive_and_drops_empty_values():
+    assert normalize_parameters(QueryDict("page=2&search=&o=-visible_date")) == normalize_parameters(
+        QueryDict("o=-visible_date&page=2")
+    )
+    assert normalize_parameters(QueryDict("tag_facets=b&tag_facets=a")) == "tag_facets=a&tag_facets=b"
+
+
+@pytest.mark.django_db
+def test_cache_key_depends_on_site_theme_and_parameters(repository_cache):
+    key = build_cache_key(variant="blog-index", blog_id=1, site_id=1, template_base_dir="bootstrap4")
+    assert key == build_cache_key(variant="blog-index", blog_id=1, site_id=1, template_base_dir="bootstrap4")
+    assert key != build_cache_key(variant="blog-index", blog_id=1, site_id=2, template_base_dir="bootstrap4")
+    assert key != build_cache_key(variant="blog-index", blog_id=1, site_id=1, template_base_dir="plain")
+    assert key != build_cache_key(
+        variant="blog-index", blog_id=1, site_id=1, template_base_dir="bootstrap4", parameters="page=2"
+    )
+    assert key != build_cache_key(variant="feed", blog_id=1, site_id=1, template_base_dir="bootstrap4")
+
+
+def test_invalidation_bumps_only_the_affected_generation(repository_cache):
+    global_generation, blog_generation = get_generations(1)
+    _, other_blog_generation = get_generations(2)
+
+    invalidate_blog(1)
+    assert get_generations(1) == (global_generation, blog_generation + 1)
+    assert get_generations(2)[1] == other_blog_generation
+
+    invalidate_all_blogs()
+    assert get_generations(2) == (global_generation + 1, other_blog_generation)
+
+
+def test_invalidation_recreates_evicted_generation(repository_cache):
+    invalidate_blog(1)  # no counter yet
+    assert repository_cache.get(blog_generation_key(1)) is not None
+
+
+def test_get_generations_uses_counter_created_concurrently(repository_cache, mocker):
+    repository_cache.set(GLOBAL_GENERATION_KEY, 42, timeout=None)
+    repository_cache.set(blog_generation_key(1), 23, timeout=None)
+    # Simulate another process creating the counters between our read and our add.
+    mocker.patch.object(repository_cache, "get_many", return_value={})
+    assert get_generations(1) == (42, 23)
+
+
+def test_invalidation_is_a_noop_when_cache_is_disabled(settings, mocker):
+    settings.CAST_REPOSITORY_CACHE_TIMEOUT = 0
+    cache.clear()
+    invalidate_blog(1)
+    invalidate_all_blogs()
+    invalidate_for_page(mocker.Mock())
+    assert cache.get(blog_generation_key(1)) is None
+    assert cache.get(GLOBAL_GENERATION_KEY) is None
+
+
+@pytest.mark.django_db
+def test_cache_is_bypassed_by_default(client, published_post, spy_blog_index_builder):
+    blog_url = published_post.blog.get_url()
+    client.get(blog_url)
+    client.get(blog_url)
+    assert spy_blog_index_builder.call_count == 2
+
+
+@pytest.mark.django_db
+def test_blog_index_is_served_from_cache(client, published_post, repository_cache, spy_blog_index_builder):
+    blog_url = published_post.blog.get_url()
+
+    client.get(blog_url)
+    second = client.get(blog_url)
+
+    assert spy_blog_index_builder.call_count == 1
+    assert published_post.title in second.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_blog_index_pages_are_cached_separately(client, blog, repository_cache, spy_blog_index_builder, monkeypatch):
+    monkeypatch.setattr(appsettings, "POST_LIST_PAGINATION", 1, raising=False)
+    PostFactory(owner=blog.owner, parent=blog, title="first post", slug="first-post")
+    PostFactory(owner=blog.owner, parent=blog, title="second post", slug="second-post")
+    blog_url = blog.get_url()
+
+    for url in (blog_url, f"{blog_url}?page=2", f"{blog_url}?page=2&search="):
+        assert client.get(url).status_code == 200
+
+    assert spy_blog_index_builder.call_count == 2
+
+
+@pytest.mark.django_db
+def test_publishing_a_post_invalidates_its_blog(client, published_post, repository_cache, spy_blog_index_builder):
+    blog_url = published_post.blog.get_url()
+    client.get(blog_url)
+
+    published_post.title = "changed title"
+    published_post.save_revision().publish()
+    response = client.get(blog_url)
+
+    assert spy_blog_index_builder.call_count == 2
+    assert "changed title" in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_unpublishing_a_post_invalidates_its_blog(client, published_post, repository_cache, spy_blog_index_builder):
+    blog_url = published_post.blog.get_url()
+    client.get(blog_url)
+
+    published_post.unpublish()
+    response = client.get(blog_url)
+
+    assert spy_blog_index_builder.call_count == 2
+    assert published_post.title not in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_publishing_a_blog_invalidates_all_blogs(client, published_post, repository_cache, spy_blog_index_builder):
+    blog = Blog.objects.get(pk=published_post.blog.pk)
+    client.get(blog.get_url())
+
+    blog.title = "renamed blog"
+    blog.save_revision().publish()
+    client.get(blog.get_url())
+
+    assert spy_blog_index_builder.call_count == 2
+
+
+@pytest.mark.django_db
+def test_moving_a_page_invalidates_all_blogs(published_post, repository_cache, site):
+    global_generation, _ = get_generations(published_post.blog.pk)
+
+    published_post.move(site.root_page, pos="last-child")
+
+    assert get_generations(published_post.blog.pk)[0] == global_generation + 1
+
+
+@pytest.mark.django_db
+def test_saving_media_invalidates_all_blogs(audio, repository_cache):
+    global_generation, _ = get_generations(1)
+
+    audio.title = "new title"
+    audio.save()
+
+    assert get_generations(1)[0] == global_generation + 1
+
+
+@pytest.mark.django_db
+def test_feed_is_served_from_cache(rf, published_post, repository_cache, spy_feed_builder):
+    first = render_feed(rf, published_post.blog)
+    second = render_feed(rf, published_post.blog)
+
+    assert spy_feed_builder.call_count == 1
+    assert first.content == second.content
+
+
+@pytest.mark.django_db
+def test_rss_and_atom_podcast_feeds_share_cached_data(client, episode, repository_cache, spy_feed_builder):
+    for feed_name in ("cast:podcast_feed_rss", "cast:podcast_feed_atom"):
+        feed_url = reverse(feed_name, kwargs={"slug": episode.blog.slug, "audio_format": "m4a"})
+        assert client.get(feed_url).status_code == 200
+
+    assert spy_feed_builder.call_count == 1
+
+
+@pytest.mark.django_db
+def test_cached_data_without_request_site(rf, blog, repository_cache, mocker):
+    mocker.patch("cast.models.repository.cache.Site.find_for_request", return_value=None)
+    mocker.patch.object(blog, "get_template_base_dir", return_value="bootstrap4")
+    build = mocker.Mock(return_value={"cached": True})
+    request = rf.get("/")
+
+    get_or_build_cachable_data(request=request, blog=blog, variant="feed", build=build)
+    data = get_or_build_cachable_data(request=request, blog=blog, variant="feed", build=build)
+
+    assert data == {"cached": True}
+    build.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_description_cache_key_depends_on_revision_mode_theme_and_host(description_cache):
+    kwargs = {
+        "post_id": 1,
+        "revision_id": 1,
+        "template_base_dir": "bootstrap4",
+        "render_detail": True,
+        "render_for_feed": True,
+        "base_url": "http://testserver",
+    }
+    key = build_description_cache_key(**kwargs)
+    assert key == build_description_cache_key(**kwargs)
+    for name, value in (
+        ("revision_id", 2),
+        ("template_base_dir", "plain"),
+        ("render_detail", False),
+        ("render_for_feed", False),
+        ("base_url", "https://example.com"),
+    ):
+        assert key != build_description_cache_key(**(kwargs | {name: value}))
+
+
+@pytest.mark.django_db
+def test_description_is_not_cached_without_live_revision(rf, blog, description_cache, mocker):
+    render = mocker.Mock(return_value="<p>draft</p>")
+    post = Post(pk=1, title="draft")
+
+    for _ in range(2):
+        get_or_render_description(
+            post=post,
+            request=rf.get("/"),
+            template_base_dir="bootstrap4",
+            render_detail=True,
+            render_for_feed=True,
+            render=render,
+        )
+
+    assert render.call_count == 2
+
+
+@pytest.mark.django_db
+def test_feed_descriptions_are_rendered_once_per_revision(rf, blog, description_cache, spy_post_serve):
+    first = create_live_post(blog, "first post", "first-post")
+    create_live_post(blog, "second post", "second-post")
+
+    initial = render_feed(rf, blog)
+    assert render_feed(rf, blog).content == initial.content
+    assert spy_post_serve.call_count == 2
+
+    first.title = "changed first post"
+    first.save_revision().publish()
+    render_feed(rf, blog)
+
+    assert spy_post_serve.call_count == 3
+
+
+@pytest.mark.django_db
+def test_saving_media_re_renders_descriptions(rf, blog, audio, description_cache, spy_post_serve):
+    create_live_post(blog, "first post", "first-post")
+    render_feed(rf, blog)
+
+    audio.title = "new title"
+    audio.save()
+    render_feed(rf, blog)
+
+    assert spy_post_serve.call_count == 2
@@ -0,0 +1,90 @@
+import pickle
+import timeit
+from copy import deepcopy
+from uuid import uuid4
+
+import pytest
+from django.core.cache import cache, caches
+
+from cast.models.image_renditions import create_missing_renditions_for_posts
+from cast.models.repository import FeedContext
+from cast.models.repository.cache import get_or_build_cachable_data
+from cast.models.repository.codec import (
+    CACHABLE_DATA_SCHEMA_VERSION,
+    decode_cachable_data,
+    encode_cachable_data,
+)
+
+
+def feed_data(rf, blog, post):
+    create_missing_renditions_for_posts([post])
+    request = rf.get(blog.get_url())
+    request.htmx = False
+    return FeedContext.data_for_feed_cachable(request=request, blog=blog)
+
+
+def scale_posts(data, count):
+    """Return ``data`` with the only post copied to ``count`` posts."""
+    [template_pk] = data["posts"]
+    scaled = deepcopy(data)
+    for pk in range(template_pk + 1, template_pk + count):
+        for key, value in data.items():
+            if isinstance(value, dict) and template_pk in value:
+                copy = deepcopy(value[template_pk])
+                if isinstance(copy, dict) and "pk" in copy:
+                    copy |= {"id": pk, "pk": pk, "uuid": uuid4(), "title": f"post {pk}", "slug": f"post-{pk}"}
+                scaled[key][pk] = copy
+        scaled["posts"].append(pk)
+    return scaled
+
+
+@pytest.mark.django_db
+def test_encoding_round_trip(rf, blog, post_with_gallery):
+    data = feed_data(rf, blog, post_with_gallery)
+
+    decoded = decode_cachable_data(encode_cachable_data(data))
+
+    assert decoded == data
+    assert decoded["renditions_for_posts"]
+
+
+@pytest.mark.django_db
+def test_repository_cache_stores_encoded_data(rf, settings, mocker, blog, post):
+    settings.CAST_REPOSITORY_CACHE_TIMEOUT = 60
+    cache.clear()
+    spy_set = mocker.spy(caches["default"], "set")
+    request = rf.get(blog.get_url())
+    data = feed_data(rf, blog, post)
+
+    built = get_or_build_cachable_data(request=request, blog=blog, variant="feed", build=lambda: data)
+    cached = get_or_build_cachable_data(request=request, blog=blog, variant="feed", build=dict)
+    cache.clear()
+
+    [(key, payload), *_] = [call.args for call in spy_set.call_args_list if ":feed:" in call.args[0]]
+    assert f":v{CACHABLE_DATA_SCHEMA_VERSION}:" in key
+    assert isinstance(payload, bytes)
+    assert built is data
+    assert cached == data
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+def test_benchmark_encoding_of_large_blog(rf, blog, post_with_gallery, capsys):
+    data = scale_posts(feed_data(rf, blog, post_with_gallery), 1000)
+    # Django cache backends pickle values with the highest protocol.
+    pickled = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    encoded = encode_cachable_data(data)
+
+    def best_of(statement):
+        return min(timeit.repeat(statement, number=1, repeat=5)) * 1000
+
+    dict_loads = best_of(lambda: pickle.loads(pickled))
+    encoded_loads = best_of(lambda: decode_cachable_data(encoded))
+    with capsys.disabled():
+        print(
+            f"\n1000 posts: pickled dicts {len(pickled)} bytes, {dict_loads:.1f} ms to load;"
+            f" encoded {len(encoded)} bytes, {encoded_loads:.1f} ms to load"
+        )
+
+    assert decode_cachable_data(encoded) == data
+    assert len(encoded) * 3 < len(pickled)
@@ -0,0 +1,73 @@
+import pytest
+
+from cast.models.image_renditions import create_missing_renditions_for_posts
+from cast.models.repository import FeedContext
+from cast.models.repository import contexts
+from cast.models.repository.lazy import LazyModelMap, LazySequence
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def lazy_map(calls):
+    def deserialize(data):
+        calls.append(data)
+        return {"model": data}
+
+    return LazyModelMap({1: "one", 2: "two", 3: "three"}, deserialize)
+
+
+def test_lazy_model_map_deserializes_on_first_access(lazy_map, calls):
+    assert len(lazy_map) == 3
+    assert list(lazy_map) == [1, 2, 3]
+    assert 2 in lazy_map
+    assert calls == []
+
+    assert lazy_map[2] is lazy_map[2]
+    assert lazy_map.get(4, "missing") == "missing"
+    assert calls == ["two"]
+
+
+def test_lazy_model_map_subset_shares_models(lazy_map, calls):
+    subset = lazy_map.subset([1, 3])
+
+    assert dict(subset) == {1: {"model": "one"}, 3: {"model": "three"}}
+    assert 2 not in subset
+    with pytest.raises(KeyError):
+        subset[2]
+    assert lazy_map[1] is subset[1]
+    assert calls == ["one", "three"]
+
+
+def test_lazy_sequence(lazy_map, calls):
+    sequence = LazySequence(lazy_map, [3, 1])
+
+    assert len(sequence) == 2
+    assert sequence[0] == {"model": "three"}
+    assert calls == ["three"]
+    assert sequence[:] == [{"model": "three"}, {"model": "one"}]
+    assert list(sequence) == sequence[:]
+
+
+@pytest.mark.django_db
+def test_feed_context_rehydrates_what_is_read(rf, mocker, blog, post_with_gallery):
+    create_missing_renditions_for_posts([post_with_gallery])
+    request = rf.get(blog.get_url())
+    request.htmx = False
+    data = FeedContext.data_for_feed_cachable(request=request, blog=blog)
+    spies = {name: mocker.spy(contexts, name) for name in ["deserialize_post", "deserialize_image"]}
+
+    repository = FeedContext.create_from_cachable_data(data=data)
+
+    assert [spy.call_count for spy in spies.values()] == [0, 0]
+    [post] = repository.post_queryset
+    assert spies["deserialize_post"].call_count == 1
+    assert spies["deserialize_image"].call_count == 0
+
+    images = post.media_lookup["image"]
+    image_pk = next(iter(images))
+    assert images[image_pk] is repository.image_by_id[image_pk]
+    assert spies["deserialize_image"].call_count == 1
@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+
+from cast import blocks
+from cast.blocks import add_image_thumbnails, get_srcset_images_for_slots
+from cast.models.image_renditions import create_renditions_for_image
+from cast.renditions import IMAGE_TYPE_TO_SLOTS, RenditionFilters
+from cast.srcset_cache import get_srcset_cache_key
+
+
+@pytest.fixture
+def srcset_cache(settings):
+    settings.CAST_SRCSET_CACHE_TIMEOUT = 60
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def renditions_by_filter_spec(image):
+    return {rendition.filter_spec: rendition for rendition in image.renditions.all()}
+
+
+@pytest.mark.django_db
+def test_srcset_images_are_built_once_until_renditions_change(srcset_cache, mocker, image):
+    build = mocker.spy(blocks, "build_srcset_images_for_slots")
+    [slot] = IMAGE_TYPE_TO_SLOTS["regular"]
+
+    first = get_srcset_images_for_slots(image, "regular", renditions={})
+    second = get_srcset_images_for_slots(image, "regular", renditions={})
+
+    assert build.call_count == 1
+    assert second[slot].src == first[slot].src == {"png": image.file.url}
+
+    filter_specs = RenditionFilters.from_wagtail_image_with_type(image=image, image_type="regular").filter_strings
+    create_renditions_for_image(image, filter_specs)
+    renditions = renditions_by_filter_spec(image)
+    get_srcset_images_for_slots(image, "regular", renditions=renditions)
+    get_srcset_images_for_slots(image, "regular", renditions=renditions)
+
+    assert build.call_count == 2
+
+
+@pytest.mark.django_db
+def test_cached_srcset_images_resolve_urls_on_every_render(srcset_cache, mocker, image):
+    # storages like S3 hand out signed URLs that expire, so none may be cached
+    storage = image.file.storage
+    url = mocker.patch.object(storage, "url", side_effect=lambda name: f"/signed-1/{name}")
+    filter_specs = RenditionFilters.from_wagtail_image_with_type(image=image, image_type="gallery").filter_strings
+    create_renditions_for_image(image, filter_specs)
+    renditions = renditions_by_filter_spec(image)
+    modal_slot = IMAGE_TYPE_TO_SLOTS["gallery"][0]
+
+    first = get_srcset_images_for_slots(image, "gallery", renditions=renditions)
+    url.side_effect = lambda name: f"/signed-2/{name}"
+    second = get_srcset_images_for_slots(image, "gallery", renditions=renditions)
+
+    assert first[modal_slot].srcset["png"].startswith("/signed-1/")
+    assert second[modal_slot].srcset["png"] == first[modal_slot].srcset["png"].replace("/signed-1/", "/signed-2/")
+    cached = cache.get(get_srcset_cache_key(image, "gallery", renditions))
+    assert not any("/signed-" in srcset for entry in cached.values() for srcset in entry.srcset.values())
+
+
+@pytest.mark.django_db
+def test_gallery_thumbnails_read_all_cached_images_at_once(srcset_cache, mocker, image):
+    build = mocker.spy(blocks, "build_srcset_images_for_slots")
+    context = {"repository": SimpleNamespace(renditions_for_posts={})}
+    images = [image, image]
+
+    add_image_thumbnails(images, context=context)
+    get_many = mocker.spy(cache, "get_many")
+    add_image_thumbnails(images, context=context)
+
+    assert build.call_count == 1
+    get_many.assert_called_once()
+    assert image.thumbnail.src == {"png": image.file.url}
+
+
+def test_srcset_cache_key_depends_on_settings(settings):
+    image = SimpleNamespace(pk=1, file=SimpleNamespace(name="original_images/test.png"), width=1, height=1)
+    key = get_srcset_cache_key(image, "gallery", {})
+
+    settings.CAST_IMAGE_FORMATS = ["jpeg"]
+
+    assert key.startswith("cast:srcset:1:gallery:")
+    assert get_srcset_cache_key(image, "gallery", {}) != key
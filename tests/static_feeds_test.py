@@ -0,0 +1,231 @@
+import os
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+
+from cast.feed_tasks import render_blog_static_feeds
+from cast.static_feeds import (
+    build_feed_request,
+    enqueue_static_feed_rendering,
+    render_static_feeds,
+    static_feed_job_key,
+    static_feed_path,
+    write_atomically,
+)
+from tests.factories import PostFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_pending_jobs():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def static_feeds_root(settings, tmp_path):
+    settings.CAST_STATIC_FEEDS_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def feed_file(site, url_name, **kwargs):
+    return static_feed_path(site.hostname, reverse(url_name, kwargs=kwargs))
+
+
+def test_static_feed_path_stays_below_root(static_feeds_root):
+    assert static_feed_path("example.com", "/blogs/test/feed/rss.xml") == (
+        static_feeds_root / "example.com" / "blogs/test/feed/rss.xml"
+    )
+    with pytest.raises(SuspiciousFileOperation):
+        static_feed_path("..", "/../rss.xml")
+
+
+def test_write_atomically_replaces_file_and_cleans_up(tmp_path, mocker):
+    path = tmp_path / "feed" / "rss.xml"
+    write_atomically(path, b"old")
+    write_atomically(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert oct(path.stat().st_mode & 0o777) == oct(0o644)
+
+    mocker.patch("cast.static_feeds.os.replace", side_effect=OSError("disk full"))
+    with pytest.raises(OSError):
+        write_atomically(path, b"newer")
+    assert path.read_bytes() == b"new"
+    assert os.listdir(path.parent) == ["rss.xml"]
+
+
+@pytest.mark.django_db
+def test_build_feed_request_uses_site_host(site):
+    site.hostname, site.port = "example.com", 443
+    request = build_feed_request(site, "/feed/rss.xml")
+    assert request.build_absolute_uri() == "https://example.com/feed/rss.xml"
+
+
+@pytest.mark.django_db
+def test_render_static_feeds_for_podcast(episode, static_feeds_root):
+    site = episode.blog.get_site()
+
+    written = render_static_feeds(episode.blog.specific)
+
+    rss = feed_file(site, "cast:podcast_feed_rss", slug=episode.blog.slug, audio_format="m4a")
+    assert rss in written
+    assert feed_file(site, "cast:latest_entries_atom_feed", slug=episode.blog.slug) in written
+    assert episode.title in rss.read_text()
+    # The test audio has no mp3 file, so that feed is left to the live view.
+    assert not feed_file(site, "cast:podcast_feed_rss", slug=episode.blog.slug, audio_format="mp3").exists()
+
+
+@pytest.mark.django_db
+def test_render_static_feeds_without_site(blog, static_feeds_root, mocker):
+    mocker.patch.object(blog, "get_site", return_value=None)
+    assert render_static_feeds(blog) == []
+
+
+@pytest.mark.django_db
+def test_feed_view_serves_static_file(client, blog, static_feeds_root):
+    path = feed_file(blog.get_site(), "cast:latest_entries_feed", slug=blog.slug)
+    write_atomically(path, b"<rss>pre-rendered</rss>")
+
+    response = client.get(reverse("cast:latest_entries_feed", kwargs={"slug": blog.slug}))
+
+    assert b"".join(response.streaming_content) == b"<rss>pre-rendered</rss>"
+    assert response["Content-Type"] == "application/rss+xml; charset=utf-8"
+
+    not_modified = client.get(
+        reverse("cast:latest_entries_feed", kwargs={"slug": blog.slug}), headers={"if-none-match": response["ETag"]}
+    )
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.django_db
+def test_feed_view_ignores_static_files_without_site(client, blog, static_feeds_root, mocker):
+    write_atomically(feed_file(blog.get_site(), "cast:latest_entries_feed", slug=blog.slug), b"<rss/>")
+    mocker.patch("cast.static_feeds.Site").find_for_request.return_value = None
+
+    response = client.get(reverse("cast:latest_entries_feed", kwargs={"slug": blog.slug}))
+
+    assert blog.title in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_feed_view_falls_back_to_live_rendering(client, blog, static_feeds_root):
+    response = client.get(reverse("cast:latest_entries_atom_feed", kwargs={"slug": blog.slug}))
+
+    assert response.status_code == 200
+    assert blog.title in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_publishing_a_post_renders_its_blog_feeds(blog, static_feeds_root, django_capture_on_commit_callbacks):
+    post = PostFactory(owner=blog.owner, parent=blog, title="fresh post", slug="fresh-post")
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save_revision().publish()
+
+    path = feed_file(blog.get_site(), "cast:latest_entries_feed", slug=blog.slug)
+    assert "fresh post" in path.read_text()
+
+
+@pytest.mark.django_db
+def test_unpublishing_a_blog_removes_its_feed_files(blog, static_feeds_root, django_capture_on_commit_callbacks):
+    render_static_feeds(blog)
+    path = feed_file(blog.get_site(), "cast:latest_entries_feed", slug=blog.slug)
+    assert path.exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        blog.unpublish()
+
+    assert not path.exists()
+
+
+@pytest.mark.django_db
+def test_publishing_does_not_render_when_disabled(blog, audio, mocker, django_capture_on_commit_callbacks):
+    enqueue = mocker.patch("cast.static_feeds.enqueue_static_feed_rendering")
+    with django_capture_on_commit_callbacks(execute=True):
+        blog.save_revision().publish()
+        audio.save()
+    enqueue.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_media_changes_render_feeds_after_commit(
+    blog, audio, static_feeds_root, mocker, django_capture_on_commit_callbacks
+):
+    enqueue = mocker.patch("cast.static_feeds.enqueue_static_feed_rendering")
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        audio.title = "renamed"
+        audio.save(duration=False)
+        enqueue.assert_not_called()
+
+    assert len(callbacks) > 0
+    enqueue.assert_called_with(blog.pk)
+
+
+@pytest.mark.django_db
+def test_rendition_changes_do_not_render_feeds(image, static_feeds_root, mocker, django_capture_on_commit_callbacks):
+    # renditions are created lazily while pages render
+    enqueue = mocker.patch("cast.static_feeds.enqueue_static_feed_rendering")
+    with django_capture_on_commit_callbacks(execute=True):
+        image.get_rendition("width-10")
+    enqueue.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_pending_feed_rendering_is_not_enqueued_again(blog, mocker):
+    task = mocker.patch("cast.feed_tasks.render_blog_static_feeds")
+
+    assert enqueue_static_feed_rendering(blog.pk) is True
+    assert enqueue_static_feed_rendering(blog.pk) is False
+
+    task.enqueue.assert_called_once_with(blog.pk)
+
+
+@pytest.mark.django_db
+def test_feed_rendering_is_released_when_enqueue_fails(blog, mocker):
+    mocker.patch("cast.feed_tasks.render_blog_static_feeds").enqueue.side_effect = RuntimeError("backend down")
+
+    with pytest.raises(RuntimeError):
+        enqueue_static_feed_rendering(blog.pk)
+
+    assert cache.get(static_feed_job_key(blog.pk)) is None
+
+
+@pytest.mark.django_db
+def test_render_task_releases_the_pending_job(blog, static_feeds_root):
+    enqueue_static_feed_rendering(blog.pk)
+
+    # the immediate backend of the tests has rendered the feeds already
+    assert cache.get(static_feed_job_key(blog.pk)) is None
+    assert feed_file(blog.get_site(), "cast:latest_entries_feed", slug=blog.slug).exists()
+
+
+@pytest.mark.django_db
+def test_feed_view_renders_live_for_requested_theme(client, blog, static_feeds_root):
+    write_atomically(feed_file(blog.get_site(), "cast:latest_entries_feed", slug=blog.slug), b"<rss/>")
+    url = reverse("cast:latest_entries_feed", kwargs={"slug": blog.slug})
+
+    response = client.get(url, {"theme": "plain"})
+
+    assert blog.title in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_render_task_ignores_deleted_blogs(mocker):
+    render = mocker.patch("cast.feed_tasks.render_static_feeds")
+    render_blog_static_feeds.call(0)
+    render.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_render_static_feeds_command(blog, static_feeds_root, capsys):
+    call_command("render_static_feeds")
+    assert "rendered=2" in capsys.readouterr().out
+    assert feed_file(blog.get_site(), "cast:latest_entries_feed", slug=blog.slug).exists()
+
+
+def test_render_static_feeds_command_requires_root(settings):
+    settings.CAST_STATIC_FEEDS_ROOT = ""
+    with pytest.raises(CommandError):
+        call_command("render_static_feeds")
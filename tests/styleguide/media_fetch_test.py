@@ -89,7 +89,7 @@ def test_styleguide_get_or_create_remote_image_and_audio(monkeypatch):
     existing = styleguide_view._get_or_create_remote_image("https://example.com/image.png", user)
     assert existing.pk == image.pk
 
-    monkeypatch.setattr(Audio, "_get_audio_duration", staticmethod(lambda _url: timedelta(seconds=1)))
+    monkeypatch.setattr(Audio, "_probe_audio_file", staticmethod(lambda _url: {"format": {"duration": "1.000000"}}))
     audio = styleguide_view._get_or_create_remote_audio("https://example.com/audio.m4a", user)
     assert audio is not None
 
@@ -120,7 +120,7 @@ def test_styleguide_get_or_create_remote_audio_existing_and_error(monkeypatch):
         return DummyResponse(b"audio-bytes")
 
     monkeypatch.setattr(styleguide_view, "urlopen", fake_urlopen)
-    monkeypatch.setattr(Audio, "_get_audio_duration", staticmethod(lambda _url: timedelta(seconds=1)))
+    monkeypatch.setattr(Audio, "_probe_audio_file", staticmethod(lambda _url: {"format": {"duration": "1.000000"}}))
     audio = styleguide_view._get_or_create_remote_audio("https://example.com/audio.m4a", user)
     assert audio is not None
     existing = styleguide_view._get_or_create_remote_audio("https://example.com/audio.m4a", user)
@@ -135,7 +135,7 @@ def test_styleguide_get_or_create_remote_audio_existing_and_error(monkeypatch):
 
 @pytest.mark.django_db
 def test_styleguide_get_or_create_remote_audio_legacy_title_migration(monkeypatch):
-    monkeypatch.setattr(Audio, "_get_audio_duration", staticmethod(lambda _url: timedelta(seconds=1)))
+    monkeypatch.setattr(Audio, "_probe_audio_file", staticmethod(lambda _url: {"format": {"duration": "1.000000"}}))
     user = create_user(name="remote-audio-legacy", password="remote-audio-legacy")
     url = "https://example.com/audio.m4a"
     legacy_title = f"Styleguide source: {url}"
@@ -153,7 +153,7 @@ def test_styleguide_get_or_create_remote_audio_legacy_title_migration(monkeypatc
 @pytest.mark.django_db
 def test_styleguide_backfill_skips_non_url_titles(monkeypatch):
     """Backfill only migrates titles where the suffix is a URL, not arbitrary text."""
-    monkeypatch.setattr(Audio, "_get_audio_duration", staticmethod(lambda _url: timedelta(seconds=1)))
+    monkeypatch.setattr(Audio, "_probe_audio_file", staticmethod(lambda _url: {"format": {"duration": "1.000000"}}))
     user = create_user(name="remote-audio-nonurl", password="remote-audio-nonurl")
     audio = Audio(user=user, title="Styleguide source: not a url")
     audio.m4a.save("safe.m4a", ContentFile(b"audio-bytes"), save=True)
@@ -168,7 +168,7 @@ def test_styleguide_backfill_skips_non_url_titles(monkeypatch):
 @pytest.mark.django_db
 def test_styleguide_get_or_create_remote_audio_updates_stale_title(monkeypatch):
     """When an existing audio is found by URL but has an outdated title, it gets updated."""
-    monkeypatch.setattr(Audio, "_get_audio_duration", staticmethod(lambda _url: timedelta(seconds=1)))
+    monkeypatch.setattr(Audio, "_probe_audio_file", staticmethod(lambda _url: {"format": {"duration": "1.000000"}}))
     user = create_user(name="remote-audio-stale", password="remote-audio-stale")
     url = "https://example.com/audio.m4a"
     audio = Audio(user=user, title="Old Title", data={"styleguide_source_url": url})
@@ -184,7 +184,7 @@ def test_styleguide_get_or_create_remote_audio_updates_stale_title(monkeypatch):
 @pytest.mark.django_db
 def test_styleguide_get_or_create_remote_audio_adopts_transitional_row(monkeypatch):
     """A row with clean title but no URL in data (from prior patch) is adopted, not duplicated."""
-    monkeypatch.setattr(Audio, "_get_audio_duration", staticmethod(lambda _url: timedelta(seconds=1)))
+    monkeypatch.setattr(Audio, "_probe_audio_file", staticmethod(lambda _url: {"format": {"duration": "1.000000"}}))
     user = create_user(name="remote-audio-trans", password="remote-audio-trans")
     url = "https://example.com/audio.m4a"
     # Simulate transitional state: clean title, no styleguide_source_url in data
@@ -201,7 +201,7 @@ def test_styleguide_get_or_create_remote_audio_adopts_transitional_row(monkeypat
 @pytest.mark.django_db
 def test_styleguide_get_or_create_remote_audio_does_not_adopt_other_users_row(monkeypatch):
     """Must not reuse or mutate another user's audio row."""
-    monkeypatch.setattr(Audio, "_get_audio_duration", staticmethod(lambda _url: timedelta(seconds=1)))
+    monkeypatch.setattr(Audio, "_probe_audio_file", staticmethod(lambda _url: {"format": {"duration": "1.000000"}}))
     other_user = create_user(name="other-user", password="other-user")
     styleguide_user = create_user(name="sg-user", password="sg-user")
     url = "https://example.com/audio.m4a"
@@ -226,7 +226,7 @@ def test_styleguide_get_or_create_remote_audio_does_not_adopt_other_users_row(mo
 @pytest.mark.django_db
 def test_styleguide_get_or_create_remote_audio_same_filename_different_urls(monkeypatch):
     """Two different URLs with the same filename must create different Audio records."""
-    monkeypatch.setattr(Audio, "_get_audio_duration", staticmethod(lambda _url: timedelta(seconds=1)))
+    monkeypatch.setattr(Audio, "_probe_audio_file", staticmethod(lambda _url: {"format": {"duration": "1.000000"}}))
     user = create_user(name="remote-audio-same-fn", password="remote-audio-same-fn")
 
     def fake_urlopen(_request, timeout=0):
@@ -10,6 +10,8 @@ from cast.transcript_sanitization import (
     apply_speaker_mapping_to_podlove_data,
     apply_speaker_mapping_to_webvtt_content,
     audio_transcript_diarization_disabled,
+    iter_sanitized_webvtt_lines,
+    iter_speaker_mapped_webvtt_lines,
     podlove_contributors_from_data,
     public_episode_from_request,
     public_one_off_speaker_labels_for_transcript,
@@ -287,3 +289,15 @@ def test_apply_speaker_mapping_to_webvtt_content_edge_cases():
     assert "Speaker 2: Unmapped prefix" in mapped
     assert "<v.loud Alice>Mapped classed voice</v>" in mapped
     assert apply_speaker_mapping_to_webvtt_content("WEBVTT\n", {}) == "WEBVTT\n"
+
+
+def test_webvtt_line_pipelines_are_lazy():
+    lines = iter(["WEBVTT\n", "\n", "00:00:00.000 --> 00:00:01.000\n", "<v Speaker 1>Hi</v>\n"])
+
+    mapped = iter_speaker_mapped_webvtt_lines(lines, {"Speaker 1": "Alice"})
+    sanitized = iter_sanitized_webvtt_lines(mapped, {"Alice"})
+
+    assert next(sanitized) == "WEBVTT\n"
+    assert list(lines) == ["\n", "00:00:00.000 --> 00:00:01.000\n", "<v Speaker 1>Hi</v>\n"]
+    assert list(iter_speaker_mapped_webvtt_lines(["a\n"], {})) == ["a\n"]
+    assert list(iter_sanitized_webvtt_lines(["a\n"], None)) == ["a\n"]
@@ -267,7 +267,7 @@ class TestGetTranscriptAsJson:
         assert podcastindex_response.status_code == 200
         assert [segment["speaker"] for segment in podcastindex_response.json()["segments"]] == ["", ""]
         assert vtt_response.status_code == 200
-        assert vtt_response.content.decode("utf-8") == (
+        assert vtt_response.getvalue().decode("utf-8") == (
             "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nLive speaker\n\n00:00:01.000 --> 00:00:02.000\nGeneric speaker\n"
         )
         assert html_response.status_code == 200
@@ -373,7 +373,7 @@ class TestGetTranscriptAsJson:
             "",
         ]
         assert vtt_response.status_code == 200
-        vtt_content = vtt_response.content.decode("utf-8")
+        vtt_content = vtt_response.getvalue().decode("utf-8")
         assert "<v Alice>Alice line</v>" in vtt_content
         assert "Guest Voice: Guest line" in vtt_content
         assert "Speaker 3" not in vtt_content
@@ -235,7 +235,7 @@ class TestGetTranscriptAsWebVtt:
         assert r.status_code == 200
 
         # Then we get the transcript in the expected format
-        content = r.content.decode("utf-8")
+        content = r.getvalue().decode("utf-8")
         assert content == vtt
 
     def test_get_transcript_as_vtt_sanitizes_generated_speaker_labels(self, client, episode):
@@ -258,7 +258,7 @@ class TestGetTranscriptAsWebVtt:
         response = client.get(url)
 
         assert response.status_code == 200
-        content = response.content.decode("utf-8")
+        content = response.getvalue().decode("utf-8")
         assert "Live Host: Hallo" in content
         assert "Speaker 1" not in content
         assert "Unmapped speaker" in content
@@ -0,0 +1,195 @@
+import pytest
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.db.models.fields.files import FieldFile
+from django.test import RequestFactory
+from django.urls import reverse
+
+from cast import appsettings
+from cast.api.views import EMPTY_CUES_ETAG
+from cast.devdata import create_transcript
+from cast.models import Contributor, EpisodeContributor, TranscriptSpeakerMapping
+from cast.transcripts import public
+
+PODLOVE = {
+    "transcripts": [{"start": "00:00:00.000", "start_ms": 0, "end_ms": 1000, "speaker": "Speaker 1", "text": "Hi"}]
+}
+DOTE = {
+    "lines": [
+        {"startTime": "00:00:00,000", "endTime": "00:00:01,000", "speakerDesignation": "Speaker 1", "text": "Hi"}
+    ]
+}
+VTT = "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\n<v Speaker 1>Hi</v>\n"
+# unmapped speaker labels are not public
+PUBLIC_VTT = "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHi\n"
+
+ENDPOINTS = ["cast:podlove-transcript-json", "cast:podcastindex-transcript-json", "cast:webvtt-transcript"]
+
+
+@pytest.fixture(autouse=True)
+def clear_transcript_cache():
+    cache = caches[appsettings.CAST_REPOSITORY_CACHE_ALIAS]
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def transcript_cache(settings):
+    settings.CAST_TRANSCRIPT_CACHE_TIMEOUT = 60
+
+
+@pytest.fixture
+def transcript(episode):
+    return create_transcript(audio=episode.podcast_audio, podlove=PODLOVE, dote=DOTE, vtt=VTT)
+
+
+def fail_on_open(*args, **kwargs):
+    raise AssertionError("the transcript artifact must not be read")
+
+
+def approve_mapping(transcript, contributor):
+    mapping = transcript.speaker_mappings.get(speaker_label="Speaker 1")
+    mapping.contributor = contributor
+    mapping.review_state = TranscriptSpeakerMapping.ReviewState.APPROVED
+    mapping.source_artifact_fingerprint = transcript.transcript_artifact_fingerprint()
+    mapping.save()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_not_modified_without_reading_the_artifact(client, transcript, endpoint, monkeypatch):
+    url = reverse(endpoint, kwargs={"pk": transcript.pk})
+    first = client.get(url)
+    assert first.status_code == 200
+
+    monkeypatch.setattr(FieldFile, "open", fail_on_open)
+    response = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert response.status_code == 304
+    assert response["ETag"] == first["ETag"]
+
+
+@pytest.mark.django_db
+def test_etag_follows_speaker_mapping_and_contributor_visibility(client, episode, transcript):
+    url = reverse("cast:webvtt-transcript", kwargs={"pk": transcript.pk})
+    unmapped = client.get(url)
+    contributor = Contributor.objects.create(display_name="Alice", slug="alice")
+    EpisodeContributor.objects.create(episode=episode, contributor=contributor, role=EpisodeContributor.ROLE_HOST)
+    approve_mapping(transcript, contributor)
+
+    mapped = client.get(url, HTTP_IF_NONE_MATCH=unmapped["ETag"])
+    assert mapped.status_code == 200
+    assert "<v Alice>Hi</v>" in mapped.getvalue().decode("utf-8")
+
+    contributor.visible = False
+    contributor.save()
+    hidden = client.get(url, HTTP_IF_NONE_MATCH=mapped["ETag"])
+    assert hidden.status_code == 200
+    assert "Alice" not in hidden.getvalue().decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_etag_follows_artifact_changes(client, transcript):
+    url = reverse("cast:podlove-transcript-json", kwargs={"pk": transcript.pk})
+    first = client.get(url)
+    transcript.podlove.save("podlove.json", ContentFile('{"transcripts": []}'))
+    transcript.save()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert response.status_code == 200
+    assert response.json() == {"transcripts": []}
+
+
+@pytest.mark.django_db
+def test_cached_output_is_shared_between_requests(client, transcript, transcript_cache, mocker):
+    build = mocker.spy(public, "build_public_webvtt_content")
+    url = reverse("cast:webvtt-transcript", kwargs={"pk": transcript.pk})
+
+    first = client.get(url)
+    second = client.get(url)
+
+    assert build.call_count == 1
+    assert first.content == second.content
+
+
+@pytest.mark.django_db
+def test_webvtt_is_streamed_without_cache_timeout(client, transcript, mocker):
+    build = mocker.spy(public, "build_public_webvtt_content")
+    url = reverse("cast:webvtt-transcript", kwargs={"pk": transcript.pk})
+
+    response = client.get(url)
+
+    assert response.streaming
+    assert response.getvalue().decode("utf-8") == PUBLIC_VTT
+    build.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_streamed_webvtt_closes_the_file(transcript):
+    lines = public.stream_public_webvtt_content(transcript)
+    lines.close()
+
+    assert transcript.vtt.closed
+    assert "".join(public.stream_public_webvtt_content(transcript)) == PUBLIC_VTT
+
+
+@pytest.mark.django_db
+def test_invalid_artifact_is_not_cached(client, episode, transcript_cache):
+    transcript = create_transcript(audio=episode.podcast_audio)
+    transcript.podlove.save("podlove.json", ContentFile("not valid json"))
+    transcript.save()
+    url = reverse("cast:podlove-transcript-json", kwargs={"pk": transcript.pk})
+
+    assert client.get(url).status_code == 400
+    assert client.get(url).status_code == 400
+
+
+@pytest.mark.django_db
+def test_html_transcript_falls_back_to_empty_data_for_missing_file(client, episode, transcript):
+    transcript.podlove.storage.delete(transcript.podlove.name)
+    url = reverse("cast:episode-transcript", kwargs={"blog_slug": episode.blog.slug, "episode_slug": episode.slug})
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_player_cues_not_modified_without_reading_the_artifact(client, episode, transcript, monkeypatch):
+    url = reverse("cast:api:audio_player_transcript", kwargs={"pk": episode.podcast_audio.pk})
+    first = client.get(url, {"post_id": episode.pk})
+    assert first.json()["cues"][0]["text"] == "Hi"
+
+    monkeypatch.setattr(FieldFile, "open", fail_on_open)
+    response = client.get(url, {"post_id": episode.pk}, HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_player_cues_without_transcript(client, episode):
+    url = reverse("cast:api:audio_player_transcript", kwargs={"pk": episode.podcast_audio.pk})
+
+    response = client.get(url, {"post_id": episode.pk})
+
+    assert response.json() == {"cues": []}
+    assert response["ETag"] == EMPTY_CUES_ETAG
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", "abc"', True),
+        ("*", True),
+        ('"other"', False),
+        ("", False),
+    ],
+)
+def test_etag_matches(header, matches):
+    request = RequestFactory().get("/", HTTP_IF_NONE_MATCH=header)
+
+    assert public.etag_matches(request, '"abc"') is matches
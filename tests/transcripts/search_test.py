@@ -0,0 +1,236 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db.models.fields.files import FieldFile
+from django.urls import reverse
+
+from cast.devdata import create_transcript
+from cast.models import Audio, Episode, TranscriptSearchTerm, TranscriptSegment
+from cast.transcript_tasks import rebuild_transcript_search_index_task
+from cast.transcripts.search import matching_segments, search_transcripts, tokenize
+from tests.factories import EpisodeFactory
+
+
+@pytest.fixture(autouse=True)
+def index_without_transaction(mocker):
+    # The index is rebuilt when the transaction commits, which never happens inside a test.
+    mocker.patch("cast.models.transcript.transaction.on_commit", side_effect=lambda callback: callback())
+
+
+def podlove(*texts):
+    return {
+        "transcripts": [
+            {"start": f"00:00:{second:02d}.000", "start_ms": second * 1000, "speaker": "Speaker 1", "text": text}
+            for second, text in enumerate(texts)
+        ]
+    }
+
+
+def segment_texts(segments):
+    return [segment.text for segment in segments.order_by("transcript_id", "position")]
+
+
+def add_episode(podcast, user, number, *texts):
+    audio = Audio.objects.create(user=user, title=f"audio {number}")
+    episode = EpisodeFactory(
+        owner=podcast.owner,
+        parent=podcast,
+        title=f"episode {number}",
+        slug=f"episode-{number}",
+        podcast_audio=audio,
+        visible_date=datetime(2024, 1, number, tzinfo=timezone.utc),
+    )
+    create_transcript(audio=audio, podlove=podlove(*texts))
+    return episode
+
+
+def test_tokenize():
+    assert tokenize("Hello, hello World! Grüße 42") == ["hello", "world", "grüsse", "42"]
+    assert tokenize("  ... ") == []
+
+
+@pytest.mark.django_db
+def test_segments_are_indexed_when_artifacts_change(episode):
+    transcript = create_transcript(audio=episode.podcast_audio, podlove=podlove("Django tasks", "", "Wagtail pages"))
+
+    assert list(transcript.search_segments.values_list("start_ms", "text")) == [
+        (0, "Django tasks"),
+        (2000, "Wagtail pages"),
+    ]
+    assert set(TranscriptSearchTerm.objects.values_list("term", flat=True)) == {"django", "tasks", "wagtail", "pages"}
+
+    transcript.podlove.save("podlove.json", ContentFile('{"transcripts": [{"start": "00:01:00.000", "text": "New"}]}'))
+    transcript.save()
+
+    assert list(transcript.search_segments.values_list("start_ms", "text")) == [(60000, "New")]
+
+
+@pytest.mark.django_db
+def test_segments_are_indexed_after_commit(episode, mocker, django_capture_on_commit_callbacks):
+    mocker.stopall()
+    with django_capture_on_commit_callbacks(execute=True):
+        transcript = create_transcript(audio=episode.podcast_audio, podlove=podlove("After commit"))
+        assert not transcript.search_segments.exists()
+
+    assert list(transcript.search_segments.values_list("text", flat=True)) == ["After commit"]
+
+
+@pytest.mark.django_db
+def test_rebuild_task_ignores_deleted_transcripts(mocker):
+    rebuild = mocker.patch("cast.models.transcript.Transcript.rebuild_search_index")
+    rebuild_transcript_search_index_task.call(0)
+    rebuild.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_speaker_labels_are_not_indexed(episode):
+    transcript = create_transcript(
+        audio=episode.podcast_audio,
+        podlove=podlove("Speaker 2: Hello there", "<v Speaker 3>Voice</v> tags", "Named: stays", None),
+    )
+
+    assert list(transcript.search_segments.order_by("position").values_list("text", flat=True)) == [
+        "Hello there",
+        "Voice tags",
+        "Named: stays",
+    ]
+    assert not TranscriptSearchTerm.objects.filter(term="speaker").exists()
+
+
+@pytest.mark.django_db
+def test_search_index_rows_str(episode):
+    transcript = create_transcript(audio=episode.podcast_audio, podlove=podlove("Django"))
+    segment = transcript.search_segments.get()
+
+    assert str(segment) == f"{transcript.pk}: 0"
+    assert str(segment.search_terms.get()) == "django"
+
+
+@pytest.mark.django_db
+def test_saving_without_artifact_changes_keeps_the_index(episode, mocker):
+    transcript = create_transcript(audio=episode.podcast_audio, podlove=podlove("Django tasks"))
+    rebuild = mocker.patch("cast.transcripts.search.rebuild_transcript_search_index")
+
+    transcript.save()
+
+    rebuild.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_dote_is_indexed_without_podlove(episode):
+    transcript = create_transcript(
+        audio=episode.podcast_audio,
+        dote={
+            "lines": [
+                {
+                    "startTime": "00:00:01,500",
+                    "endTime": "00:00:02,000",
+                    "speakerDesignation": "",
+                    "text": "From DOTe",
+                },
+                {"startTime": "invalid", "text": "skipped"},
+                "not a line",
+            ]
+        },
+    )
+
+    assert list(transcript.search_segments.values_list("start_ms", "text")) == [(1500, "From DOTe")]
+
+
+@pytest.mark.django_db
+def test_unreadable_artifacts_index_nothing(episode):
+    transcript = create_transcript(audio=episode.podcast_audio, podlove={"transcripts": ["not a segment"]})
+    assert not transcript.search_segments.exists()
+
+    transcript.podlove.save("podlove.json", ContentFile("not json"))
+    transcript.save()
+    assert not transcript.search_segments.exists()
+
+
+@pytest.mark.django_db
+def test_matching_segments(episode):
+    create_transcript(audio=episode.podcast_audio, podlove=podlove("Django tasks", "Django pages", "Tasks only"))
+
+    assert segment_texts(matching_segments("django")) == ["Django tasks", "Django pages"]
+    assert segment_texts(matching_segments("TASKS django")) == ["Django tasks"]
+    assert segment_texts(matching_segments("django pa")) == ["Django pages"]
+    assert segment_texts(matching_segments("?!")) == []
+
+
+@pytest.mark.django_db
+def test_search_does_not_read_transcript_files(podcast, user, monkeypatch):
+    add_episode(podcast, user, 1, "Django tasks")
+
+    def fail_on_open(*args, **kwargs):
+        raise AssertionError("transcript files must not be read")
+
+    monkeypatch.setattr(FieldFile, "open", fail_on_open)
+    results = search_transcripts("tasks", episodes=Episode.objects.live())
+
+    assert [hit.text for hit in results[0].hits] == ["Django tasks"]
+
+
+@pytest.mark.django_db
+def test_search_orders_and_limits_results(podcast, user):
+    older = add_episode(podcast, user, 1, "Django one", "Django two", "Django three")
+    newer = add_episode(podcast, user, 2, "Django four")
+    add_episode(podcast, user, 3, "Wagtail")
+
+    results = search_transcripts("django", episodes=Episode.objects.live(), max_hits_per_episode=2)
+
+    assert [result.episode for result in results] == [newer, older]
+    assert [(hit.start_ms, hit.text) for hit in results[1].hits] == [(0, "Django one"), (1000, "Django two")]
+    assert len(search_transcripts("django", episodes=Episode.objects.live(), max_episodes=1)) == 1
+    assert search_transcripts("django", episodes=Episode.objects.none()) == []
+
+
+@pytest.mark.django_db
+class TestTranscriptSearchView:
+    url = reverse("cast:api:transcript_search")
+
+    def test_returns_time_coded_hits(self, client, podcast, user):
+        episode = add_episode(podcast, user, 1, "Hello", "Django tasks")
+
+        response = client.get(self.url, {"q": "django", "podcast": podcast.pk})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "results": [
+                {
+                    "episode": {"id": episode.pk, "title": "episode 1", "url": episode.get_full_url()},
+                    "hits": [{"start": 1.0, "text": "Django tasks"}],
+                }
+            ]
+        }
+
+    def test_only_live_episodes_are_searched(self, client, podcast, user):
+        episode = add_episode(podcast, user, 1, "Django tasks")
+        episode.unpublish()
+
+        assert client.get(self.url, {"q": "django"}).json() == {"results": []}
+
+    @pytest.mark.parametrize("podcast_id", ["abc", "999999"])
+    def test_invalid_podcast(self, client, podcast_id):
+        response = client.get(self.url, {"q": "django", "podcast": podcast_id})
+
+        assert response.status_code == 400
+        assert response.json() == {"error": "Invalid podcast"}
+
+
+@pytest.mark.django_db
+def test_rebuild_transcript_search_index_command(episode, capsys):
+    transcript = create_transcript(audio=episode.podcast_audio, podlove=podlove("Django tasks", "Wagtail"))
+    TranscriptSegment.objects.all().delete()
+
+    call_command("rebuild_transcript_search_index", "--missing")
+    call_command("rebuild_transcript_search_index", "--missing")
+    call_command("rebuild_transcript_search_index")
+
+    assert capsys.readouterr().out.splitlines() == [
+        "transcripts=1 segments=2",
+        "transcripts=0 segments=0",
+        "transcripts=1 segments=2",
+    ]
+    assert transcript.search_segments.count() == 2
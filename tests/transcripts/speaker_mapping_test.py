@@ -141,6 +141,88 @@ class TestTranscriptSpeakerMapping:
         assert transcript.get_speaker_labels() == ["Speaker 1", "Speaker 2", "Speaker 3"]
         assert transcript.transcript_artifact_fingerprint() == expected_fingerprint
 
+    def test_transcript_artifact_fingerprint_is_stored_on_save(self, audio):
+        transcript = create_transcript(audio=audio, podlove={"transcripts": [{"speaker": "Speaker 1"}]})
+        expected_fingerprint = transcript.compute_transcript_artifact_fingerprint()
+
+        transcript = Transcript.objects.get(pk=transcript.pk)
+        assert transcript.artifact_fingerprint == expected_fingerprint
+        with patch.object(Transcript, "_read_file_bytes") as read_file_bytes:
+            assert transcript.transcript_artifact_fingerprint() == expected_fingerprint
+        read_file_bytes.assert_not_called()
+
+    def test_transcript_artifact_fingerprint_follows_replaced_artifacts(self, audio):
+        transcript = create_transcript(audio=audio, podlove={"transcripts": [{"speaker": "Speaker 1"}]})
+        stored_fingerprint = transcript.artifact_fingerprint
+
+        transcript._save_json_file("podlove", {"transcripts": [{"speaker": "Speaker 2"}]})
+        changed_fingerprint = transcript.transcript_artifact_fingerprint()
+        assert changed_fingerprint != stored_fingerprint
+        assert Transcript.objects.get(pk=transcript.pk).artifact_fingerprint == stored_fingerprint
+
+        transcript.save(update_fields=["podlove"])
+        assert Transcript.objects.get(pk=transcript.pk).artifact_fingerprint == changed_fingerprint
+
+        transcript.save(update_fields=["collection"])
+        assert Transcript.objects.get(pk=transcript.pk).artifact_fingerprint == changed_fingerprint
+
+    def test_transcript_artifact_fingerprint_follows_overwritten_artifacts(
+        self, audio, django_capture_on_commit_callbacks
+    ):
+        transcript = create_transcript(audio=audio, vtt="WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello\n")
+        stored_fingerprint = transcript.artifact_fingerprint
+        transcript = Transcript.objects.get(pk=transcript.pk)
+
+        # an overwriting storage keeps the name of the replaced file
+        name = transcript.vtt.name
+        transcript.vtt.storage.delete(name)
+        transcript.vtt.storage.save(name, ContentFile(b"WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nChanged\n"))
+        transcript.vtt = name
+        assert transcript.transcript_artifact_fingerprint() != stored_fingerprint
+
+        with (
+            patch.object(Transcript, "rebuild_search_index") as rebuild_search_index,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            transcript.save()
+        rebuild_search_index.assert_called_once()
+        assert transcript.artifact_fingerprint == transcript.compute_transcript_artifact_fingerprint()
+        assert Transcript.objects.get(pk=transcript.pk).artifact_fingerprint != stored_fingerprint
+
+    def test_transcript_artifact_fingerprint_reads_uncommitted_uploads(self, audio):
+        transcript = create_transcript(audio=audio, vtt="WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello\n")
+        stored_fingerprint = transcript.artifact_fingerprint
+
+        transcript.vtt = ContentFile(b"WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nUploaded\n", name="upload.vtt")
+        transcript.save()
+
+        assert transcript.artifact_fingerprint != stored_fingerprint
+        assert transcript.artifact_fingerprint == transcript.compute_transcript_artifact_fingerprint()
+
+    def test_reassigning_unchanged_artifacts_keeps_the_search_index(self, audio):
+        transcript = create_transcript(audio=audio, vtt="WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello\n")
+        transcript.refresh_from_db()
+        transcript.vtt = transcript.vtt.name
+
+        with patch.object(Transcript, "rebuild_search_index") as rebuild_search_index:
+            transcript.save()
+
+        rebuild_search_index.assert_not_called()
+        transcript.refresh_from_db(fields=["vtt"])
+        assert transcript._assigned_artifact_fields == {"vtt"}
+
+    def test_transcript_artifact_fingerprint_is_backfilled_once(self, audio):
+        transcript = create_transcript(audio=audio, vtt="WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello\n")
+        expected_fingerprint = transcript.artifact_fingerprint
+        Transcript.objects.filter(pk=transcript.pk).update(artifact_fingerprint=None)
+
+        transcript = Transcript.objects.get(pk=transcript.pk)
+        assert transcript.transcript_artifact_fingerprint() == expected_fingerprint
+        assert Transcript.objects.get(pk=transcript.pk).artifact_fingerprint == expected_fingerprint
+
+        deferred = Transcript.objects.defer("vtt").get(pk=transcript.pk)
+        assert deferred.transcript_artifact_fingerprint() == expected_fingerprint
+
     def test_speaker_mapping_uniqueness_is_per_transcript_label(self, audio):
         transcript = create_transcript(audio=audio, podlove={"transcripts": [{"speaker": "Speaker 1"}]})
         other_transcript = create_transcript(podlove={"transcripts": [{"speaker": "Speaker 1"}]})
@@ -0,0 +1,309 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from cast.models import Audio, Transcript
+from cast.voxhelm import TranscriptSubmission, VoxhelmError
+from cast.voxhelm.batch import TranscriptBatch, TranscriptBatchItem, TranscriptBatchState
+
+PODLOVE_ARTIFACT = b'{"transcripts": [{"text": "done"}]}'
+DOTE_ARTIFACT = (
+    b'{"lines": [{"startTime": "00:00:00,000", "endTime": "00:00:00,100", "speakerDesignation": "", "text": "done"}]}'
+)
+VTT_ARTIFACT = b"WEBVTT\n\n00:00:00.000 --> 00:00:00.100\ndone\n"
+ARTIFACTS = {"podlove": PODLOVE_ARTIFACT, "dote": DOTE_ARTIFACT, "vtt": VTT_ARTIFACT}
+
+
+class FakeVoxhelm(ThreadingHTTPServer):
+    """A local Voxhelm API whose jobs succeed after ``polls_until_done`` status requests."""
+
+    def __init__(self, *, polls_until_done=2, failing_audio_ids=()):
+        super().__init__(("127.0.0.1", 0), FakeVoxhelmHandler)
+        self.polls_until_done = polls_until_done
+        self.failing_audio_ids = set(failing_audio_ids)
+        self.jobs = {}
+        self.submitted_audio_ids = []
+        self.max_active_jobs = 0
+        self.lock = threading.Lock()
+
+    @property
+    def api_base(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_job(self, audio_id, *, polls=0):
+        with self.lock:
+            job_id = f"job-{len(self.jobs) + 1}"
+            self.jobs[job_id] = {"audio_id": audio_id, "polls": polls}
+            active = sum(1 for job in self.jobs.values() if job["polls"] < self.polls_until_done)
+            self.max_active_jobs = max(self.max_active_jobs, active)
+            return job_id
+
+    def job_payload(self, job_id):
+        job = self.jobs[job_id]
+        if job["polls"] < self.polls_until_done:
+            return {"id": job_id, "state": "running"}
+        if job["audio_id"] in self.failing_audio_ids:
+            return {"id": job_id, "state": "failed", "error": {"message": "no speech"}}
+        artifacts = {name: f"/artifacts/{job_id}/{name}" for name in ARTIFACTS}
+        return {"id": job_id, "state": "succeeded", "result": {"artifacts": artifacts}}
+
+
+class FakeVoxhelmHandler(BaseHTTPRequestHandler):
+    server: FakeVoxhelm
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        audio_id = payload["context"]["audio_id"]
+        self.server.submitted_audio_ids.append(audio_id)
+        job_id = self.server.add_job(audio_id)
+        self.send_json({"id": job_id, "state": "queued"})
+
+    def do_GET(self):
+        if match := re.fullmatch(r"/v1/jobs/(?P<job_id>[\w-]+)", self.path):
+            job = self.server.jobs[match["job_id"]]
+            job["polls"] += 1
+            self.send_json(self.server.job_payload(match["job_id"]))
+        else:
+            self.send_bytes(ARTIFACTS[self.path.rsplit("/", 1)[-1]])
+
+    def send_json(self, payload):
+        self.send_bytes(json.dumps(payload).encode("utf-8"))
+
+    def send_bytes(self, body):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_voxhelm(settings):
+    server = FakeVoxhelm()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.MEDIA_URL = "https://media.example.com/"
+    settings.CAST_VOXHELM_API_BASE = server.api_base
+    settings.CAST_VOXHELM_API_KEY = "secret"
+    settings.CAST_VOXHELM_POLL_INTERVAL = 0
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def audios(user):
+    audios = []
+    for number in range(5):
+        audio = Audio(user=user, title=f"episode {number}", m4a=f"cast_audio/episode-{number}.m4a")
+        audio.save(duration=False, cache_file_sizes=False)
+        audios.append(audio)
+    return audios
+
+
+def audio_id_options(audios):
+    return [option for audio in audios for option in ("--audio-id", str(audio.pk))]
+
+
+@pytest.mark.django_db
+def test_generate_transcripts_keeps_concurrency_jobs_in_flight(fake_voxhelm, audios, tmp_path):
+    state_file = tmp_path / "state.json"
+    output = StringIO()
+
+    call_command(
+        "generate_transcripts",
+        *audio_id_options(audios),
+        "--concurrency",
+        "3",
+        "--state-file",
+        str(state_file),
+        stdout=output,
+    )
+
+    assert fake_voxhelm.max_active_jobs == 3
+    assert sorted(fake_voxhelm.submitted_audio_ids) == [audio.pk for audio in audios]
+    assert Transcript.objects.filter(audio__in=audios).count() == 5
+    assert "processed=5 created=5 updated=0 skipped=0 errors=0" in output.getvalue()
+    state = json.loads(state_file.read_text())
+    assert {entry["state"] for entry in state["audios"].values()} == {"done"}
+
+
+@pytest.mark.django_db
+def test_generate_transcripts_resumes_from_state_file(fake_voxhelm, audios, tmp_path):
+    done, submitted, failed = audios[:3]
+    running_job_id = fake_voxhelm.add_job(submitted.pk)
+    state_file = tmp_path / "state.json"
+    state_file.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "audios": {
+                    str(done.pk): {"state": "done", "job_id": "job-old", "transcript_id": 1},
+                    str(submitted.pk): {
+                        "state": "submitted",
+                        "job_id": running_job_id,
+                        "source_url": "https://media.example.com/cast_audio/episode-1.m4a",
+                    },
+                    str(failed.pk): {"state": "failed", "job_id": "", "error": "boom"},
+                },
+            }
+        )
+    )
+    output = StringIO()
+
+    call_command("generate_transcripts", *audio_id_options(audios[:3]), "--state-file", str(state_file), stdout=output)
+
+    assert fake_voxhelm.submitted_audio_ids == [failed.pk]
+    assert f"skipped audio={done.pk} state=done" in output.getvalue()
+    assert "processed=3 created=2 updated=0 skipped=1 errors=0" in output.getvalue()
+    state = json.loads(state_file.read_text())
+    assert state["audios"][str(submitted.pk)]["job_id"] == running_job_id
+    assert state["audios"][str(failed.pk)]["state"] == "done"
+
+
+@pytest.mark.django_db
+def test_generate_transcripts_reports_failed_batch_jobs(fake_voxhelm, audios, tmp_path):
+    fake_voxhelm.failing_audio_ids = {audios[0].pk}
+    state_file = tmp_path / "state.json"
+    output = StringIO()
+    error_output = StringIO()
+
+    with pytest.raises(CommandError, match="1 transcript generations failed"):
+        call_command(
+            "generate_transcripts",
+            *audio_id_options(audios[:2]),
+            "--concurrency",
+            "2",
+            "--state-file",
+            str(state_file),
+            stdout=output,
+            stderr=error_output,
+        )
+
+    assert f"error audio={audios[0].pk}: " in error_output.getvalue()
+    assert "processed=2 created=1 updated=0 skipped=0 errors=1" in output.getvalue()
+    assert json.loads(state_file.read_text())["audios"][str(audios[0].pk)]["state"] == "failed"
+
+
+def test_generate_transcripts_rejects_invalid_concurrency():
+    with pytest.raises(CommandError, match="--concurrency must be at least 1"):
+        call_command("generate_transcripts", "--audio-id", "1", "--concurrency", "0")
+
+
+def test_generate_transcripts_rejects_invalid_state_file(tmp_path):
+    state_file = tmp_path / "state.json"
+    state_file.write_text("not json")
+
+    with pytest.raises(CommandError, match="Could not read transcript batch state file"):
+        call_command("generate_transcripts", "--audio-id", "1", "--state-file", str(state_file))
+
+
+@pytest.mark.parametrize("data", [[], {"version": 2, "audios": {}}, {"version": 1, "audios": []}])
+def test_batch_state_rejects_unsupported_files(tmp_path, data):
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps(data))
+
+    with pytest.raises(VoxhelmError, match="Unsupported transcript batch state file"):
+        TranscriptBatchState.load(state_file)
+
+
+def test_batch_state_starts_empty_and_saves_atomically(tmp_path):
+    state_file = tmp_path / "state.json"
+    state = TranscriptBatchState.load(state_file)
+
+    assert state.get(1) == {}
+    state.update(1, state=TranscriptBatchState.DONE)
+
+    assert TranscriptBatchState.load(state_file).is_done(1)
+    assert [path.name for path in tmp_path.iterdir()] == ["state.json"]
+
+
+class StubClient:
+    poll_interval_seconds = 5.0
+    job_timeout_seconds = 5.0
+
+    def __init__(self, job_payloads):
+        self.job_payloads = job_payloads
+
+    def get_job(self, job_id):
+        payload = self.job_payloads.pop(0)
+        if isinstance(payload, Exception):
+            raise payload
+        return payload
+
+
+class StubService:
+    def __init__(self, client, *, submit_error=None, submit_payload=None):
+        self.client = client
+        self.submit_error = submit_error
+        self.submit_payload = submit_payload or {}
+
+    def submit_for_audio(self, audio, *, task_ref, episode):
+        if self.submit_error is not None:
+            raise self.submit_error
+        return TranscriptSubmission(
+            job_id="job-1", source_url="https://example.com/a.m4a", task_ref=task_ref, job_payload=self.submit_payload
+        )
+
+    def complete_audio_job(self, audio, *, job_id, source_url, initial_job_payload):
+        raise VoxhelmError(f"Voxhelm job {job_id} ended in state {initial_job_payload['state']}.")
+
+
+def batch_item(pk=1):
+    return TranscriptBatchItem(audio=SimpleNamespace(pk=pk), task_ref=f"cast-audio-{pk}")
+
+
+def test_batch_keeps_job_submitted_when_polling_fails_or_times_out():
+    now = [0.0]
+    waits = []
+
+    def wait(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    client = StubClient([VoxhelmError("connection refused"), {"state": "running"}, {"state": "running"}])
+    state = TranscriptBatchState()
+    batch = TranscriptBatch(StubService(client), concurrency=1, state=state, clock=lambda: now[0], wait=wait)
+
+    [unreachable] = batch.run([batch_item()])
+    [timed_out] = batch.run([batch_item()])
+
+    assert str(unreachable.error) == "connection refused"
+    assert str(timed_out.error) == "Timed out waiting for Voxhelm job job-1."
+    assert waits == [5.0]
+    assert state.get(1)["state"] == TranscriptBatchState.SUBMITTED
+
+
+def test_batch_marks_failed_submissions():
+    state = TranscriptBatchState()
+    batch = TranscriptBatch(
+        StubService(StubClient([]), submit_error=VoxhelmError("no source")), concurrency=2, state=state
+    )
+
+    [outcome] = batch.run([batch_item()])
+
+    assert str(outcome.error) == "no source"
+    assert state.get(1) == {"state": TranscriptBatchState.FAILED, "job_id": "", "error": "no source"}
+
+
+def test_batch_completes_jobs_that_are_terminal_on_submission():
+    state = TranscriptBatchState()
+    client = StubClient([])
+    batch = TranscriptBatch(
+        StubService(client, submit_payload={"id": "job-1", "state": "failed"}), concurrency=1, state=state
+    )
+
+    [outcome] = batch.run([batch_item()])
+
+    assert str(outcome.error) == "Voxhelm job job-1 ended in state failed."
+    assert state.get(1)["job_id"] == "job-1"
+    assert state.get(1)["state"] == TranscriptBatchState.FAILED
@@ -1,6 +1,7 @@
 # ruff: noqa: F401,F811,I001
 import io
 import json
+from datetime import timedelta
 from types import SimpleNamespace
 from urllib.error import HTTPError
 from urllib.error import URLError
@@ -10,11 +11,19 @@ import pytest
 from django.core.exceptions import ImproperlyConfigured
 from django.test import RequestFactory
 from django.urls import reverse
+from django.utils import timezone
+from django_tasks import TaskResultStatus
+from django_tasks.exceptions import TaskResultDoesNotExist
 from wagtail.models import Collection
 
 from cast.devdata import create_transcript
 from cast.models import Audio, Contributor, EpisodeContributor, TranscriptGeneration, VoxhelmSettings
-from cast.voxhelm_tasks import complete_transcript_generation
+from cast.voxhelm_tasks import (
+    complete_transcript_generation,
+    has_pending_poll,
+    next_poll_delay,
+    schedule_transcript_poll,
+)
 from tests.factories import EpisodeFactory
 from cast.voxhelm import (
     NoRedirectHandler,
@@ -413,10 +422,9 @@ def test_complete_transcript_generation_marks_success_and_calls_service(mocker,
 
     generation.refresh_from_db()
     assert generation.status == TranscriptGeneration.Status.SUCCEEDED
-    service.complete_audio_job.assert_called_once_with(
-        audio,
-        job_id="job-42",
-        source_url="https://media.example.com/audio.m4a",
+    service.fetch_job_artifacts.assert_called_once_with(job_id="job-42")
+    service.store_job_artifacts.assert_called_once_with(
+        audio, service.fetch_job_artifacts.return_value, source_url="https://media.example.com/audio.m4a"
     )
 
 
@@ -444,7 +452,7 @@ def test_complete_transcript_generation_marks_failure_on_exception(mocker, audio
         source_url="https://media.example.com/audio.m4a",
     )
     service = mocker.Mock()
-    service.complete_audio_job.side_effect = VoxhelmError("worker broke")
+    service.fetch_job_artifacts.side_effect = VoxhelmError("worker broke")
     mocker.patch("cast.voxhelm_tasks.VoxhelmTranscriptService", return_value=service)
 
     with pytest.raises(VoxhelmError, match="worker broke"):
@@ -455,6 +463,280 @@ def test_complete_transcript_generation_marks_failure_on_exception(mocker, audio
     assert generation.error_message == "worker broke"
 
 
+@pytest.mark.django_db
+def test_complete_transcript_generation_does_not_store_artifacts_of_finished_generation(mocker, audio):
+    generation = running_generation(audio)
+
+    def finish_during_download(**kwargs):
+        # the callback run stored the artifacts while this run downloaded them
+        TranscriptGeneration.objects.filter(pk=generation.pk).update(status=TranscriptGeneration.Status.SUCCEEDED)
+        return mocker.sentinel.artifacts
+
+    service = mocker.Mock()
+    service.fetch_job_artifacts.side_effect = finish_during_download
+    mocker.patch("cast.voxhelm_tasks.VoxhelmTranscriptService", return_value=service)
+
+    complete_transcript_generation.call(generation.pk)
+
+    service.store_job_artifacts.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_complete_transcript_generation_keeps_status_of_generation_finished_meanwhile(mocker, audio):
+    generation = running_generation(audio)
+
+    def finish_and_fail(**kwargs):
+        TranscriptGeneration.objects.filter(pk=generation.pk).update(status=TranscriptGeneration.Status.SUCCEEDED)
+        raise VoxhelmError("download broke")
+
+    service = mocker.Mock()
+    service.fetch_job_artifacts.side_effect = finish_and_fail
+    mocker.patch("cast.voxhelm_tasks.VoxhelmTranscriptService", return_value=service)
+
+    with pytest.raises(VoxhelmError, match="download broke"):
+        complete_transcript_generation.call(generation.pk)
+
+    generation.refresh_from_db()
+    assert generation.status == TranscriptGeneration.Status.SUCCEEDED
+    assert generation.error_message == ""
+
+
+@pytest.fixture
+def deferring_task(mocker):
+    task = mocker.Mock()
+    task.get_backend.return_value.supports_defer = True
+    task.get_backend.return_value.supports_get_result = True
+    task.get_backend.return_value.get_result.return_value = SimpleNamespace(status=TaskResultStatus.RUNNING)
+    task.using.return_value.enqueue.return_value = SimpleNamespace(id="task-next")
+    mocker.patch("cast.voxhelm_tasks.complete_transcript_generation", new=task)
+    return task
+
+
+def running_generation(audio, *, started_seconds_ago=0):
+    return TranscriptGeneration.objects.create(
+        audio=audio,
+        status=TranscriptGeneration.Status.RUNNING,
+        task_ref=build_audio_task_ref(audio.pk),
+        voxhelm_job_id="job-44",
+        task_result_id="task-44",
+        source_url="https://media.example.com/audio.m4a",
+        started_at=timezone.now() - timedelta(seconds=started_seconds_ago),
+    )
+
+
+def polling_service(mocker, job_payload):
+    service = mocker.Mock()
+    service.client = SimpleNamespace(
+        get_job=mocker.Mock(return_value=job_payload), poll_interval_seconds=2.0, job_timeout_seconds=900.0
+    )
+    mocker.patch("cast.voxhelm_tasks.VoxhelmTranscriptService", return_value=service)
+    return service
+
+
+@pytest.mark.django_db
+def test_complete_transcript_generation_reschedules_running_job_with_backoff(mocker, audio, deferring_task):
+    generation = running_generation(audio, started_seconds_ago=300)
+    service = polling_service(mocker, {"id": "job-44", "state": "running"})
+
+    complete_transcript_generation.call(generation.pk)
+
+    generation.refresh_from_db()
+    assert generation.status == TranscriptGeneration.Status.RUNNING
+    assert generation.task_result_id == "task-next"
+    service.fetch_job_artifacts.assert_not_called()
+    deferring_task.get_backend.return_value.get_result.assert_called_once_with("task-44")
+    run_after = deferring_task.using.call_args.kwargs["run_after"]
+    assert timedelta(seconds=29) < run_after - timezone.now() <= timedelta(seconds=30)
+    deferring_task.using.return_value.enqueue.assert_called_once_with(generation.pk)
+
+
+@pytest.mark.django_db
+def test_callback_run_does_not_start_a_second_poll_chain(mocker, audio, deferring_task):
+    generation = running_generation(audio, started_seconds_ago=300)
+    deferring_task.get_backend.return_value.get_result.return_value = SimpleNamespace(status=TaskResultStatus.READY)
+    polling_service(mocker, {"id": "job-44", "state": "running"})
+
+    complete_transcript_generation.call(generation.pk)
+
+    generation.refresh_from_db()
+    assert generation.task_result_id == "task-44"
+    deferring_task.using.assert_not_called()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "task_result_id, supports_get_result, get_result_error",
+    [("", True, None), ("task-44", False, None), ("task-44", True, TaskResultDoesNotExist("task-44"))],
+)
+def test_has_pending_poll_without_a_known_scheduled_check(
+    audio, deferring_task, task_result_id, supports_get_result, get_result_error
+):
+    generation = running_generation(audio)
+    generation.task_result_id = task_result_id
+    backend = deferring_task.get_backend.return_value
+    backend.supports_get_result = supports_get_result
+    backend.get_result.side_effect = get_result_error
+
+    assert has_pending_poll(generation) is False
+
+
+@pytest.mark.django_db
+def test_schedule_transcript_poll_skips_finished_generation(audio, deferring_task):
+    generation = running_generation(audio)
+    generation.mark_succeeded()
+
+    schedule_transcript_poll(generation.pk, delay_seconds=2.0)
+
+    deferring_task.using.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_complete_transcript_generation_completes_finished_job_after_one_check(mocker, audio, deferring_task):
+    generation = TranscriptGeneration.objects.create(
+        audio=audio,
+        status=TranscriptGeneration.Status.QUEUED,
+        task_ref=build_audio_task_ref(audio.pk),
+        voxhelm_job_id="job-45",
+        source_url="https://media.example.com/audio.m4a",
+    )
+    job_payload = {"id": "job-45", "state": "succeeded"}
+    service = polling_service(mocker, job_payload)
+
+    complete_transcript_generation.call(generation.pk)
+
+    generation.refresh_from_db()
+    assert generation.status == TranscriptGeneration.Status.SUCCEEDED
+    service.fetch_job_artifacts.assert_called_once_with(job_id="job-45", initial_job_payload=job_payload)
+    service.store_job_artifacts.assert_called_once_with(
+        audio, service.fetch_job_artifacts.return_value, source_url="https://media.example.com/audio.m4a"
+    )
+    deferring_task.using.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_complete_transcript_generation_fails_after_poll_timeout(mocker, audio, deferring_task):
+    generation = running_generation(audio, started_seconds_ago=901)
+    polling_service(mocker, {"id": "job-44", "state": "running"})
+
+    with pytest.raises(VoxhelmError, match="Timed out waiting for Voxhelm job job-44"):
+        complete_transcript_generation.call(generation.pk)
+
+    generation.refresh_from_db()
+    assert generation.status == TranscriptGeneration.Status.FAILED
+    deferring_task.using.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_complete_transcript_generation_ignores_stale_poll_of_failed_generation(mocker, audio):
+    generation = TranscriptGeneration.objects.create(
+        audio=audio, status=TranscriptGeneration.Status.FAILED, task_ref=build_audio_task_ref(audio.pk)
+    )
+    service_cls = mocker.patch("cast.voxhelm_tasks.VoxhelmTranscriptService")
+
+    complete_transcript_generation.call(generation.pk)
+
+    service_cls.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_complete_transcript_generation_rolls_back_artifacts_of_failed_job(mocker, audio):
+    generation = running_generation(audio)
+
+    def store_and_fail(*args, **kwargs):
+        Audio.objects.filter(pk=audio.pk).update(title="half stored")
+        raise VoxhelmError("worker broke")
+
+    service = mocker.Mock()
+    service.store_job_artifacts.side_effect = store_and_fail
+    mocker.patch("cast.voxhelm_tasks.VoxhelmTranscriptService", return_value=service)
+
+    with pytest.raises(VoxhelmError, match="worker broke"):
+        complete_transcript_generation.call(generation.pk)
+
+    generation.refresh_from_db()
+    audio.refresh_from_db()
+    assert generation.status == TranscriptGeneration.Status.FAILED
+    assert audio.title != "half stored"
+
+
+@pytest.mark.parametrize(
+    "elapsed_seconds, delay",
+    [(0, 2.0), (50, 5.0), (3600, 60.0)],
+)
+def test_next_poll_delay_backs_off_up_to_a_minute(elapsed_seconds, delay):
+    assert next_poll_delay(elapsed_seconds=elapsed_seconds, poll_interval_seconds=2.0) == delay
+
+
+@pytest.fixture
+def webhook_token(settings):
+    settings.CAST_VOXHELM_WEBHOOK_TOKEN = "hook-secret"
+
+
+def post_callback(client, payload, *, token="hook-secret"):
+    return client.post(
+        reverse("cast:voxhelm-job-callback"),
+        data=payload if isinstance(payload, str) else json.dumps(payload),
+        content_type="application/json",
+        HTTP_AUTHORIZATION=f"Bearer {token}",
+    )
+
+
+@pytest.mark.django_db
+def test_voxhelm_job_callback_completes_generation(
+    client, mocker, audio, webhook_token, django_capture_on_commit_callbacks
+):
+    generation = running_generation(audio)
+    service = mocker.Mock()
+    mocker.patch("cast.voxhelm_tasks.VoxhelmTranscriptService", return_value=service)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = post_callback(client, {"job_id": "job-44", "state": "succeeded"})
+
+    assert response.status_code == 202
+    generation.refresh_from_db()
+    assert generation.status == TranscriptGeneration.Status.SUCCEEDED
+    service.store_job_artifacts.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_voxhelm_job_callback_ignores_finished_generation(
+    client, mocker, audio, webhook_token, django_capture_on_commit_callbacks
+):
+    generation = running_generation(audio)
+    generation.mark_succeeded()
+    service_cls = mocker.patch("cast.voxhelm_tasks.VoxhelmTranscriptService")
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        response = post_callback(client, {"job_id": "job-44", "state": "succeeded"})
+
+    assert response.status_code == 404
+    assert callbacks == []
+    service_cls.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_voxhelm_job_callback_is_disabled_without_token(client, audio):
+    running_generation(audio)
+
+    assert post_callback(client, {"id": "job-44"}).status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "payload, token, status_code",
+    [
+        ({"id": "job-44"}, "wrong", 403),
+        ("not json", "hook-secret", 400),
+        (["job-44"], "hook-secret", 400),
+        ({"id": "job-unknown"}, "hook-secret", 404),
+    ],
+)
+def test_voxhelm_job_callback_rejects_invalid_requests(client, audio, webhook_token, payload, token, status_code):
+    running_generation(audio)
+
+    assert post_callback(client, payload, token=token).status_code == status_code
+
+
 @pytest.mark.django_db
 def test_get_transcript_generation_status_context_exposes_failed_state(audio):
     TranscriptGeneration.objects.create(